@@ -9,31 +9,113 @@
 - Дополнительное описание https://fs.moex.com/files/6523
 """
 
+from aiomoex.bulk import TickerResult, bulk_board_candles, bulk_board_history
 from aiomoex.candles import (
     get_board_candle_borders,
+    get_board_candle_rows,
     get_board_candles,
+    get_board_candles_sharded,
     get_market_candle_borders,
     get_market_candles,
+    iter_board_candles,
+    iter_market_candles,
 )
 from aiomoex.client import ISSClient, TableRow, TablesDict, Values
-from aiomoex.history import get_board_dates, get_board_history, get_board_securities, get_market_history
+from aiomoex.columnar import Columns
+from aiomoex.disk_cache import DiskCache
+from aiomoex.executor import ColumnsResult, process_bulk_board_candles
+from aiomoex.export import export_board_candles, export_board_history
+from aiomoex.history import (
+    get_board_dates,
+    get_board_history,
+    get_board_history_rows,
+    get_board_securities,
+    get_market_history,
+    get_market_history_by_board,
+    get_market_history_merged,
+    get_security_boards,
+    iter_board_history,
+    iter_market_history,
+    open_board_history,
+)
+from aiomoex.instrumentation import (
+    Observer,
+    OpenTelemetryObserver,
+    PagesStats,
+    PrometheusObserver,
+    RequestStats,
+    StatsCollector,
+)
+from aiomoex.lazy import LazyTable
+from aiomoex.lineage import get_lineage_history, get_security_lineage
+from aiomoex.memory_cache import MemoryCache
+from aiomoex.panel import IndexPanel, get_index_panel
+from aiomoex.rate_limit import RateLimiter
 from aiomoex.reference import find_securities, get_reference
+from aiomoex.resample import resample_candles
+from aiomoex.rows import Candle, HistoryRow
+from aiomoex.settings import configure_session, create_session
+from aiomoex.single_flight import SingleFlight
 from aiomoex.statistics import get_index_tickers
+from aiomoex.store import LocalStore
+from aiomoex.sync import update_board_candles, update_board_history
 
 __all__ = [
+    "Candle",
+    "Columns",
+    "ColumnsResult",
+    "DiskCache",
+    "HistoryRow",
     "ISSClient",
+    "IndexPanel",
+    "LazyTable",
+    "LocalStore",
+    "MemoryCache",
+    "Observer",
+    "OpenTelemetryObserver",
+    "PagesStats",
+    "PrometheusObserver",
+    "RateLimiter",
+    "RequestStats",
+    "SingleFlight",
+    "StatsCollector",
     "TableRow",
     "TablesDict",
+    "TickerResult",
     "Values",
+    "bulk_board_candles",
+    "bulk_board_history",
+    "configure_session",
+    "create_session",
+    "export_board_candles",
+    "export_board_history",
     "find_securities",
     "get_board_candle_borders",
+    "get_board_candle_rows",
     "get_board_candles",
+    "get_board_candles_sharded",
     "get_board_dates",
     "get_board_history",
+    "get_board_history_rows",
     "get_board_securities",
+    "get_index_panel",
     "get_index_tickers",
+    "get_lineage_history",
     "get_market_candle_borders",
     "get_market_candles",
     "get_market_history",
+    "get_market_history_by_board",
+    "get_market_history_merged",
     "get_reference",
+    "get_security_boards",
+    "get_security_lineage",
+    "iter_board_candles",
+    "iter_board_history",
+    "iter_market_candles",
+    "iter_market_history",
+    "open_board_history",
+    "process_bulk_board_candles",
+    "resample_candles",
+    "update_board_candles",
+    "update_board_history",
 ]
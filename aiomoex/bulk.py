@@ -0,0 +1,168 @@
+"""Функции для массовой загрузки данных по множеству инструментов."""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Final, NamedTuple
+
+import aiohttp
+
+from aiomoex import candles, client, history
+from aiomoex.request_helpers import DEFAULT_BOARD, DEFAULT_ENGINE, DEFAULT_MARKET
+
+# Ошибки загрузки, которые относятся к отдельному инструменту и не прерывают загрузку остальных
+TICKER_ERRORS: Final = (client.ISSMoexError, aiohttp.ClientError, TimeoutError)
+
+
+class TickerResult(NamedTuple):
+    """Результат загрузки данных по одному инструменту.
+
+    При ошибке загрузки data содержит пустой список, а error - возникшее исключение.
+    """
+
+    security: str
+    data: client.Table
+    error: Exception | None = None
+
+
+async def bulk_board_history(
+    session: aiohttp.ClientSession,
+    securities: Iterable[str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    columns: Iterable[str] | None = ("BOARDID", "TRADEDATE", "CLOSE", "VOLUME", "VALUE"),
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    max_in_flight: int = 8,
+) -> AsyncIterator[TickerResult]:
+    """Загрузить историю торгов для множества бумаг в указанном режиме торгов за интервал дат.
+
+    Результаты выдаются по мере готовности, а не в порядке перечисления бумаг. Ошибка загрузки одной бумаги
+    не прерывает загрузку остальных и возвращается в поле error результата.
+
+    :param session:
+        Сессия http соединения.
+    :param securities:
+        Тикеры ценных бумаг. Если None, то загружаются все бумаги режима торгов из get_board_securities().
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить - по умолчанию режим торгов, дата торгов, цена закрытия
+        и объем в штуках и стоимости. Если пустой или None, то загружаются все столбцы.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param max_in_flight:
+        Общее для всех бумаг ограничение на количество одновременных запросов к MOEX ISS.
+
+    :return:
+        Асинхронный итератор результатов загрузки по отдельным бумагам.
+    """
+
+    async def load(security: str) -> client.Table:
+        return await history.get_board_history(session, security, start, end, columns, board, market, engine)
+
+    if securities is None:
+        securities = await _board_securities(session, board, market, engine)
+    async for result in _iter_results(securities, load, max_in_flight):
+        yield result
+
+
+async def bulk_board_candles(
+    session: aiohttp.ClientSession,
+    securities: Iterable[str] | None = None,
+    interval: int = 24,
+    start: str | None = None,
+    end: str | None = None,
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    max_in_flight: int = 8,
+    columns: Iterable[str] | None = None,
+) -> AsyncIterator[TickerResult]:
+    """Загрузить свечи в формате HLOCV для множества бумаг в указанном режиме торгов за интервал дат.
+
+    Результаты выдаются по мере готовности, а не в порядке перечисления бумаг. Ошибка загрузки одной бумаги
+    не прерывает загрузку остальных и возвращается в поле error результата.
+
+    :param session:
+        Сессия http соединения.
+    :param securities:
+        Тикеры ценных бумаг. Если None, то загружаются все бумаги режима торгов из get_board_securities().
+    :param interval:
+        Размер свечки - целое число 1 (1 минута), 10 (10 минут), 60 (1 час), 24 (1 день), 7 (1 неделя),
+        31 (1 месяц) или 4 (1 квартал). По умолчанию дневные данные.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param max_in_flight:
+        Общее для всех бумаг ограничение на количество одновременных запросов к MOEX ISS.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить. Если пустой или None, то загружаются все столбцы.
+
+    :return:
+        Асинхронный итератор результатов загрузки по отдельным бумагам.
+    """
+
+    async def load(security: str) -> client.Table:
+        return await candles.get_board_candles(
+            session,
+            security,
+            interval,
+            start,
+            end,
+            board,
+            market,
+            engine,
+            columns,
+        )
+
+    if securities is None:
+        securities = await _board_securities(session, board, market, engine)
+    async for result in _iter_results(securities, load, max_in_flight):
+        yield result
+
+
+async def _board_securities(session: aiohttp.ClientSession, board: str, market: str, engine: str) -> list[str]:
+    table = await history.get_board_securities(session, columns=("SECID",), board=board, market=market, engine=engine)
+    return [str(row["SECID"]) for row in table]
+
+
+async def _iter_results(
+    securities: Iterable[str],
+    load: Callable[[str], Awaitable[client.Table]],
+    max_in_flight: int,
+) -> AsyncIterator[TickerResult]:
+    """Загружает данные по бумагам под общим семафором и выдает результаты по мере готовности.
+
+    Блоки данных одной бумаги загружаются последовательно, поэтому семафор на загрузку бумаги
+    ограничивает и общее количество одновременных запросов.
+    """
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def load_one(security: str) -> TickerResult:
+        async with semaphore:
+            try:
+                return TickerResult(security, await load(security))
+            except TICKER_ERRORS as err:
+                return TickerResult(security, [], err)
+
+    tasks = [asyncio.create_task(load_one(security)) for security in securities]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
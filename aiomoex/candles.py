@@ -1,8 +1,13 @@
 """Функции для получения информации о свечках."""
 
+import itertools
+from collections.abc import AsyncIterator, Iterable
+from datetime import date, timedelta
+from typing import Final
+
 import aiohttp
 
-from aiomoex import client, request_helpers
+from aiomoex import client, request_helpers, rows
 from aiomoex.request_helpers import (
     CANDLE_BORDERS,
     CANDLES,
@@ -11,12 +16,16 @@ from aiomoex.request_helpers import (
     DEFAULT_MARKET,
 )
 
+BEGIN: Final = "begin"
+CANDLE_BORDERS_TABLE: Final = "borders"
+
 
 async def get_market_candle_borders(
     session: aiohttp.ClientSession,
     security: str,
     market: str = DEFAULT_MARKET,
     engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
 ) -> client.Table:
     """Получить таблицу интервалов доступных дат для всех режимов торгов.
 
@@ -30,6 +39,8 @@ async def get_market_candle_borders(
         Рынок - по умолчанию акции.
     :param engine:
         Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить. Если пустой или None, то загружаются все столбцы.
 
     :return:
         Список словарей, которые напрямую конвертируется в pandas.DataFrame.
@@ -40,8 +51,9 @@ async def get_market_candle_borders(
         security=security,
         suffix=CANDLE_BORDERS,
     )
-    table = "borders"
-    return await request_helpers.get_short_data(session, url, table)
+    table = CANDLE_BORDERS_TABLE
+    query = request_helpers.make_query(table=table, columns=columns)
+    return await request_helpers.get_short_data(session, url, table, query)
 
 
 async def get_board_candle_borders(
@@ -50,6 +62,7 @@ async def get_board_candle_borders(
     board: str = DEFAULT_BOARD,
     market: str = DEFAULT_MARKET,
     engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
 ) -> client.Table:
     """Получить таблицу интервалов доступных дат для указанного режиме торгов.
 
@@ -65,6 +78,8 @@ async def get_board_candle_borders(
         Рынок - по умолчанию акции.
     :param engine:
         Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить. Если пустой или None, то загружаются все столбцы.
 
     :return:
         Список словарей, которые напрямую конвертируется в pandas.DataFrame
@@ -76,8 +91,9 @@ async def get_board_candle_borders(
         security=security,
         suffix=CANDLE_BORDERS,
     )
-    table = "borders"
-    return await request_helpers.get_short_data(session, url, table)
+    table = CANDLE_BORDERS_TABLE
+    query = request_helpers.make_query(table=table, columns=columns)
+    return await request_helpers.get_short_data(session, url, table, query)
 
 
 async def get_market_candles(
@@ -88,6 +104,7 @@ async def get_market_candles(
     end: str | None = None,
     market: str = DEFAULT_MARKET,
     engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
 ) -> client.Table:
     """Получить свечи в формате HLOCV указанного инструмента на рынке для основного режима торгов.
 
@@ -112,13 +129,15 @@ async def get_market_candles(
         Рынок - по умолчанию акции.
     :param engine:
         Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить. Если пустой или None, то загружаются все столбцы.
 
     :return:
         Список словарей, которые напрямую конвертируется в pandas.DataFrame.
     """
     url = request_helpers.make_url(engine=engine, market=market, security=security, suffix=CANDLES)
     table = CANDLES
-    query = request_helpers.make_query(interval=interval, start=start, end=end)
+    query = request_helpers.make_query(interval=interval, start=start, end=end, table=table, columns=columns)
     return await request_helpers.get_long_data(session, url, table, query)
 
 
@@ -131,6 +150,7 @@ async def get_board_candles(
     board: str = DEFAULT_BOARD,
     market: str = DEFAULT_MARKET,
     engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
 ) -> client.Table:
     """Получить свечи в формате HLOCV указанного инструмента в указанном режиме торгов за интервал дат.
 
@@ -153,6 +173,8 @@ async def get_board_candles(
         Рынок - по умолчанию акции.
     :param engine:
         Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить. Если пустой или None, то загружаются все столбцы.
 
     :return:
         Список словарей, которые напрямую конвертируется в pandas.DataFrame.
@@ -165,5 +187,258 @@ async def get_board_candles(
         suffix=CANDLES,
     )
     table = CANDLES
-    query = request_helpers.make_query(interval=interval, start=start, end=end)
+    query = request_helpers.make_query(interval=interval, start=start, end=end, table=table, columns=columns)
     return await request_helpers.get_long_data(session, url, table, query)
+
+
+async def iter_market_candles(
+    session: aiohttp.ClientSession,
+    security: str,
+    interval: int = 24,
+    start: str | None = None,
+    end: str | None = None,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
+) -> AsyncIterator[client.Table]:
+    """Получить свечи в формате HLOCV указанного инструмента на рынке блоками по мере их загрузки.
+
+    Аналог get_market_candles(), который не накапливает все данные в памяти.
+
+    Описание запроса - https://iss.moex.com/iss/reference/155
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param interval:
+        Размер свечки - целое число 1 (1 минута), 10 (10 минут), 60 (1 час), 24 (1 день), 7 (1 неделя),
+        31 (1 месяц) или 4 (1 квартал). По умолчанию дневные данные.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить. Если пустой или None, то загружаются все столбцы.
+
+    :return:
+        Асинхронный итератор блоков - списков словарей, которые напрямую конвертируется в pandas.DataFrame.
+    """
+    url = request_helpers.make_url(engine=engine, market=market, security=security, suffix=CANDLES)
+    query = request_helpers.make_query(interval=interval, start=start, end=end, table=CANDLES, columns=columns)
+    async for table in request_helpers.iter_long_data(session, url, CANDLES, query):
+        yield table
+
+
+async def iter_board_candles(
+    session: aiohttp.ClientSession,
+    security: str,
+    interval: int = 24,
+    start: str | None = None,
+    end: str | None = None,
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
+) -> AsyncIterator[client.Table]:
+    """Получить свечи в формате HLOCV указанного инструмента в указанном режиме торгов блоками по мере их загрузки.
+
+    Аналог get_board_candles(), который не накапливает все данные в памяти.
+
+    Описание запроса - https://iss.moex.com/iss/reference/46
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param interval:
+        Размер свечки - целое число 1 (1 минута), 10 (10 минут), 60 (1 час), 24 (1 день), 7 (1 неделя),
+        31 (1 месяц) или 4 (1 квартал). По умолчанию дневные данные.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить. Если пустой или None, то загружаются все столбцы.
+
+    :return:
+        Асинхронный итератор блоков - списков словарей, которые напрямую конвертируется в pandas.DataFrame.
+    """
+    url = request_helpers.make_url(
+        engine=engine,
+        market=market,
+        board=board,
+        security=security,
+        suffix=CANDLES,
+    )
+    query = request_helpers.make_query(interval=interval, start=start, end=end, table=CANDLES, columns=columns)
+    async for table in request_helpers.iter_long_data(session, url, CANDLES, query):
+        yield table
+
+
+async def get_board_candle_rows(
+    session: aiohttp.ClientSession,
+    security: str,
+    interval: int = 24,
+    start: str | None = None,
+    end: str | None = None,
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+) -> list[rows.Candle]:
+    """Получить свечи указанного инструмента в указанном режиме торгов в виде типизированных строк.
+
+    Аналог get_board_candles(), в котором каждый блок данных сразу преобразуется в строки с датами в виде
+    datetime, занимающие в несколько раз меньше памяти, чем словари.
+
+    Описание запроса - https://iss.moex.com/iss/reference/46
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param interval:
+        Размер свечки - целое число 1 (1 минута), 10 (10 минут), 60 (1 час), 24 (1 день), 7 (1 неделя),
+        31 (1 месяц) или 4 (1 квартал). По умолчанию дневные данные.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+
+    :return:
+        Список свечей.
+    """
+    url = request_helpers.make_url(
+        engine=engine,
+        market=market,
+        board=board,
+        security=security,
+        suffix=CANDLES,
+    )
+    query = request_helpers.make_query(
+        interval=interval,
+        start=start,
+        end=end,
+        table=CANDLES,
+        columns=rows.CANDLE_COLUMNS,
+    )
+    return await request_helpers.get_long_rows(session, url, CANDLES, rows.to_candles, query)
+
+
+async def get_board_candles_sharded(
+    session: aiohttp.ClientSession,
+    security: str,
+    interval: int = 1,
+    start: str | None = None,
+    end: str | None = None,
+    shards: int = 4,
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
+) -> client.Table:
+    """Получить свечи в формате HLOCV, параллельно загружая несколько частей интервала дат.
+
+    Результат совпадает с get_board_candles(), но загрузка длинной истории мелких свечек ускоряется почти
+    пропорционально количеству частей. Доступный интервал дат уточняется с помощью get_board_candle_borders()
+    и делится на равные по количеству дней части, которые загружаются параллельно и объединяются без
+    пропусков и повторов свечек на границах частей.
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param interval:
+        Размер свечки - целое число 1 (1 минута), 10 (10 минут), 60 (1 час), 24 (1 день), 7 (1 неделя),
+        31 (1 месяц) или 4 (1 квартал). По умолчанию минутные данные.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param shards:
+        Количество частей интервала дат, загружаемых параллельно.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить, - должен содержать время начала свечки. Если пустой или None,
+        то загружаются все столбцы.
+
+    :return:
+        Список словарей, которые напрямую конвертируется в pandas.DataFrame.
+    """
+    columns = tuple(columns or ())
+    if columns and BEGIN not in columns:
+        raise client.ISSMoexError(f"Отсутствует столбец {BEGIN} в запросе")
+
+    borders = await get_board_candle_borders(session, security, board, market, engine, ("begin", "end", "interval"))
+    border = next((row for row in borders if row["interval"] == interval), None)
+    if border is None:
+        return []
+
+    first = max(date.fromisoformat(str(border["begin"])[:10]), date.fromisoformat(start or date.min.isoformat()))
+    last = min(date.fromisoformat(str(border["end"])[:10]), date.fromisoformat(end or date.max.isoformat()))
+    if first > last:
+        return []
+
+    async with client.task_group() as group:
+        tasks = [
+            group.create_task(
+                get_board_candles(
+                    session,
+                    security,
+                    interval,
+                    shard_start,
+                    shard_end,
+                    board,
+                    market,
+                    engine,
+                    columns,
+                ),
+            )
+            for shard_start, shard_end in _date_shards(first, last, shards)
+        ]
+
+    return _stitch(task.result() for task in tasks)
+
+
+def _date_shards(first: date, last: date, shards: int) -> list[tuple[str, str]]:
+    """Разбивает интервал дат на не пересекающиеся части с примерно одинаковым количеством дней."""
+    days = (last - first).days + 1
+    shards = max(1, min(shards, days))
+    bounds = [first + timedelta(days=days * n // shards) for n in range(shards + 1)]
+    return [
+        (shard_start.isoformat(), (shard_end - timedelta(days=1)).isoformat())
+        for shard_start, shard_end in itertools.pairwise(bounds)
+    ]
+
+
+def _stitch(parts: Iterable[client.Table]) -> client.Table:
+    """Объединяет последовательные части свечек, отбрасывая свечки, которые уже были в предыдущих частях.
+
+    Повторы возможны для недельных, месячных и квартальных свечек, пересекающих границу частей.
+    """
+    candles: client.Table = []
+    for part in parts:
+        last_begin = str(candles[-1][BEGIN]) if candles else ""
+        candles.extend(row for row in part if str(row[BEGIN]) > last_begin)
+    return candles
@@ -1,22 +1,81 @@
 """Асинхронный клиент для MOEX ISS."""
 
-from collections.abc import AsyncIterable, AsyncIterator
-from typing import cast
+import asyncio
+import contextlib
+import dataclasses
+import time
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
+from typing import TypedDict, cast
 
 import aiohttp
 from aiohttp import client_exceptions
 
+from aiomoex import columnar, decoders, instrumentation, rate_limit, settings
+
 Values = str | int | float
 TableRow = dict[str, Values]
 Table = list[TableRow]
 TablesDict = dict[str, Table]
 WebQuery = dict[str, str | int]
+ColumnsDict = dict[str, columnar.Columns]
+
+
+class CompactTable(TypedDict):
+    """Таблица в компактном формате MOEX ISS - наименования столбцов и списки значений для каждой строки."""
+
+    columns: list[str]
+    data: list[list[Values]]
+
+
+CompactTablesDict = dict[str, CompactTable]
 
 
 class ISSMoexError(Exception):
     """Ошибки во время обработки запросов."""
 
 
+@contextlib.asynccontextmanager
+async def task_group() -> AsyncGenerator[asyncio.TaskGroup]:
+    """Группа задач, которая при ошибках в задачах возбуждает первое из исключений, а не ExceptionGroup.
+
+    Параллельная загрузка не должна менять тип ошибок по сравнению с последовательной, поэтому вызывающий
+    код получает ISSMoexError или ошибку aiohttp, а группа исключений сохраняется в __cause__.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            yield group
+    except ExceptionGroup as err:
+        raise _first_error(err) from err
+
+
+def _first_error(error: BaseException) -> BaseException:
+    while isinstance(error, BaseExceptionGroup):
+        error = cast("BaseExceptionGroup[BaseException]", error).exceptions[0]
+    return error
+
+
+def _to_rows(table: CompactTable) -> Table:
+    columns = table["columns"]
+    return [dict(zip(columns, row, strict=True)) for row in table["data"]]
+
+
+def _to_tables(block: CompactTablesDict) -> TablesDict:
+    return {table_name: _to_rows(table) for table_name, table in block.items()}
+
+
+def _block_size(start: int, block: CompactTablesDict) -> int:
+    """Извлекает из блока курсор history.cursor и определяет размер блока для загрузки следующего.
+
+    При отсутствии курсора размер блока определяется по количеству строк в первой таблице, а нулевой
+    размер означает, что загружен последний блок.
+    """
+    if (cursor_table := block.pop("history.cursor", None)) is not None:
+        return _cursor_block_size(start, _to_rows(cursor_table))
+
+    table = next(iter(block.values()))
+    return len(table["data"])
+
+
 def _cursor_block_size(start: int, cursor_table: Table) -> int:
     cursor, *wrong_data = cursor_table
 
@@ -30,6 +89,40 @@ def _cursor_block_size(start: int, cursor_table: Table) -> int:
     return 0
 
 
+def _rows_count(block: CompactTablesDict) -> int:
+    """Количество строк в таблицах с данными без учета курсора history.cursor."""
+    return sum(len(table["data"]) for table_name, table in block.items() if table_name != "history.cursor")
+
+
+def _cursor_starts(cursor_table: Table) -> range:
+    """Номера элементов, с которых начинаются блоки данных, следующие за первым."""
+    block_size = _cursor_block_size(0, cursor_table)
+    if not block_size:
+        return range(0)
+    return range(block_size, cast("int", cursor_table[0]["TOTAL"]), block_size)
+
+
+def _projections(query: WebQuery) -> dict[str, frozenset[str]]:
+    """Запрошенные столбцы таблиц из параметров запроса вида table.columns."""
+    suffix = ".columns"
+    return {
+        name.removesuffix(suffix): frozenset(str(value).split(","))
+        for name, value in query.items()
+        if name.endswith(suffix) and value
+    }
+
+
+def _check_columns(block: CompactTablesDict, projections: dict[str, frozenset[str]]) -> None:
+    """Проверяет наличие запрошенных столбцов - MOEX ISS молча отбрасывает столбцы с неизвестными названиями.
+
+    Схема таблиц не загружается и не кэшируется: столбцы ответа сравниваются с разобранными один раз при создании
+    клиента параметрами запроса вида table.columns.
+    """
+    for table_name, requested in projections.items():
+        if (table := block.get(table_name)) is not None and (unknown := requested.difference(table["columns"])):
+            raise ISSMoexError(f"Отсутствуют столбцы {sorted(unknown)} в таблице {table_name}")
+
+
 class ISSClient(AsyncIterable[TablesDict]):
     """Асинхронный клиент для MOEX ISS - может быть использован с async for.
 
@@ -52,11 +145,12 @@ class ISSClient(AsyncIterable[TablesDict]):
             Адрес запроса.
         :param query:
             Перечень дополнительных параметров запроса. К списку дополнительных параметров всегда
-            добавляется требование предоставить ответ в виде расширенного json без метаданных.
+            добавляется требование предоставить ответ в виде компактного json без метаданных.
         """
         self._session = session
         self._url = url
         self._query = query or {}
+        self._projections = _projections(self._query)
 
     def __repr__(self) -> str:
         """Наименование класса и содержание запроса к ISS Moex."""
@@ -76,6 +170,12 @@ class ISSClient(AsyncIterable[TablesDict]):
     async def get(self, start: int | None = None) -> TablesDict:
         """Загрузка данных.
 
+        Если для сессии с помощью configure_session() установлено объединение одинаковых запросов, то
+        одновременные одинаковые запросы получают результат одного запроса к серверу. Если установлен кэш на
+        диске, то данные по возможности загружаются из него. Если установлено ограничение частоты запросов, то
+        запрос выполняется с его соблюдением и повторяется при временных ошибках. Если установлен наблюдатель, то
+        ему передается статистика загрузки.
+
         :param start:
             Номер элемента с которого нужно загрузить данные. Используется для дозагрузки данных,
             состоящих из нескольких блоков. При отсутствии данные загружаются с начального элемента.
@@ -87,57 +187,216 @@ class ISSClient(AsyncIterable[TablesDict]):
         :raises ISSMoexError:
             Ошибка при обращении к ISS Moex.
         """
-        url = self._url
+        return _to_tables(await self.get_compact(start))
+
+    async def get_compact(self, start: int | None = None) -> CompactTablesDict:
+        """Загрузка данных в компактном формате MOEX ISS без преобразования в списки словарей.
+
+        Настройки сессии используются так же, как и в методе get().
+
+        :param start:
+            Номер элемента с которого нужно загрузить данные. При отсутствии данные загружаются с начального
+            элемента.
+
+        :return:
+            Блок данных - словарь, каждый ключ которого соответствует одной из таблиц с данными. Таблицы
+            содержат перечень наименований столбцов и списки значений для каждой строки.
+        :raises ISSMoexError:
+            Ошибка при обращении к ISS Moex или отсутствие в ответе столбцов, запрошенных параметрами вида
+            table.columns.
+        """
+        session_settings = settings.get_settings(self._session)
         query = self._make_query(start)
-        async with self._session.get(url, params=query) as respond:
-            try:
-                respond.raise_for_status()
-            except client_exceptions.ClientResponseError as err:
-                raise ISSMoexError("Неверный url", respond.url) from err
-            else:
-                raw_respond: list[dict[str, Table]] = await respond.json()
-                return raw_respond[1]
 
-    async def get_all(self) -> TablesDict:
+        if (single_flight := session_settings.single_flight) is not None:
+            key = (self._url, *sorted(query.items()))
+            block = (await single_flight.call(key, lambda: self._load_block(query, session_settings))).copy()
+        else:
+            block = await self._load_block(query, session_settings)
+
+        _check_columns(block, self._projections)
+        return block
+
+    async def get_all(self, max_in_flight: int = 1) -> TablesDict:
         """Собирает все блоки данных для запросов.
 
+        :param max_in_flight:
+            Максимальное количество одновременно загружаемых блоков. Если в ответе на первый запрос
+            присутствует курсор history.cursor, то остальные блоки загружаются параллельно с указанным
+            ограничением и собираются в исходном порядке. Ответы без курсора всегда загружаются
+            последовательно. По умолчанию все блоки загружаются последовательно.
+
         :return:
             Объединенные из всех блоков данные с отброшенной вспомогательной информацией - словарь,
             каждый ключ которого соответствует одной из таблиц с данными. Таблицы являются списками
             словарей, которые напрямую конвертируются в pandas.DataFrame.
         """
         all_data: TablesDict = {}
-        async for block in self:
-            for table_name, table_rows in block.items():
-                all_data.setdefault(table_name, []).extend(table_rows)
+        async for block in self._compact_blocks(max_in_flight):
+            for table_name, table in block.items():
+                all_data.setdefault(table_name, []).extend(_to_rows(table))
         return all_data
 
+    async def get_all_columns(self, max_in_flight: int = 1) -> ColumnsDict:
+        """Собирает все блоки данных для запросов в виде столбцов.
+
+        Столбцы пополняются по мере загрузки блоков напрямую из компактного формата ответов MOEX ISS, что
+        требует существенно меньше памяти, чем списки словарей, для таблиц с большим количеством строк.
+
+        :param max_in_flight:
+            Максимальное количество одновременно загружаемых блоков для ответов с курсором history.cursor.
+
+        :return:
+            Объединенные из всех блоков данные с отброшенной вспомогательной информацией - словарь,
+            каждый ключ которого соответствует одной из таблиц с данными в виде столбцов.
+        """
+        all_data: ColumnsDict = {}
+        async for block in self._compact_blocks(max_in_flight):
+            for table_name, table in block.items():
+                all_data.setdefault(table_name, columnar.Columns()).extend_compact(table["columns"], table["data"])
+        return all_data
+
+    async def iter_compact(self, max_in_flight: int = 1) -> AsyncIterator[CompactTablesDict]:
+        """Асинхронный генератор блоков данных в компактном формате MOEX ISS без курсора history.cursor.
+
+        :param max_in_flight:
+            Максимальное количество одновременно загружаемых блоков для ответов с курсором history.cursor. При
+            параллельной загрузке блоки выдаются после загрузки всех блоков.
+
+        :return:
+            Асинхронный итератор блоков данных - словарей, каждый ключ которых соответствует одной из таблиц с
+            данными в компактном формате.
+        """
+        async for block in self._compact_blocks(max_in_flight):
+            yield block
+
+    async def _load_block(self, query: WebQuery, session_settings: settings.SessionSettings) -> CompactTablesDict:
+        observer = session_settings.observer
+        if (disk_cache := session_settings.disk_cache) is not None and (
+            block := await disk_cache.get(self._url, query)
+        ) is not None:
+            block = cast("CompactTablesDict", block)
+            if observer is not None:
+                stats = instrumentation.RequestStats(self._url, query, rows=_rows_count(block), cached=True)
+                observer.on_request(stats)
+            return block
+
+        attempts = 0
+
+        async def get_block() -> tuple[CompactTablesDict, instrumentation.RequestStats]:
+            nonlocal attempts
+            attempts += 1
+            return await self._get_block(query, session_settings.decoder or decoders.default_decoder())
+
+        if (limiter := session_settings.limiter) is not None:
+            block, stats = await limiter.call(get_block)
+        else:
+            block, stats = await get_block()
+
+        if observer is not None:
+            observer.on_request(dataclasses.replace(stats, retries=attempts - 1))
+        if disk_cache is not None:
+            await disk_cache.set(self._url, query, block)
+        return block
+
+    async def _get_block(
+        self,
+        query: WebQuery,
+        decoder: decoders.Decoder,
+    ) -> tuple[CompactTablesDict, instrumentation.RequestStats]:
+        url = self._url
+        timer = instrumentation.ConnectTimer()
+        start = time.perf_counter()
+        async with self._session.get(url, params=query, trace_request_ctx=timer.request_ctx()) as respond:
+            headers = time.perf_counter()
+            try:
+                respond.raise_for_status()
+            except client_exceptions.ClientResponseError as err:
+                if err.status in rate_limit.TRANSIENT_STATUSES:
+                    raise ISSMoexError(f"Ошибка сервера {err.status}", respond.url) from err
+                raise ISSMoexError("Неверный url", respond.url) from err
+
+            raw = await respond.read()
+            body = time.perf_counter()
+            block: CompactTablesDict = decoder(raw)
+            stats = instrumentation.RequestStats(
+                url,
+                query,
+                status=respond.status,
+                connect=timer.connect,
+                ttfb=headers - start - timer.connect,
+                body=body - headers,
+                decode=time.perf_counter() - body,
+                size=len(raw),
+                rows=_rows_count(block),
+            )
+            return block, stats
+
     def _make_query(self, start: int | None = None) -> WebQuery:
         """Формирует параметры запроса.
 
         К общему набору параметров запроса добавляется требование предоставить ответ в виде
-        расширенного json.
+        компактного json без метаданных.
         """
-        query: WebQuery = {"iss.json": "extended", "iss.meta": "off"} | self._query
+        query: WebQuery = {"iss.json": "compact", "iss.meta": "off"} | self._query
         if start:
             query["start"] = start
         return query
 
     async def _iterator_maker(self) -> AsyncIterator[TablesDict]:
-        start = 0
-        while True:
-            respond = await self.get(start)
-            if (cursor_table := respond.get("history.cursor")) is not None:
-                respond.pop("history.cursor")
-                yield respond
+        async for block in self._compact_blocks():
+            yield _to_tables(block)
 
-                block_size = _cursor_block_size(start, cursor_table)
-            else:
-                yield respond
+    async def _compact_blocks(self, max_in_flight: int = 1) -> AsyncIterator[CompactTablesDict]:
+        observer = settings.get_settings(self._session).observer
+        start = time.perf_counter()
+        pages = 0
+        rows = 0
 
-                table_name = next(iter(respond))
-                block_size = len(respond[table_name])
+        async for block in self._blocks(max_in_flight):
+            pages += 1
+            rows += _rows_count(block)
+            yield block
+
+        if observer is not None:
+            elapsed = time.perf_counter() - start
+            observer.on_pages(instrumentation.PagesStats(self._url, self._make_query(), pages, rows, elapsed))
+
+    async def _blocks(self, max_in_flight: int) -> AsyncIterator[CompactTablesDict]:
+        if max_in_flight > 1:
+            for block in await self._concurrent_blocks(max_in_flight):
+                yield block
+            return
+
+        async for block in self._serial_blocks():
+            yield block
+
+    async def _serial_blocks(self, start: int = 0) -> AsyncIterator[CompactTablesDict]:
+        while True:
+            block = await self.get_compact(start)
+            block_size = _block_size(start, block)
+            yield block
 
             if not block_size:
                 return
             start += block_size
+
+    async def _concurrent_blocks(self, max_in_flight: int) -> list[CompactTablesDict]:
+        block = await self.get_compact()
+        if (cursor_table := block.pop("history.cursor", None)) is None:
+            if not (block_size := _block_size(0, block)):
+                return [block]
+            return [block, *[next_block async for next_block in self._serial_blocks(block_size)]]
+
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def load_block(start: int) -> CompactTablesDict:
+            async with semaphore:
+                block = await self.get_compact(start)
+            block.pop("history.cursor", None)
+            return block
+
+        async with task_group() as group:
+            tasks = [group.create_task(load_block(start)) for start in _cursor_starts(_to_rows(cursor_table))]
+
+        return [block, *(task.result() for task in tasks)]
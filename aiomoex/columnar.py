@@ -0,0 +1,174 @@
+"""Представление таблиц MOEX ISS в виде отдельных столбцов.
+
+Столбцы заполняются по мере загрузки блоков данных. Числовые значения хранятся в компактных типизированных
+массивах стандартной библиотеки, которые без копирования конвертируются в массивы NumPy, а остальные - в
+списках. Для конвертации в NumPy и Arrow нужны необязательные зависимости numpy и pyarrow.
+"""
+
+import array
+import math
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Final, cast
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
+
+Value = str | int | float | None
+ColumnData = array.array[int] | array.array[float] | list[Value]
+
+_INT: Final = "q"
+_FLOAT: Final = "d"
+
+
+class _Column:
+    """Столбец с автоматическим выбором компактного представления.
+
+    Целые числа хранятся в массиве int64, вещественные - в массиве float64, а пропуски в числовых столбцах
+    заменяются на NaN. Столбец из целых чисел с пропусками хранится как вещественный. Если в столбце
+    встречаются строки, то он хранится в виде списка.
+    """
+
+    __slots__ = ("_data", "_missing")
+
+    def __init__(self, size: int) -> None:
+        missing: list[Value] = [None] * size
+        self._data: ColumnData = missing
+        self._missing = True
+
+    @property
+    def data(self) -> ColumnData:
+        return self._data
+
+    def extend(self, values: Sequence[Value]) -> None:
+        data = self._data
+        if isinstance(data, array.array):
+            size = len(data)
+            try:
+                data.extend(values)  # pyright: ignore[reportArgumentType]
+            except TypeError:
+                # Массив дополняется значениями до первого неподходящего по типу, которые нужно отбросить
+                del data[size:]
+                self._data = _convert([*data, *values])
+        elif self._missing:
+            self._data = _convert([*data, *values])
+            self._missing = isinstance(self._data, list) and _typecode(self._data) is None
+        else:
+            data.extend(values)
+
+
+def _convert(values: list[Value]) -> ColumnData:
+    """Выбирает наиболее компактное представление для значений столбца."""
+    match _typecode(values):
+        case "q":
+            return array.array(_INT, cast("list[int]", values))
+        case "d":
+            return array.array(_FLOAT, [math.nan if value is None else cast("float", value) for value in values])
+        case _:
+            return values
+
+
+def _typecode(values: Iterable[Value]) -> str | None:
+    """Код типа массива для значений: None - только пропуски, пустая строка - есть нечисловые значения."""
+    has_int = has_float = has_missing = False
+    for value in values:
+        if value is None:
+            has_missing = True
+        elif isinstance(value, bool) or not isinstance(value, int | float):
+            return ""
+        elif isinstance(value, int):
+            has_int = True
+        else:
+            has_float = True
+
+    if has_float or (has_int and has_missing):
+        return _FLOAT
+    if has_int:
+        return _INT
+    return None
+
+
+class Columns(Mapping[str, ColumnData]):
+    """Таблица MOEX ISS в виде столбцов, пополняемая по мере загрузки блоков данных.
+
+    Поддерживает протокол словаря столбцов. Результат метода to_dict() напрямую конвертируется в
+    pandas.DataFrame.
+    """
+
+    def __init__(self) -> None:
+        """Пустая таблица."""
+        self._columns: dict[str, _Column] = {}
+        self._rows = 0
+
+    def __repr__(self) -> str:
+        """Наименование класса, количество строк и столбцы."""
+        class_name = self.__class__.__name__
+        return f"{class_name}(rows={self._rows}, columns={list(self._columns)})"
+
+    def __getitem__(self, name: str) -> ColumnData:
+        """Данные столбца."""
+        return self._columns[name].data
+
+    def __iter__(self) -> Iterator[str]:
+        """Наименования столбцов."""
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        """Количество столбцов."""
+        return len(self._columns)
+
+    @property
+    def rows(self) -> int:
+        """Количество строк."""
+        return self._rows
+
+    def extend(self, table: Sequence[Mapping[str, Value]]) -> None:
+        """Добавляет строки таблицы в формате списка словарей."""
+        if not table:
+            return
+        for name in table[0]:
+            if name not in self._columns:
+                self._columns[name] = _Column(self._rows)
+        for name, column in self._columns.items():
+            column.extend([row.get(name) for row in table])
+        self._rows += len(table)
+
+    def extend_compact(self, columns: Sequence[str], data: Sequence[Sequence[Value]]) -> None:
+        """Добавляет строки таблицы в компактном формате MOEX ISS - наименования столбцов и списки значений."""
+        for name in columns:
+            if name not in self._columns:
+                self._columns[name] = _Column(self._rows)
+        values = dict(zip(columns, zip(*data, strict=True), strict=False))
+        missing = (None,) * len(data)
+        for name, column in self._columns.items():
+            column.extend(values.get(name, missing))
+        self._rows += len(data)
+
+    def to_dict(self) -> dict[str, ColumnData]:
+        """Словарь столбцов - числовые столбцы являются массивами array.array, остальные - списками."""
+        return {name: column.data for name, column in self._columns.items()}
+
+    def to_numpy(self) -> "np.ndarray[Any, Any]":
+        """Структурированный массив NumPy - строки и другие нечисловые значения имеют тип object."""
+        import numpy as np  # noqa: PLC0415
+
+        columns = {name: _numpy_column(data) for name, data in self.to_dict().items()}
+        dtype = np.dtype([(name, column.dtype) for name, column in columns.items()])
+        result = np.empty(self._rows, dtype=dtype)
+        for name, column in columns.items():
+            result[name] = column
+        return result
+
+    def to_arrow(self) -> "pa.Table":
+        """Таблица Arrow - числовые столбцы передаются без копирования данных."""
+        import pyarrow as pa  # noqa: PLC0415
+
+        return pa.table({name: pa.array(_numpy_column(data)) for name, data in self.to_dict().items()})
+
+
+def _numpy_column(data: ColumnData) -> "np.ndarray[Any, Any]":
+    import numpy as np  # noqa: PLC0415
+
+    if isinstance(data, array.array):
+        return np.frombuffer(data, dtype=np.int64 if data.typecode == _INT else np.float64)
+    return np.array(data, dtype=object)
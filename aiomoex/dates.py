@@ -0,0 +1,25 @@
+"""Вспомогательные функции для работы с датами торгов и интервалами дат."""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Final
+
+# Торги на MOEX ведутся по московскому времени
+MOSCOW_TZ: Final = timezone(timedelta(hours=3))
+
+DateRange = tuple[date, date]
+
+
+def today() -> date:
+    """Текущая дата по московскому времени."""
+    return datetime.now(MOSCOW_TZ).date()
+
+
+def merge_ranges(ranges: list[DateRange], gap: timedelta = timedelta(days=1)) -> list[DateRange]:
+    """Объединяет интервалы дат, разрыв между которыми не превышает gap - по умолчанию пересекающиеся и соседние."""
+    merged: list[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
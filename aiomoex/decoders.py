@@ -0,0 +1,52 @@
+"""Декодеры json ответов MOEX ISS.
+
+По умолчанию используется самый быстрый из установленных декодеров: orjson, msgspec или стандартный модуль json.
+Декодер msgspec дополнительно проверяет соответствие ответа компактному формату MOEX ISS.
+"""
+
+import functools
+import json
+from collections.abc import Callable
+from typing import Any, TypedDict
+
+Decoder = Callable[[bytes], Any]
+
+
+class _CompactTable(TypedDict):
+    columns: list[str]
+    data: list[list[str | int | float | None]]
+
+
+def stdlib_decoder() -> Decoder:
+    """Декодер из стандартного модуля json."""
+    return json.loads
+
+
+def orjson_decoder() -> Decoder:
+    """Декодер orjson - требует установки дополнительной зависимости aiomoex[orjson]."""
+    import orjson  # noqa: PLC0415
+
+    return orjson.loads
+
+
+def msgspec_decoder() -> Decoder:
+    """Декодер msgspec, проверяющий формат ответа, - требует установки дополнительной зависимости aiomoex[msgspec].
+
+    Ответ декодируется сразу в словарь таблиц из наименований столбцов и списков значений для каждой строки, а
+    ответ в другом формате вызывает msgspec.ValidationError.
+    """
+    import msgspec  # noqa: PLC0415
+
+    return msgspec.json.Decoder(dict[str, _CompactTable]).decode
+
+
+@functools.cache
+def default_decoder() -> Decoder:
+    """Самый быстрый из установленных декодеров."""
+    for make_decoder in (orjson_decoder, msgspec_decoder):
+        try:
+            return make_decoder()
+        except ImportError:
+            continue
+
+    return stdlib_decoder()
@@ -0,0 +1,123 @@
+"""Постоянный кэш блоков данных MOEX ISS на диске."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Final
+
+from aiomoex import dates
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed);
+"""
+_EVICT: Final = """
+DELETE FROM pages WHERE key IN (
+    SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS total FROM pages)
+    WHERE total > ?
+)
+"""
+
+
+class DiskCache:
+    """Кэш блоков данных MOEX ISS в базе SQLite.
+
+    Блоки данных запросов, интервал дат которых закончился до текущей даты, не меняются и хранятся без
+    ограничения срока. Остальные блоки хранятся заданное время. При превышении допустимого размера кэша
+    удаляются блоки, к которым дольше всего не было обращений.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 2**30, ttl: float = 3600) -> None:
+        """Кэш в указанном файле - файл создается при отсутствии.
+
+        :param path:
+            Путь к файлу базы SQLite.
+        :param max_bytes:
+            Максимальный суммарный размер хранимых блоков данных в байтах.
+        :param ttl:
+            Срок хранения в секундах блоков данных, которые могут измениться.
+        """
+        self._path = Path(path)
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+        self._conn.executescript(_SCHEMA)
+        # Суммарный размер блоков отслеживается при изменениях, чтобы не сканировать таблицу при каждой записи
+        self._total_bytes = self._sum_size()
+
+    def __repr__(self) -> str:
+        """Наименование класса и путь к файлу кэша."""
+        class_name = self.__class__.__name__
+        return f"{class_name}(path={self._path}, max_bytes={self._max_bytes}, ttl={self._ttl})"
+
+    async def get(self, url: str, query: Mapping[str, str | int]) -> Any | None:  # noqa: ANN401
+        """Блок данных для запроса - None, если он отсутствует в кэше или срок его хранения истек."""
+        return await asyncio.to_thread(self._get, _make_key(url, query))
+
+    async def set(self, url: str, query: Mapping[str, str | int], block: object) -> None:
+        """Сохраняет блок данных для запроса."""
+        expires = None if _is_immutable(query) else time.time() + self._ttl
+        await asyncio.to_thread(self._set, _make_key(url, query), json.dumps(block).encode(), expires)
+
+    def clear(self) -> None:
+        """Удаляет все блоки данных из кэша."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        """Закрывает файл кэша."""
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, key: str) -> Any | None:  # noqa: ANN401
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT data, size, expires FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            data, size, expires = row
+            if expires is not None and expires < now:
+                self._conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+                self._total_bytes -= size
+                return None
+            self._conn.execute("UPDATE pages SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(data)
+
+    def _set(self, key: str, data: bytes, expires: float | None) -> None:
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (key, data, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), expires, time.time()),
+            )
+            self._total_bytes += len(data) - (old[0] if old else 0)
+            if self._total_bytes > self._max_bytes:
+                self._conn.execute(_EVICT, (self._max_bytes,))
+                self._total_bytes = self._sum_size()
+
+    def _sum_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+
+def _make_key(url: str, query: Mapping[str, str | int]) -> str:
+    """Ключ запроса, не зависящий от порядка параметров."""
+    params = "&".join(f"{name}={value}" for name, value in sorted(query.items()))
+    return f"{url}?{params}"
+
+
+def _is_immutable(query: Mapping[str, str | int]) -> bool:
+    """Запрос за интервал дат, закончившийся до текущей даты, всегда возвращает одинаковые данные."""
+    till = query.get("till")
+    return isinstance(till, str) and till[:10] < dates.today().isoformat()
@@ -0,0 +1,164 @@
+"""Массовая загрузка свечек в нескольких процессах для распараллеливания разбора ответов.
+
+При загрузке минутных свечек для множества бумаг узким местом становится не сеть, а разбор json и заполнение
+таблиц, которые в одном процессе выполняются на одном ядре. Бумаги распределяются между процессами, каждый из
+которых работает со своим циклом событий и сессией http соединения, а результаты передаются в виде столбцов,
+числовые данные которых хранятся в компактных типизированных массивах.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import dataclasses
+import functools
+import multiprocessing
+import os
+from collections.abc import AsyncIterator, Iterable
+from typing import NamedTuple
+
+import aiohttp
+
+from aiomoex import client, columnar, request_helpers, settings
+from aiomoex.bulk import TICKER_ERRORS
+from aiomoex.rate_limit import RateLimiter
+from aiomoex.request_helpers import CANDLES, DEFAULT_BOARD, DEFAULT_ENGINE, DEFAULT_MARKET
+
+
+class ColumnsResult(NamedTuple):
+    """Результат загрузки данных по одному инструменту в виде столбцов.
+
+    При ошибке загрузки data содержит пустую таблицу, а error - исключение ISSMoexError с описанием возникшей
+    ошибки, так как исходное исключение не всегда может быть передано между процессами.
+    """
+
+    security: str
+    data: columnar.Columns
+    error: client.ISSMoexError | None = None
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class _Chunk:
+    """Часть бумаг, загружаемая одним процессом, с адресами запросов и общими параметрами."""
+
+    urls: tuple[tuple[str, str], ...]
+    query: client.WebQuery
+    rate: float
+    max_in_flight: int
+
+
+async def process_bulk_board_candles(
+    securities: Iterable[str],
+    interval: int = 1,
+    start: str | None = None,
+    end: str | None = None,
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
+    *,
+    processes: int | None = None,
+    rate: float = 10,
+    chunk_size: int = 8,
+    max_in_flight: int = 4,
+) -> AsyncIterator[ColumnsResult]:
+    """Загрузить свечи в формате HLOCV для множества бумаг в нескольких процессах в виде столбцов.
+
+    Аналог bulk_board_candles() для загрузки больших объемов данных, при которой разбор ответов не успевает за
+    сетью. Бумаги разбиваются на части, которые загружаются процессами с собственными циклами событий и сессиями
+    http соединения. Общее ограничение частоты запросов делится между процессами поровну. Результаты выдаются
+    по мере загрузки частей, а не в порядке перечисления бумаг. Ошибка загрузки одной бумаги не прерывает
+    загрузку остальных и возвращается в поле error результата.
+
+    :param securities:
+        Тикеры ценных бумаг.
+    :param interval:
+        Размер свечки - целое число 1 (1 минута), 10 (10 минут), 60 (1 час), 24 (1 день), 7 (1 неделя),
+        31 (1 месяц) или 4 (1 квартал). По умолчанию минутные данные.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить. Если пустой или None, то загружаются все столбцы.
+    :param processes:
+        Количество процессов - по умолчанию количество доступных ядер.
+    :param rate:
+        Общее для всех процессов ограничение на количество запросов в секунду.
+    :param chunk_size:
+        Количество бумаг в части, загружаемой процессом за раз.
+    :param max_in_flight:
+        Ограничение на количество одновременно загружаемых бумаг в каждом процессе.
+
+    :return:
+        Асинхронный итератор результатов загрузки по отдельным бумагам.
+    """
+    processes = processes or os.process_cpu_count() or 1
+    query = request_helpers.make_query(interval=interval, start=start, end=end, table=CANDLES, columns=columns)
+    urls = [
+        (
+            security,
+            request_helpers.make_url(engine=engine, market=market, board=board, security=security, suffix=CANDLES),
+        )
+        for security in securities
+    ]
+    chunks = [
+        _Chunk(tuple(urls[first : first + chunk_size]), query, rate / processes, max_in_flight)
+        for first in range(0, len(urls), chunk_size)
+    ]
+
+    loop = asyncio.get_running_loop()
+    pool = concurrent.futures.ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        futures = [loop.run_in_executor(pool, _load_chunk, chunk) for chunk in chunks]
+        for future in asyncio.as_completed(futures):
+            for result in await future:
+                yield result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _load_chunk(chunk: _Chunk) -> list[ColumnsResult]:
+    """Загружает часть бумаг в цикле событий процесса."""
+    runner, session = _worker(chunk.rate)
+    return runner.run(_load_securities(session, chunk))
+
+
+@functools.cache
+def _worker(rate: float) -> tuple[asyncio.Runner, aiohttp.ClientSession]:
+    """Цикл событий и сессия процесса, которые используются для всех загружаемых им частей."""
+    runner = asyncio.Runner()
+    session = runner.run(_create_session(rate))
+
+    def close() -> None:
+        runner.run(session.close())
+        runner.close()
+
+    atexit.register(close)
+    return runner, session
+
+
+async def _create_session(rate: float) -> aiohttp.ClientSession:
+    return settings.create_session(limiter=RateLimiter(rate=rate, burst=max(1, round(rate))))
+
+
+async def _load_securities(session: aiohttp.ClientSession, chunk: _Chunk) -> list[ColumnsResult]:
+    semaphore = asyncio.Semaphore(chunk.max_in_flight)
+
+    async def load(security: str, url: str) -> ColumnsResult:
+        async with semaphore:
+            try:
+                data = await request_helpers.get_long_columns(session, url, CANDLES, chunk.query)
+            except TICKER_ERRORS as err:
+                return ColumnsResult(security, columnar.Columns(), client.ISSMoexError(f"{security}: {err!r}"))
+            return ColumnsResult(security, data)
+
+    async with client.task_group() as group:
+        tasks = [group.create_task(load(security, url)) for security, url in chunk.urls]
+
+    return [task.result() for task in tasks]
@@ -0,0 +1,351 @@
+"""Потоковая выгрузка истории торгов и свечек в файлы Parquet и Arrow IPC.
+
+Блоки данных записываются в файлы по мере загрузки, поэтому выгрузка длинной истории требует постоянного объема
+памяти. Файлы разбиваются на разделы в стиле Hive - security=.../board=.../interval=.../year=..., которые
+напрямую читаются pyarrow.dataset, pandas и другими инструментами. Требует установки дополнительной зависимости
+aiomoex[arrow].
+"""
+
+import itertools
+import time
+from collections.abc import AsyncIterable, Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Literal
+
+import aiohttp
+
+from aiomoex import client, columnar, request_helpers
+from aiomoex.candles import BEGIN
+from aiomoex.history import TRADEDATE
+from aiomoex.request_helpers import CANDLES, DEFAULT_BOARD, DEFAULT_ENGINE, DEFAULT_MARKET, HISTORY
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+FileFormat = Literal["parquet", "arrow"]
+
+_SUFFIXES: Final[dict[FileFormat, str]] = {"parquet": ".parquet", "arrow": ".arrow"}
+# Максимальное количество строк, которые накапливаются в памяти до определения типов всех столбцов файла
+_MAX_PENDING_ROWS: Final = 10_000
+
+
+async def export_board_candles(
+    session: aiohttp.ClientSession,
+    security: str,
+    path: str | Path,
+    interval: int = 24,
+    start: str | None = None,
+    end: str | None = None,
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
+    *,
+    file_format: FileFormat = "parquet",
+    append: bool = False,
+) -> int:
+    """Выгрузить свечи указанного инструмента в указанном режиме торгов в файлы с разбивкой по годам.
+
+    Файлы располагаются в каталоге path/security=.../board=.../interval=.../year=....
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param path:
+        Корневой каталог выгрузки.
+    :param interval:
+        Размер свечки - целое число 1 (1 минута), 10 (10 минут), 60 (1 час), 24 (1 день), 7 (1 неделя),
+        31 (1 месяц) или 4 (1 квартал). По умолчанию дневные данные.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить, - должен содержать время начала свечки. Если пустой или None, то
+        загружаются все столбцы.
+    :param file_format:
+        Формат файлов - "parquet" или "arrow" (Arrow IPC, он же Feather версии 2).
+    :param append:
+        Если False, то ранее выгруженные файлы инструмента удаляются после успешной выгрузки. Если True, то
+        загрузка начинается с даты последней ранее выгруженной свечи, а выгружаются только более поздние свечи в
+        новые файлы рядом с ранее выгруженными.
+
+    :return:
+        Количество выгруженных свечей.
+    """
+    url = request_helpers.make_url(
+        engine=engine,
+        market=market,
+        board=board,
+        security=security,
+        suffix=CANDLES,
+    )
+    root = Path(path) / f"security={security}" / f"board={board}" / f"interval={interval}"
+    last = _last_key(root, BEGIN, file_format) if append else None
+    start = _resume_start(start, last)
+    query = request_helpers.make_query(interval=interval, start=start, end=end, table=CANDLES, columns=columns)
+    blocks = client.ISSClient(session, url, query).iter_compact()
+    return await _export(blocks, CANDLES, BEGIN, root, file_format=file_format, last=last, append=append)
+
+
+async def export_board_history(
+    session: aiohttp.ClientSession,
+    security: str,
+    path: str | Path,
+    start: str | None = None,
+    end: str | None = None,
+    columns: Iterable[str] | None = ("BOARDID", "TRADEDATE", "CLOSE", "VOLUME", "VALUE"),
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    *,
+    file_format: FileFormat = "parquet",
+    append: bool = False,
+) -> int:
+    """Выгрузить историю торгов для указанной бумаги в указанном режиме торгов в файлы с разбивкой по годам.
+
+    Файлы располагаются в каталоге path/security=.../board=.../year=....
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param path:
+        Корневой каталог выгрузки.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить, - должен содержать дату торгов. Если пустой или None, то
+        загружаются все столбцы.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param file_format:
+        Формат файлов - "parquet" или "arrow" (Arrow IPC, он же Feather версии 2).
+    :param append:
+        Если False, то ранее выгруженные файлы бумаги удаляются после успешной выгрузки. Если True, то загрузка
+        начинается с последней ранее выгруженной даты торгов, а выгружается только история после нее в новые файлы
+        рядом с ранее выгруженными.
+
+    :return:
+        Количество выгруженных строк истории.
+    """
+    url = request_helpers.make_url(
+        prefix=HISTORY,
+        engine=engine,
+        market=market,
+        board=board,
+        security=security,
+    )
+    root = Path(path) / f"security={security}" / f"board={board}"
+    last = _last_key(root, TRADEDATE, file_format) if append else None
+    start = _resume_start(start, last)
+    query = request_helpers.make_query(start=start, end=end, table=HISTORY, columns=columns)
+    blocks = client.ISSClient(session, url, query).iter_compact()
+    return await _export(blocks, HISTORY, TRADEDATE, root, file_format=file_format, last=last, append=append)
+
+
+async def _export(
+    blocks: AsyncIterable[client.CompactTablesDict],
+    table_name: str,
+    key: str,
+    root: Path,
+    *,
+    file_format: FileFormat,
+    last: str | None,
+    append: bool,
+) -> int:
+    """Записывает блоки данных в файлы разделов по годам значений ключевого столбца.
+
+    Строки со значением ключевого столбца не больше last, который был выгружен ранее, отбрасываются. Ранее
+    выгруженные файлы при перезаписи удаляются только после успешной записи новых, а при ошибке удаляются новые
+    файлы.
+    """
+    old_parts = [] if append else _parts(root)
+
+    part = f"part-{time.time_ns()}{_SUFFIXES[file_format]}"
+    new_parts: list[Path] = []
+    writer: _Writer | None = None
+    rows = 0
+    try:
+        async for block in blocks:
+            table = request_helpers.get_table(block, table_name)
+            for year, data in _split_years(table, key, last):
+                batch = columnar.Columns()
+                batch.extend_compact(table["columns"], data)
+                arrow_table = batch.to_arrow()
+
+                if writer is None or writer.year != year:
+                    if writer is not None:
+                        writer.close()
+                    new_parts.append(root / f"year={year}" / part)
+                    writer = _Writer(new_parts[-1], file_format, year)
+
+                writer.write(arrow_table)
+                rows += len(data)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        _remove_parts(new_parts)
+        raise
+
+    if writer is not None:
+        writer.close()
+    _remove_parts(old_parts)
+
+    return rows
+
+
+def _resume_start(start: str | None, last: str | None) -> str | None:
+    """Начальная дата загрузки не раньше дня последней ранее выгруженной строки, который отбрасывается при записи."""
+    if last is None:
+        return start
+    return max(start or "", last[:10])
+
+
+def _split_years(
+    table: client.CompactTable,
+    key: str,
+    last: str | None,
+) -> Iterator[tuple[str, list[list[client.Values]]]]:
+    """Разбивает упорядоченные строки таблицы на группы по году и отбрасывает ранее выгруженные строки."""
+    try:
+        position = table["columns"].index(key)
+    except ValueError as err:
+        raise client.ISSMoexError(f"Отсутствует столбец {key} в данных") from err
+
+    data = table["data"]
+    if last is not None:
+        data = [row for row in data if str(row[position]) > last]
+
+    for year, rows in itertools.groupby(data, lambda row: str(row[position])[:4]):
+        yield year, list(rows)
+
+
+class _Writer:
+    """Запись таблиц Arrow одного года в один файл.
+
+    Целочисленные столбцы записываются как float64, так как в следующих блоках данных в них могут встретиться
+    дробные числа. Тип столбцов без значений неизвестен, поэтому файл создается после появления значений во всех
+    столбцах, а до этого таблицы накапливаются в памяти, но не более _MAX_PENDING_ROWS строк. Столбцы, в которых
+    к этому моменту не встретилось ни одного значения, записываются как строковые, так как в строки без потерь
+    преобразуются значения любого типа.
+    """
+
+    def __init__(self, path: Path, file_format: FileFormat, year: str) -> None:
+        self.year = year
+        self._path = path
+        self._file_format = file_format
+        self._pending: list[pa.Table] = []
+        self._schema: pa.Schema | None = None
+        self._writer: pq.ParquetWriter | pa.RecordBatchFileWriter | None = None
+
+    def write(self, table: "pa.Table") -> None:
+        if self._writer is not None and self._schema is not None:
+            self._writer.write_table(table.cast(self._schema))
+            return
+
+        import pyarrow as pa  # noqa: PLC0415
+
+        self._pending.append(table)
+        schema = _file_schema(self._pending)
+        if not any(pa.types.is_null(type_) for type_ in schema.types):
+            self._open(schema)
+        elif sum(len(pending) for pending in self._pending) >= _MAX_PENDING_ROWS:
+            self._open(_fill_null_types(schema))
+
+    def close(self) -> None:
+        if self._writer is None and self._pending:
+            self._open(_fill_null_types(_file_schema(self._pending)))
+        if self._writer is not None:
+            self._writer.close()
+
+    def _open(self, schema: "pa.Schema") -> None:
+        import pyarrow as pa  # noqa: PLC0415
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        if self._file_format == "parquet":
+            import pyarrow.parquet as pq  # noqa: PLC0415
+
+            writer: pq.ParquetWriter | pa.RecordBatchFileWriter = pq.ParquetWriter(self._path, schema)
+        else:
+            writer = pa.ipc.new_file(str(self._path), schema)
+
+        for table in self._pending:
+            writer.write_table(table.cast(schema))
+        self._pending.clear()
+        self._schema = schema
+        self._writer = writer
+
+
+def _file_schema(tables: list["pa.Table"]) -> "pa.Schema":
+    """Общая схема таблиц с типами столбцов из первой таблицы, где в столбце есть значения."""
+    import pyarrow as pa  # noqa: PLC0415
+
+    schema = pa.unify_schemas([table.schema for table in tables], promote_options="permissive")
+    return pa.schema(
+        [
+            (name, pa.float64() if pa.types.is_integer(type_) else type_)
+            for name, type_ in zip(schema.names, schema.types, strict=True)
+        ],
+    )
+
+
+def _fill_null_types(schema: "pa.Schema") -> "pa.Schema":
+    """Схема, в которой столбцы без значений заменены строковыми."""
+    import pyarrow as pa  # noqa: PLC0415
+
+    return pa.schema(
+        [
+            (name, pa.string() if pa.types.is_null(type_) else type_)
+            for name, type_ in zip(schema.names, schema.types, strict=True)
+        ],
+    )
+
+
+def _parts(root: Path, file_format: FileFormat | None = None) -> list[Path]:
+    suffixes = [_SUFFIXES[file_format]] if file_format else list(_SUFFIXES.values())
+    return sorted(part for suffix in suffixes for part in root.glob(f"year=*/part-*{suffix}"))
+
+
+def _remove_parts(parts: Iterable[Path]) -> None:
+    for part in parts:
+        part.unlink(missing_ok=True)
+
+
+def _last_key(root: Path, key: str, file_format: FileFormat) -> str | None:
+    """Последнее значение ключевого столбца в ранее выгруженных файлах последнего года."""
+    parts = _parts(root, file_format)
+    if not parts:
+        return None
+
+    last_year = parts[-1].parent
+    values = [value for part in parts if part.parent == last_year for value in _read_column(part, key, file_format)]
+    return max(values, default=None)
+
+
+def _read_column(path: Path, key: str, file_format: FileFormat) -> list[str]:
+    import pyarrow as pa  # noqa: PLC0415
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq  # noqa: PLC0415
+
+        table = pq.ParquetFile(path).read(columns=[key])  # pyright: ignore[reportUnknownMemberType]
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all().select([key])
+
+    return [str(value) for value in table.column(key).to_pylist()]
@@ -1,12 +1,28 @@
 """Функции для получения данных об исторических дневных котировках."""
 
-from collections.abc import Iterable
+import enum
+import heapq
+from collections.abc import AsyncIterator, Iterable, Mapping
+from typing import Final, Literal
 
 import aiohttp
 
-from aiomoex import client, request_helpers
+from aiomoex import client, lazy, request_helpers, rows
 from aiomoex.request_helpers import DEFAULT_BOARD, DEFAULT_ENGINE, DEFAULT_MARKET, SECURITIES
 
+TRADEDATE: Final = "TRADEDATE"
+# Столбцы таблиц, загружаемые get_board_securities() по умолчанию, - для остальных таблиц загружаются все столбцы
+BOARD_SECURITIES_COLUMNS: Final[Mapping[str, tuple[str, ...]]] = {
+    SECURITIES: ("SECID", "REGNUMBER", "LOTSIZE", "SHORTNAME"),
+}
+BOARDS_COLUMNS: Final = ("secid", "boardid", "market", "engine", "is_traded", "history_from", "history_till")
+
+
+class _Default(enum.Enum):
+    """Значения по умолчанию, которые зависят от других аргументов функции."""
+
+    COLUMNS = "columns"
+
 
 async def get_board_dates(
     session: aiohttp.ClientSession,
@@ -44,7 +60,7 @@ async def get_board_dates(
 async def get_board_securities(
     session: aiohttp.ClientSession,
     table: str = SECURITIES,
-    columns: Iterable[str] | None = ("SECID", "REGNUMBER", "LOTSIZE", "SHORTNAME"),
+    columns: Iterable[str] | Literal[_Default.COLUMNS] | None = _Default.COLUMNS,
     board: str = DEFAULT_BOARD,
     market: str = DEFAULT_MARKET,
     engine: str = DEFAULT_ENGINE,
@@ -59,8 +75,9 @@ async def get_board_securities(
         Таблица с данными, которую нужно вернуть: securities - справочник торгуемых ценных бумаг,
         marketdata - данные с результатами торгов текущего дня.
     :param columns:
-        Кортеж столбцов, которые нужно загрузить - по умолчанию тикер, номер государственно регистрации,
-        размер лота и краткое название. Если пустой или None, то загружаются все столбцы.
+        Кортеж столбцов, которые нужно загрузить - по умолчанию столбцы таблицы из BOARD_SECURITIES_COLUMNS: для
+        таблицы securities тикер, номер государственно регистрации, размер лота и краткое название, а для
+        остальных таблиц все столбцы. Если пустой или None, то загружаются все столбцы.
     :param board:
         Режим торгов - по умолчанию основной режим торгов T+2.
     :param market:
@@ -71,6 +88,8 @@ async def get_board_securities(
     :return:
         Список словарей, которые напрямую конвертируется в pandas.DataFrame
     """
+    if columns is _Default.COLUMNS:
+        columns = BOARD_SECURITIES_COLUMNS.get(table)
     url = request_helpers.make_url(engine=engine, market=market, board=board, suffix=SECURITIES)
     query = request_helpers.make_query(table=table, columns=columns)
     return await request_helpers.get_short_data(session, url, table, query)
@@ -161,3 +180,324 @@ async def get_board_history(
     table = "history"
     query = request_helpers.make_query(start=start, end=end, table=table, columns=columns)
     return await request_helpers.get_long_data(session, url, table, query)
+
+
+async def get_board_history_rows(
+    session: aiohttp.ClientSession,
+    security: str,
+    start: str | None = None,
+    end: str | None = None,
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+) -> list[rows.HistoryRow]:
+    """Получить историю торгов для указанной бумаги в указанном режиме торгов в виде типизированных строк.
+
+    Аналог get_board_history() со столбцами по умолчанию, в котором каждый блок данных сразу преобразуется в
+    строки с датой торгов в виде date, занимающие в несколько раз меньше памяти, чем словари.
+
+    Описание запроса - https://iss.moex.com/iss/reference/65
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+
+    :return:
+        Список итогов торгов за каждый день.
+    """
+    url = request_helpers.make_url(
+        prefix=request_helpers.HISTORY,
+        engine=engine,
+        market=market,
+        board=board,
+        security=security,
+    )
+    table = "history"
+    query = request_helpers.make_query(start=start, end=end, table=table, columns=rows.HISTORY_COLUMNS)
+    return await request_helpers.get_long_rows(session, url, table, rows.to_history, query)
+
+
+async def iter_market_history(
+    session: aiohttp.ClientSession,
+    security: str,
+    start: str | None = None,
+    end: str | None = None,
+    columns: Iterable[str] | None = ("BOARDID", "TRADEDATE", "CLOSE", "VOLUME", "VALUE"),
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+) -> AsyncIterator[client.Table]:
+    """Получить историю по одной бумаге на рынке для всех режимов торгов блоками по мере их загрузки.
+
+    Аналог get_market_history(), который не накапливает все данные в памяти.
+
+    Описание запроса - https://iss.moex.com/iss/reference/63
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить - по умолчанию режим торгов, дата торгов, цена закрытия
+        и объем в штуках и стоимости. Если пустой или None, то загружаются все столбцы.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+
+    :return:
+        Асинхронный итератор блоков - списков словарей, которые напрямую конвертируется в pandas.DataFrame.
+    """
+    url = request_helpers.make_url(prefix=request_helpers.HISTORY, engine=engine, market=market, security=security)
+    table = "history"
+    query = request_helpers.make_query(start=start, end=end, table=table, columns=columns)
+    async for block in request_helpers.iter_long_data(session, url, table, query):
+        yield block
+
+
+async def iter_board_history(
+    session: aiohttp.ClientSession,
+    security: str,
+    start: str | None = None,
+    end: str | None = None,
+    columns: Iterable[str] | None = ("BOARDID", "TRADEDATE", "CLOSE", "VOLUME", "VALUE"),
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+) -> AsyncIterator[client.Table]:
+    """Получить историю торгов для указанной бумаги в указанном режиме торгов блоками по мере их загрузки.
+
+    Аналог get_board_history(), который не накапливает все данные в памяти.
+
+    Описание запроса - https://iss.moex.com/iss/reference/65
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить - по умолчанию режим торгов, дата торгов, цена закрытия
+        и объем в штуках и стоимости. Если пустой или None, то загружаются все столбцы.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+
+    :return:
+        Асинхронный итератор блоков - списков словарей, которые напрямую конвертируется в pandas.DataFrame.
+    """
+    url = request_helpers.make_url(
+        prefix=request_helpers.HISTORY,
+        engine=engine,
+        market=market,
+        board=board,
+        security=security,
+    )
+    table = "history"
+    query = request_helpers.make_query(start=start, end=end, table=table, columns=columns)
+    async for block in request_helpers.iter_long_data(session, url, table, query):
+        yield block
+
+
+async def open_board_history(
+    session: aiohttp.ClientSession,
+    security: str,
+    start: str | None = None,
+    end: str | None = None,
+    columns: Iterable[str] | None = ("BOARDID", "TRADEDATE", "CLOSE", "VOLUME", "VALUE"),
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    cache_pages: int = 16,
+) -> lazy.LazyTable:
+    """Получить ленивое представление истории торгов, загружающее только блоки с запрошенными строками.
+
+    Аналог get_board_history() для случаев, когда нужна только часть истории, например, последние строки:
+    загружается первый блок данных с количеством строк, а остальные - при обращении к строкам.
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить - по умолчанию режим торгов, дата торгов, цена закрытия
+        и объем в штуках и стоимости. Если пустой или None, то загружаются все столбцы.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param cache_pages:
+        Максимальное количество блоков, которые хранятся в памяти.
+
+    :return:
+        Ленивое представление таблицы с историей торгов.
+    """
+    url = request_helpers.make_url(
+        prefix=request_helpers.HISTORY,
+        engine=engine,
+        market=market,
+        board=board,
+        security=security,
+    )
+    table = "history"
+    query = request_helpers.make_query(start=start, end=end, table=table, columns=columns)
+    return await lazy.LazyTable.open(session, url, table, query, cache_pages)
+
+
+async def get_security_boards(
+    session: aiohttp.ClientSession,
+    security: str,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+) -> client.Table:
+    """Получить режимы торгов указанной бумаги на рынке с интервалами дат, доступных в истории.
+
+    Описание запроса - https://iss.moex.com/iss/reference/13
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+
+    :return:
+        Список словарей, которые напрямую конвертируется в pandas.DataFrame.
+    """
+    url = request_helpers.make_url(security=security)
+    table = "boards"
+    query = request_helpers.make_query(table=table, columns=BOARDS_COLUMNS)
+    data = await request_helpers.get_short_data(session, url, table, query)
+    return [row for row in data if row["market"] == market and row["engine"] == engine]
+
+
+async def get_market_history_by_board(
+    session: aiohttp.ClientSession,
+    security: str,
+    start: str | None = None,
+    end: str | None = None,
+    columns: Iterable[str] | None = ("BOARDID", "TRADEDATE", "CLOSE", "VOLUME", "VALUE"),
+    boards: Iterable[str] | None = None,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+) -> dict[str, client.Table]:
+    """Получить историю по одной бумаге на рынке отдельно для каждого режима торгов за интервал дат.
+
+    История по режимам торгов загружается параллельно с помощью get_board_history().
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить - по умолчанию режим торгов, дата торгов, цена закрытия
+        и объем в штуках и стоимости. Если пустой или None, то загружаются все столбцы.
+    :param boards:
+        Режимы торгов. Если None, то загружаются все режимы торгов из get_security_boards(), история которых
+        пересекается с интервалом дат.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+
+    :return:
+        Словарь, ключи которого соответствуют режимам торгов, а значения - списки словарей с историей торгов.
+    """
+    if boards is None:
+        boards = _active_boards(await get_security_boards(session, security, market, engine), start, end)
+
+    async with client.task_group() as group:
+        tasks = {
+            board: group.create_task(get_board_history(session, security, start, end, columns, board, market, engine))
+            for board in boards
+        }
+
+    return {board: task.result() for board, task in tasks.items()}
+
+
+async def get_market_history_merged(
+    session: aiohttp.ClientSession,
+    security: str,
+    start: str | None = None,
+    end: str | None = None,
+    columns: Iterable[str] | None = ("BOARDID", "TRADEDATE", "CLOSE", "VOLUME", "VALUE"),
+    boards: Iterable[str] | None = None,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+) -> client.Table:
+    """Получить историю по одной бумаге на рынке для всех режимов торгов, упорядоченную по дате торгов.
+
+    Аналог get_market_history(), загружающий историю по режимам торгов параллельно с помощью
+    get_market_history_by_board(). Упорядоченная история отдельных режимов торгов объединяется слиянием без
+    сортировки, а строки за одну дату следуют в порядке режимов торгов.
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить, - должен содержать дату торгов. Если пустой или None, то
+        загружаются все столбцы.
+    :param boards:
+        Режимы торгов. Если None, то загружаются все режимы торгов из get_security_boards(), история которых
+        пересекается с интервалом дат.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+
+    :return:
+        Список словарей, которые напрямую конвертируется в pandas.DataFrame.
+    """
+    columns = tuple(columns or ())
+    if columns and TRADEDATE not in columns:
+        raise client.ISSMoexError(f"Отсутствует столбец {TRADEDATE} в запросе")
+
+    data = await get_market_history_by_board(session, security, start, end, columns, boards, market, engine)
+    return list(heapq.merge(*data.values(), key=lambda row: str(row[TRADEDATE])))
+
+
+def _active_boards(boards: client.Table, start: str | None, end: str | None) -> list[str]:
+    """Режимы торгов, история которых пересекается с интервалом дат."""
+    return [
+        str(row["boardid"])
+        for row in boards
+        if not (end and row["history_from"] and str(row["history_from"]) > end)
+        and not (start and row["history_till"] and str(row["history_till"]) < start)
+    ]
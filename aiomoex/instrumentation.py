@@ -0,0 +1,264 @@
+"""Сбор статистики о запросах к MOEX ISS.
+
+Наблюдатель, установленный для сессии с помощью configure_session(), получает информацию о каждом загруженном блоке
+данных и о каждой полной загрузке всех блоков запроса. Для измерения времени установки соединения сессия должна
+быть создана с конфигурацией трассировки из trace_config() - create_session() делает это автоматически при
+передаче наблюдателя.
+"""
+
+import dataclasses
+import time
+from collections.abc import Mapping
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Final, cast
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from prometheus_client import CollectorRegistry
+
+# Ключ таймера соединения в контексте трассировки запроса
+_TIMER_KEY: Final = "aiomoex_connect_timer"
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class RequestStats:
+    """Статистика загрузки одного блока данных.
+
+    Время указывается в секундах: connect - установка соединения (ноль для переиспользованного соединения),
+    ttfb - ожидание заголовков ответа после установки соединения, body - загрузка тела ответа, decode - разбор
+    json. Для блоков из кэша на диске время равно нулю.
+    """
+
+    url: str
+    query: Mapping[str, str | int]
+    status: int = 200
+    connect: float = 0
+    ttfb: float = 0
+    body: float = 0
+    decode: float = 0
+    size: int = 0
+    rows: int = 0
+    retries: int = 0
+    cached: bool = False
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class PagesStats:
+    """Статистика загрузки всех блоков данных запроса."""
+
+    url: str
+    query: Mapping[str, str | int]
+    pages: int
+    rows: int
+    elapsed: float
+
+
+class Observer:
+    """Базовый класс наблюдателя - методы ничего не делают и переопределяются в наследниках при необходимости."""
+
+    def on_request(self, stats: RequestStats) -> None:
+        """Вызывается после загрузки каждого блока данных."""
+
+    def on_pages(self, stats: PagesStats) -> None:
+        """Вызывается после загрузки всех блоков данных запроса."""
+
+
+class StatsCollector(Observer):
+    """Наблюдатель, накапливающий суммарную статистику в памяти."""
+
+    def __init__(self) -> None:
+        """Статистика без запросов."""
+        self.requests = 0
+        self.cached = 0
+        self.retries = 0
+        self.size = 0
+        self.rows = 0
+        self.connect = 0.0
+        self.ttfb = 0.0
+        self.body = 0.0
+        self.decode = 0.0
+        self.pages_requests = 0
+        self.pages = 0
+
+    def __repr__(self) -> str:
+        """Наименование класса и основные показатели."""
+        class_name = self.__class__.__name__
+        return f"{class_name}(requests={self.requests}, cached={self.cached}, size={self.size}, rows={self.rows})"
+
+    def on_request(self, stats: RequestStats) -> None:
+        """Добавляет статистику загрузки блока данных."""
+        self.requests += 1
+        self.cached += stats.cached
+        self.retries += stats.retries
+        self.size += stats.size
+        self.rows += stats.rows
+        self.connect += stats.connect
+        self.ttfb += stats.ttfb
+        self.body += stats.body
+        self.decode += stats.decode
+
+    def on_pages(self, stats: PagesStats) -> None:
+        """Добавляет статистику загрузки всех блоков данных запроса."""
+        self.pages_requests += 1
+        self.pages += stats.pages
+
+
+class PrometheusObserver(Observer):
+    """Наблюдатель, публикующий метрики в prometheus_client.
+
+    Требует установки дополнительной зависимости aiomoex[prometheus].
+    """
+
+    def __init__(self, registry: "CollectorRegistry | None" = None, prefix: str = "aiomoex") -> None:
+        """Создает и регистрирует метрики.
+
+        :param registry:
+            Реестр метрик - по умолчанию глобальный реестр prometheus_client.
+        :param prefix:
+            Префикс наименований метрик.
+        """
+        import prometheus_client  # noqa: PLC0415
+
+        registry = registry or prometheus_client.REGISTRY
+        self._phases = prometheus_client.Histogram(
+            f"{prefix}_request_phase_seconds",
+            "Время этапов загрузки блока данных MOEX ISS",
+            ["phase"],
+            registry=registry,
+        )
+        self._requests = prometheus_client.Counter(
+            f"{prefix}_requests",
+            "Количество загруженных блоков данных MOEX ISS",
+            ["cached"],
+            registry=registry,
+        )
+        self._retries = prometheus_client.Counter(
+            f"{prefix}_retries",
+            "Количество повторных запросов к MOEX ISS",
+            registry=registry,
+        )
+        self._size = prometheus_client.Counter(
+            f"{prefix}_response_bytes",
+            "Размер ответов MOEX ISS",
+            registry=registry,
+        )
+        self._rows = prometheus_client.Histogram(
+            f"{prefix}_rows_per_page",
+            "Количество строк в блоке данных MOEX ISS",
+            buckets=(0, 1, 10, 50, 100, 500, 1000, 5000),
+            registry=registry,
+        )
+        self._pages = prometheus_client.Histogram(
+            f"{prefix}_pages_per_request",
+            "Количество блоков данных в запросе к MOEX ISS",
+            buckets=(1, 2, 5, 10, 20, 50, 100, 500, 1000),
+            registry=registry,
+        )
+
+    def on_request(self, stats: RequestStats) -> None:
+        """Обновляет метрики загрузки блока данных."""
+        self._requests.labels(cached=str(stats.cached)).inc()
+        if stats.cached:
+            return
+        for phase in ("connect", "ttfb", "body", "decode"):
+            self._phases.labels(phase=phase).observe(getattr(stats, phase))
+        self._retries.inc(stats.retries)
+        self._size.inc(stats.size)
+        self._rows.observe(stats.rows)
+
+    def on_pages(self, stats: PagesStats) -> None:
+        """Обновляет метрики загрузки всех блоков данных запроса."""
+        self._pages.observe(stats.pages)
+
+
+class OpenTelemetryObserver(Observer):
+    """Наблюдатель, публикующий метрики через OpenTelemetry Metrics API.
+
+    Требует установки дополнительной зависимости aiomoex[opentelemetry].
+    """
+
+    def __init__(self, meter_name: str = "aiomoex") -> None:
+        """Создает инструменты измерения.
+
+        :param meter_name:
+            Наименование измерителя OpenTelemetry.
+        """
+        from opentelemetry import metrics  # noqa: PLC0415
+
+        meter = metrics.get_meter(meter_name)
+        self._phases = meter.create_histogram(
+            "aiomoex.request.phase.duration",
+            unit="s",
+            description="Время этапов загрузки блока данных MOEX ISS",
+        )
+        self._requests = meter.create_counter("aiomoex.requests", description="Количество загруженных блоков")
+        self._retries = meter.create_counter("aiomoex.retries", description="Количество повторных запросов")
+        self._size = meter.create_counter("aiomoex.response.size", unit="By", description="Размер ответов")
+        self._rows = meter.create_histogram("aiomoex.page.rows", description="Количество строк в блоке данных")
+        self._pages = meter.create_histogram("aiomoex.request.pages", description="Количество блоков в запросе")
+
+    def on_request(self, stats: RequestStats) -> None:
+        """Обновляет метрики загрузки блока данных."""
+        self._requests.add(1, {"cached": stats.cached})
+        if stats.cached:
+            return
+        for phase in ("connect", "ttfb", "body", "decode"):
+            self._phases.record(getattr(stats, phase), {"phase": phase})
+        self._retries.add(stats.retries)
+        self._size.add(stats.size)
+        self._rows.record(stats.rows)
+
+    def on_pages(self, stats: PagesStats) -> None:
+        """Обновляет метрики загрузки всех блоков данных запроса."""
+        self._pages.record(stats.pages)
+
+
+class ConnectTimer:
+    """Время установки соединения для запроса, измеряемое с помощью конфигурации трассировки trace_config()."""
+
+    __slots__ = ("_start", "connect")
+
+    def __init__(self) -> None:
+        """Соединение не устанавливалось."""
+        self._start = 0.0
+        self.connect = 0.0
+
+    def start(self) -> None:
+        """Начало установки соединения."""
+        self._start = time.perf_counter()
+
+    def end(self) -> None:
+        """Окончание установки соединения."""
+        self.connect = time.perf_counter() - self._start
+
+    def request_ctx(self) -> Mapping[str, "ConnectTimer"]:
+        """Контекст трассировки, который передается в запрос в параметре trace_request_ctx."""
+        return {_TIMER_KEY: self}
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """Конфигурация трассировки aiohttp для измерения времени установки соединений."""
+    config = aiohttp.TraceConfig()
+    config.on_connection_create_start.append(_on_connection_create_start)
+    config.on_connection_create_end.append(_on_connection_create_end)
+    return config
+
+
+async def _on_connection_create_start(_: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any) -> None:  # noqa: ANN401
+    if (timer := _connect_timer(ctx)) is not None:
+        timer.start()
+
+
+async def _on_connection_create_end(_: aiohttp.ClientSession, ctx: SimpleNamespace, __: Any) -> None:  # noqa: ANN401
+    if (timer := _connect_timer(ctx)) is not None:
+        timer.end()
+
+
+def _connect_timer(ctx: SimpleNamespace) -> ConnectTimer | None:
+    """Таймер соединения из контекста трассировки - None для запросов без таймера."""
+    request_ctx: object = ctx.trace_request_ctx
+    if not isinstance(request_ctx, Mapping):
+        return None
+    timer = cast("Mapping[str, object]", request_ctx).get(_TIMER_KEY)
+    return timer if isinstance(timer, ConnectTimer) else None
@@ -0,0 +1,148 @@
+"""Ленивое представление таблицы MOEX ISS с загрузкой только необходимых блоков данных."""
+
+from collections import OrderedDict
+from typing import Self, cast, overload
+
+import aiohttp
+
+from aiomoex import client, request_helpers
+
+CURSOR = "history.cursor"
+
+
+class LazyTable:
+    """Таблица из ответа MOEX ISS с курсором history.cursor, блоки которой загружаются по мере обращения к строкам.
+
+    Количество строк известно из курсора после загрузки первого блока, поэтому представление создается с помощью
+    open(). Обращение к строкам по индексу или срезу, в том числе отрицательному, загружает только блоки,
+    содержащие эти строки, например, последние строки длинной истории загружаются одним-двумя запросами. Недавно
+    использованные блоки хранятся в памяти.
+    """
+
+    def __init__(
+        self,
+        iss: client.ISSClient,
+        table_name: str,
+        first_block: client.CompactTablesDict,
+        cache_pages: int = 16,
+    ) -> None:
+        """Представление по первому блоку данных - для создания следует использовать open().
+
+        :param iss:
+            Клиент с запросом.
+        :param table_name:
+            Таблица, которую нужно выбрать.
+        :param first_block:
+            Первый блок данных ответа с курсором history.cursor.
+        :param cache_pages:
+            Максимальное количество блоков, которые хранятся в памяти.
+        """
+        cursor_table = request_helpers.get_table(first_block, CURSOR)
+        cursor = dict(zip(cursor_table["columns"], cursor_table["data"][0], strict=True))
+        table = request_helpers.get_table(first_block, table_name)
+
+        self._iss = iss
+        self._table_name = table_name
+        self._columns = table["columns"]
+        self._len = cast("int", cursor["TOTAL"])
+        self._page_size = cast("int", cursor["PAGESIZE"])
+        self._cache_pages = max(cache_pages, 1)
+        self._pages: OrderedDict[int, list[list[client.Values]]] = OrderedDict({0: table["data"]})
+
+    @classmethod
+    async def open(
+        cls,
+        session: aiohttp.ClientSession,
+        url: str,
+        table_name: str,
+        query: client.WebQuery | None = None,
+        cache_pages: int = 16,
+    ) -> Self:
+        """Загружает первый блок данных и создает представление таблицы.
+
+        :param session:
+            Сессия http соединения.
+        :param url:
+            URL запроса.
+        :param table_name:
+            Таблица, которую нужно выбрать.
+        :param query:
+            Дополнительные параметры запроса - None, если нет параметров.
+        :param cache_pages:
+            Максимальное количество блоков, которые хранятся в памяти.
+
+        :return:
+            Представление таблицы.
+        :raises ISSMoexError:
+            Ответ не содержит курсор history.cursor.
+        """
+        iss = client.ISSClient(session, url, query)
+        first_block = await iss.get_compact()
+        return cls(iss, table_name, first_block, cache_pages)
+
+    def __repr__(self) -> str:
+        """Наименование класса, клиент с запросом и количество строк."""
+        class_name = self.__class__.__name__
+        return f"{class_name}(iss={self._iss}, table={self._table_name}, len={self._len})"
+
+    def __len__(self) -> int:
+        """Количество строк в таблице по данным курсора."""
+        return self._len
+
+    @overload
+    async def get(self, key: int) -> client.TableRow: ...
+
+    @overload
+    async def get(self, key: slice) -> client.Table: ...
+
+    async def get(self, key: int | slice) -> client.TableRow | client.Table:
+        """Загружает строку или срез строк таблицы.
+
+        :param key:
+            Номер строки или срез - поддерживаются отрицательные значения и шаг среза.
+
+        :return:
+            Строка в виде словаря или список словарей, который напрямую конвертируется в pandas.DataFrame.
+        :raises IndexError:
+            Номер строки за пределами таблицы.
+        """
+        if isinstance(key, slice):
+            positions = range(*key.indices(self._len))
+            rows = await self._rows(positions)
+            return [dict(zip(self._columns, row, strict=True)) for row in rows]
+
+        position = key + self._len if key < 0 else key
+        if not 0 <= position < self._len:
+            raise IndexError(f"Номер строки {key} за пределами таблицы из {self._len} строк")
+
+        (row,) = await self._rows(range(position, position + 1))
+        return dict(zip(self._columns, row, strict=True))
+
+    async def _rows(self, positions: range) -> list[list[client.Values]]:
+        """Значения строк с указанными номерами - недостающие блоки загружаются параллельно."""
+        needed = sorted({position // self._page_size for position in positions})
+        pages = {page: self._pages[page] for page in needed if page in self._pages}
+
+        async with client.task_group() as group:
+            tasks = {page: group.create_task(self._load_page(page)) for page in needed if page not in pages}
+        pages.update((page, task.result()) for page, task in tasks.items())
+
+        for page in needed:
+            self._pages[page] = pages[page]
+            self._pages.move_to_end(page)
+        while len(self._pages) > self._cache_pages:
+            self._pages.popitem(last=False)
+
+        rows: list[list[client.Values]] = []
+        for position in positions:
+            page, offset = divmod(position, self._page_size)
+            try:
+                rows.append(pages[page][offset])
+            except IndexError as err:
+                raise client.ISSMoexError(f"Количество строк в блоке {page} не соответствует курсору") from err
+
+        return rows
+
+    async def _load_page(self, page: int) -> list[list[client.Values]]:
+        block = await self._iss.get_compact(page * self._page_size)
+        return request_helpers.get_table(block, self._table_name)["data"]
@@ -0,0 +1,109 @@
+"""Длинная история торгов бумаги с учетом ее предыдущих тикеров.
+
+При смене наименования эмитента или реорганизации бумага может торговаться под новым тикером, а история торгов
+под старым тикером не выдается MOEX ISS вместе с новой. Предыдущие тикеры находятся по совпадающему номеру
+государственной регистрации или ISIN, а их история объединяется в один непрерывный ряд.
+"""
+
+from collections.abc import Iterable
+from typing import Final
+
+import aiohttp
+
+from aiomoex import client, history, reference
+from aiomoex.history import TRADEDATE
+from aiomoex.request_helpers import DEFAULT_ENGINE, DEFAULT_MARKET
+
+# Столбцы, по совпадению значений которых определяются тикеры одной бумаги, в порядке приоритета
+LINEAGE_COLUMNS: Final = ("regnumber", "isin")
+
+
+async def get_security_lineage(session: aiohttp.ClientSession, security: str) -> list[str]:
+    """Получить все тикеры бумаги, в том числе предыдущие, с тем же номером государственной регистрации.
+
+    Для бумаг без номера государственной регистрации тикеры определяются по ISIN. Результаты поиска кэшируются,
+    если для сессии установлен кэш справочных данных в памяти MemoryCache.
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+
+    :return:
+        Тикеры бумаги в алфавитном порядке.
+    """
+    columns = ("secid", *LINEAGE_COLUMNS)
+    data = await reference.find_securities(session, security, columns)
+    own = next((row for row in data if row["secid"] == security), None)
+    if own is None:
+        raise client.ISSMoexError(f"Не найден инструмент {security}")
+
+    for column in LINEAGE_COLUMNS:
+        if key := own[column]:
+            data = await reference.find_securities(session, str(key), columns)
+            return sorted({security, *(str(row["secid"]) for row in data if row[column] == key)})
+
+    return [security]
+
+
+async def get_lineage_history(
+    session: aiohttp.ClientSession,
+    security: str,
+    start: str | None = None,
+    end: str | None = None,
+    columns: Iterable[str] | None = ("BOARDID", "TRADEDATE", "SECID", "CLOSE", "VOLUME", "VALUE"),
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+) -> client.Table:
+    """Получить историю по всем тикерам бумаги на рынке, объединенную в один ряд, за интервал дат.
+
+    История тикеров, найденных get_security_lineage(), загружается параллельно с помощью get_market_history().
+    Если тикеры торговались одновременно, то за общие даты берется история тикера, торги которым начались позже.
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить, - должен содержать дату торгов. По умолчанию режим торгов, дата
+        торгов, тикер, цена закрытия и объем в штуках и стоимости. Если пустой или None, то загружаются все
+        столбцы.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+
+    :return:
+        Список словарей, которые напрямую конвертируется в pandas.DataFrame.
+    """
+    columns = tuple(columns or ())
+    if columns and TRADEDATE not in columns:
+        raise client.ISSMoexError(f"Отсутствует столбец {TRADEDATE} в запросе")
+
+    tickers = await get_security_lineage(session, security)
+    async with client.task_group() as group:
+        tasks = [
+            group.create_task(history.get_market_history(session, ticker, start, end, columns, market, engine))
+            for ticker in tickers
+        ]
+
+    return _stitch([task.result() for task in tasks])
+
+
+def _stitch(tables: list[client.Table]) -> client.Table:
+    """Объединяет истории тикеров - история каждого тикера берется до начала истории более нового тикера."""
+    parts: list[client.Table] = []
+    cutoff: str | None = None
+    for table in sorted((table for table in tables if table), key=_first_date, reverse=True):
+        parts.append([row for row in table if cutoff is None or str(row[TRADEDATE]) < cutoff])
+        cutoff = _first_date(table)
+
+    return [row for part in reversed(parts) for row in part]
+
+
+def _first_date(table: client.Table) -> str:
+    return min(str(row[TRADEDATE]) for row in table)
@@ -0,0 +1,127 @@
+"""Кэш в памяти для редко меняющихся справочных данных MOEX ISS."""
+
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from typing import Any, NamedTuple
+
+_Table = list[dict[str, Any]]
+_Key = tuple[Hashable, ...]
+
+
+class _Entry(NamedTuple):
+    table: _Table
+    size: int
+    expires: float
+
+
+class MemoryCache:
+    """Кэш результатов запросов, данные по которым выдаются за раз, с ограничением по сроку хранения и размеру.
+
+    Кэшируются справочные данные и перечни инструментов - результаты get_reference(), get_board_securities(),
+    get_board_dates(), get_index_tickers() и других функций, не требующих загрузки нескольких блоков. Срок
+    хранения может быть задан отдельно для каждой таблицы. При превышении допустимого количества записей или их
+    размера удаляются записи, к которым дольше всего не было обращений. Результаты выдаются в виде копий, поэтому
+    их изменение не влияет на содержимое кэша.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 600,
+        ttls: Mapping[str, float] | None = None,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 2**20,
+    ) -> None:
+        """Пустой кэш.
+
+        :param ttl:
+            Срок хранения записей в секундах по умолчанию.
+        :param ttls:
+            Сроки хранения записей в секундах для отдельных таблиц, например, {"dates": 3600}.
+        :param max_entries:
+            Максимальное количество записей.
+        :param max_bytes:
+            Максимальный приблизительный размер записей в байтах.
+        """
+        self._ttl = ttl
+        self._ttls = dict(ttls or {})
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+
+        self._entries: OrderedDict[_Key, _Entry] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __repr__(self) -> str:
+        """Наименование класса и статистика использования."""
+        class_name = self.__class__.__name__
+        return f"{class_name}(entries={len(self)}, bytes={self._size}, hits={self._hits}, misses={self._misses})"
+
+    def __len__(self) -> int:
+        """Количество записей."""
+        return len(self._entries)
+
+    @property
+    def hits(self) -> int:
+        """Количество запросов, данные для которых были в кэше."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Количество запросов, данных для которых не было в кэше."""
+        return self._misses
+
+    def get(self, url: str, query: Mapping[str, str | int], table_name: str) -> _Table | None:
+        """Копия таблицы для запроса - None, если она отсутствует или срок ее хранения истек."""
+        key = _make_key(url, query, table_name)
+        entry = self._entries.get(key)
+        if entry is None or entry.expires < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return _copy(entry.table)
+
+    def set(self, url: str, query: Mapping[str, str | int], table_name: str, table: _Table) -> None:
+        """Сохраняет копию таблицы для запроса."""
+        key = _make_key(url, query, table_name)
+        if key in self._entries:
+            self._remove(key)
+
+        entry = _Entry(_copy(table), _table_size(table), time.monotonic() + self._ttls.get(table_name, self._ttl))
+        if entry.size > self._max_bytes:
+            return
+
+        self._entries[key] = entry
+        self._size += entry.size
+        while len(self._entries) > self._max_entries or self._size > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, table_name: str | None = None) -> None:
+        """Удаляет записи для указанной таблицы или все записи, если таблица не указана."""
+        for key in list(self._entries):
+            if table_name is None or key[-1] == table_name:
+                self._remove(key)
+
+    def _remove(self, key: _Key) -> None:
+        self._size -= self._entries.pop(key).size
+
+
+def _make_key(url: str, query: Mapping[str, str | int], table_name: str) -> _Key:
+    return url, *sorted(query.items()), table_name
+
+
+def _copy(table: _Table) -> _Table:
+    return [row.copy() for row in table]
+
+
+def _table_size(table: _Table) -> int:
+    """Приблизительный размер таблицы в памяти."""
+    return sys.getsizeof(table) + sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values()) for row in table
+    )
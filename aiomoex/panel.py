@@ -0,0 +1,146 @@
+"""Панель исторических данных по всем бумагам, входившим в индекс, без ошибки выжившего.
+
+Состав индекса за все время определяется с помощью get_index_tickers(), а история каждой бумаги загружается только
+за периоды ее нахождения в индексе. Панель строится векторно с помощью NumPy и требует установки дополнительной
+зависимости aiomoex[numpy].
+"""
+
+import asyncio
+import dataclasses
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, Final
+
+import aiohttp
+
+from aiomoex import client, history, statistics
+from aiomoex.dates import DateRange, merge_ranges
+from aiomoex.history import TRADEDATE
+from aiomoex.request_helpers import DEFAULT_BOARD, DEFAULT_ENGINE, DEFAULT_MARKET
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Периоды нахождения бумаги в индексе с меньшим разрывом загружаются одним запросом - лишние дни разрыва
+# обходятся дешевле отдельного запроса и затем отбрасываются
+MAX_GAP: Final = timedelta(days=31)
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class IndexPanel:
+    """Значения столбца истории торгов по датам и бумагам, входившим в индекс.
+
+    Значения за даты, когда бумага не входила в индекс или по ней не было торгов, равны NaN. Панель напрямую
+    конвертируется в pandas.DataFrame(panel.values, index=panel.dates, columns=panel.tickers).
+    """
+
+    dates: "np.ndarray[Any, Any]"
+    tickers: tuple[str, ...]
+    values: "np.ndarray[Any, Any]"
+
+
+async def get_index_panel(
+    session: aiohttp.ClientSession,
+    index: str,
+    start: str | None = None,
+    end: str | None = None,
+    column: str = "CLOSE",
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    max_in_flight: int = 8,
+) -> IndexPanel:
+    """Получить значения столбца истории торгов для всех бумаг, входивших в индекс в интервале дат.
+
+    Пересекающиеся и близкие периоды нахождения бумаги в индексе объединяются, поэтому для каждой бумаги
+    выполняется минимальное количество запросов истории, которые загружаются параллельно. В панель попадают только
+    значения за даты нахождения бумаги в индексе.
+
+    :param session:
+        Сессия http соединения.
+    :param index:
+        Индекс, например, IMOEX.
+    :param start:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+    :param end:
+        Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+    :param column:
+        Столбец истории торгов - по умолчанию цена закрытия.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param max_in_flight:
+        Ограничение на количество одновременно загружаемых запросов истории.
+
+    :return:
+        Панель значений с датами в виде массива datetime64[D], тикерами в алфавитном порядке и двумерным массивом
+        значений float64.
+    """
+    memberships = _memberships(await statistics.get_index_tickers(session, index), start, end)
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def load(security: str, fetch: DateRange) -> client.Table:
+        async with semaphore:
+            return await history.get_board_history(
+                session,
+                security,
+                fetch[0].isoformat(),
+                fetch[1].isoformat(),
+                (TRADEDATE, column),
+                board,
+                market,
+                engine,
+            )
+
+    async with client.task_group() as group:
+        tasks = {
+            security: [group.create_task(load(security, fetch)) for fetch in _plan_fetches(ranges)]
+            for security, ranges in memberships.items()
+        }
+
+    data = {security: [row for task in fetches for row in task.result()] for security, fetches in tasks.items()}
+    return _build_panel(data, memberships, column)
+
+
+def _memberships(tickers: client.Table, start: str | None, end: str | None) -> dict[str, list[DateRange]]:
+    """Объединенные периоды нахождения бумаг в индексе, ограниченные интервалом дат."""
+    first = date.fromisoformat(start) if start else date.min
+    last = date.fromisoformat(end) if end else date.max
+
+    ranges: defaultdict[str, list[DateRange]] = defaultdict(list)
+    for row in tickers:
+        member_from = max(date.fromisoformat(str(row["from"])), first)
+        member_till = min(date.fromisoformat(str(row["till"])), last)
+        if member_from <= member_till:
+            ranges[str(row["ticker"])].append((member_from, member_till))
+
+    return {ticker: merge_ranges(ranges[ticker]) for ticker in sorted(ranges)}
+
+
+def _plan_fetches(ranges: list[DateRange]) -> list[DateRange]:
+    """Интервалы дат запросов истории, покрывающие периоды нахождения в индексе с разрывами не более MAX_GAP."""
+    return merge_ranges(ranges, MAX_GAP)
+
+
+def _build_panel(data: dict[str, client.Table], memberships: dict[str, list[DateRange]], column: str) -> IndexPanel:
+    """Выравнивает историю бумаг по общим датам, отбрасывая значения вне периодов нахождения в индексе."""
+    import numpy as np  # noqa: PLC0415
+
+    series: list[tuple[np.ndarray[Any, Any], np.ndarray[Any, Any]]] = []
+    for ticker, table in data.items():
+        dates = np.array([row[TRADEDATE] for row in table], dtype="datetime64[D]")
+        values = np.array([row[column] for row in table], dtype=np.float64)
+        member = np.zeros(len(dates), dtype=np.bool_)
+        for member_from, member_till in memberships[ticker]:
+            member |= (dates >= np.datetime64(member_from)) & (dates <= np.datetime64(member_till))
+        series.append((dates[member], values[member]))
+
+    all_dates = np.unique(np.concatenate([dates for dates, _ in series])) if series else np.array([], "datetime64[D]")
+    panel = np.full((len(all_dates), len(series)), np.nan)
+    for position, (dates, values) in enumerate(series):
+        panel[np.searchsorted(all_dates, dates), position] = values
+
+    return IndexPanel(all_dates, tuple(data), panel)
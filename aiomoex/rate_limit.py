@@ -0,0 +1,169 @@
+"""Ограничение частоты запросов к MOEX ISS и повторные попытки при временных ошибках."""
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Final
+
+import aiohttp
+
+# Статусы ответов, при которых запрос имеет смысл повторить
+TRANSIENT_STATUSES: Final = frozenset({429, 500, 502, 503, 504})
+# Статусы ответов, сигнализирующие о перегрузке сервера - частота запросов временно снижается
+_THROTTLE_STATUSES: Final = frozenset({429, 503})
+
+
+class RateLimiter:
+    """Ограничение частоты запросов по алгоритму token bucket с повторными попытками при временных ошибках.
+
+    Один экземпляр может использоваться всеми клиентами сессии http соединения - для этого его нужно передать
+    в configure_session(). При ответах сервера о перегрузке частота запросов уменьшается вдвое, а после
+    каждого успешного запроса постепенно восстанавливается до заданной.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10,
+        burst: int = 10,
+        retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        min_rate: float = 0.5,
+        max_retry_after: float = 300,
+    ) -> None:
+        """Ограничение частоты запросов и параметры повторных попыток.
+
+        :param rate:
+            Максимальное количество запросов в секунду.
+        :param burst:
+            Максимальное количество запросов, которые могут быть выполнены одновременно после простоя.
+        :param retries:
+            Количество повторных попыток при временных ошибках - статусах 429 и 5xx, ошибках соединения и
+            таймаутах.
+        :param backoff:
+            Базовая задержка в секундах перед повторной попыткой. Задержка удваивается с каждой попыткой,
+            а фактическое значение выбирается случайно от нуля до расчетного.
+        :param max_backoff:
+            Максимальная задержка в секундах перед повторной попыткой.
+        :param min_rate:
+            Минимальная частота запросов, до которой она может быть снижена при перегрузке сервера.
+        :param max_retry_after:
+            Максимальная задержка в секундах, указанная сервером в заголовке Retry-After, которую можно выдержать
+            перед повторной попыткой. Меньшие задержки из заголовка соблюдаются без ограничения max_backoff, а при
+            большей задержке повторная попытка не выполняется и ошибка передается дальше.
+        """
+        self._rate = rate
+        self._min_rate = min(min_rate, rate)
+        self._current_rate = rate
+        self._burst = burst
+        self._retries = retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._max_retry_after = max_retry_after
+
+        self._tokens = float(burst)
+        self._last_refill: float | None = None
+        self._lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        """Наименование класса и основные параметры."""
+        class_name = self.__class__.__name__
+        return f"{class_name}(rate={self._rate}, burst={self._burst}, retries={self._retries})"
+
+    @property
+    def current_rate(self) -> float:
+        """Текущее ограничение на количество запросов в секунду с учетом снижения при перегрузке сервера."""
+        return self._current_rate
+
+    async def acquire(self) -> None:
+        """Дожидается возможности выполнить очередной запрос."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._current_rate)
+                self._refill()
+            self._tokens -= 1
+
+    async def call[T](self, request: Callable[[], Awaitable[T]]) -> T:
+        """Выполняет запрос с соблюдением ограничения частоты и повторными попытками при временных ошибках.
+
+        :param request:
+            Функция без аргументов, возвращающая корутину запроса.
+
+        :return:
+            Результат успешного запроса.
+        """
+        attempt = 0
+        while True:
+            await self.acquire()
+            try:
+                result = await request()
+            except Exception as err:
+                if attempt >= self._retries or not _is_transient(err):
+                    raise
+                delay = self._on_failure(attempt, err)
+                if delay > max(self._max_backoff, self._max_retry_after):
+                    raise
+            else:
+                self._on_success()
+                return result
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _refill(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self._last_refill is not None:
+            self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self._current_rate)
+        self._last_refill = now
+
+    def _on_success(self) -> None:
+        self._current_rate = min(self._rate, self._current_rate + self._rate / 20)
+
+    def _on_failure(self, attempt: int, err: Exception) -> float:
+        """Снижает частоту запросов при перегрузке сервера и рассчитывает задержку до повторной попытки."""
+        response_error = _response_error(err)
+        if response_error is not None and response_error.status in _THROTTLE_STATUSES:
+            self._current_rate = max(self._min_rate, self._current_rate / 2)
+
+        delay = random.uniform(0, min(self._max_backoff, self._backoff * 2**attempt))  # noqa: S311
+        if response_error is not None and response_error.headers is not None:
+            retry_after = _parse_retry_after(response_error.headers.get("Retry-After"))
+            delay = max(delay, retry_after)
+
+        return delay
+
+
+def _response_error(err: BaseException) -> aiohttp.ClientResponseError | None:
+    """Ошибка статуса ответа, которая могла быть обернута в ISSMoexError."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err
+    if isinstance(err.__cause__, aiohttp.ClientResponseError):
+        return err.__cause__
+    return None
+
+
+def _is_transient(err: Exception) -> bool:
+    if (response_error := _response_error(err)) is not None:
+        return response_error.status in TRANSIENT_STATUSES
+    return isinstance(err, aiohttp.ClientConnectionError | aiohttp.ClientPayloadError | TimeoutError)
+
+
+def _parse_retry_after(retry_after: str | None) -> float:
+    """Задержка в секундах из заголовка Retry-After, заданного числом секунд или датой."""
+    if not retry_after:
+        return 0
+    try:
+        return max(0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return 0
+    if retry_at.tzinfo is None:
+        # Дата с зоной -0000 разбирается без часового пояса, но по RFC 5322 указана в UTC
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0, (retry_at - datetime.now(UTC)).total_seconds())
@@ -1,12 +1,14 @@
 """Вспомогательные функции для построения запросов."""
 
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
 from typing import Final
 
 import aiohttp
 
-from aiomoex import client
+from aiomoex import client, columnar, settings
 
+# Адрес MOEX ISS
+ISS_URL: Final = "https://iss.moex.com/iss"
 # Режимы по умолчанию для запросов
 DEFAULT_ENGINE: Final = "stock"
 DEFAULT_MARKET: Final = "shares"
@@ -32,7 +34,7 @@ def make_url(
     suffix: str | None = None,
 ) -> str:
     """Формирует URL для запроса."""
-    url_parts = ["https://iss.moex.com/iss"]
+    url_parts = [ISS_URL]
     if prefix:
         url_parts.append(f"/{prefix}")
     if engine:
@@ -99,7 +101,7 @@ def make_query(
     return query
 
 
-def get_table(table_dict: client.TablesDict, table_name: str) -> client.Table:
+def get_table[T](table_dict: Mapping[str, T], table_name: str) -> T:
     """Извлекает конкретную таблицу из данных."""
     try:
         table = table_dict[table_name]
@@ -116,6 +118,8 @@ async def get_short_data(
 ) -> client.Table:
     """Получить данные для запроса с выдачей всей информации за раз.
 
+    Если для сессии установлен кэш в памяти, то данные по возможности загружаются из него.
+
     :param session:
         Сессия http соединения.
     :param url:
@@ -128,9 +132,17 @@ async def get_short_data(
     :return:
         Конкретная таблица из запроса.
     """
+    memory_cache = settings.get_settings(session).memory_cache
+    if memory_cache is not None and (table := memory_cache.get(url, query or {}, table_name)) is not None:
+        return table
+
     iss = client.ISSClient(session, url, query)
     table_dict = await iss.get()
-    return get_table(table_dict, table_name)
+    table = get_table(table_dict, table_name)
+
+    if memory_cache is not None:
+        memory_cache.set(url, query or {}, table_name, table)
+    return table
 
 
 async def get_long_data(
@@ -138,6 +150,7 @@ async def get_long_data(
     url: str,
     table_name: str,
     query: client.WebQuery | None = None,
+    max_in_flight: int = 1,
 ) -> client.Table:
     """Получить данные для запроса, в котором информация выдается несколькими блоками.
 
@@ -149,10 +162,97 @@ async def get_long_data(
         Дополнительные параметры запроса - None, если нет параметров.
     :param table_name:
         Таблица, которую нужно выбрать.
+    :param max_in_flight:
+        Максимальное количество одновременно загружаемых блоков для ответов с курсором.
 
     :return:
         Конкретная таблица из запроса.
     """
     iss = client.ISSClient(session, url, query)
-    table_dict = await iss.get_all()
+    table_dict = await iss.get_all(max_in_flight)
     return get_table(table_dict, table_name)
+
+
+async def iter_long_data(
+    session: aiohttp.ClientSession,
+    url: str,
+    table_name: str,
+    query: client.WebQuery | None = None,
+) -> AsyncIterator[client.Table]:
+    """Получить данные для запроса, в котором информация выдается несколькими блоками, по мере их загрузки.
+
+    :param session:
+        Сессия http соединения.
+    :param url:
+        URL запроса.
+    :param query:
+        Дополнительные параметры запроса - None, если нет параметров.
+    :param table_name:
+        Таблица, которую нужно выбрать.
+
+    :return:
+        Асинхронный итератор непустых блоков конкретной таблицы из запроса.
+    """
+    async for table_dict in client.ISSClient(session, url, query):
+        if table := get_table(table_dict, table_name):
+            yield table
+
+
+async def get_long_columns(
+    session: aiohttp.ClientSession,
+    url: str,
+    table_name: str,
+    query: client.WebQuery | None = None,
+    max_in_flight: int = 1,
+) -> columnar.Columns:
+    """Получить данные в виде столбцов для запроса, в котором информация выдается несколькими блоками.
+
+    :param session:
+        Сессия http соединения.
+    :param url:
+        URL запроса.
+    :param query:
+        Дополнительные параметры запроса - None, если нет параметров.
+    :param table_name:
+        Таблица, которую нужно выбрать.
+    :param max_in_flight:
+        Максимальное количество одновременно загружаемых блоков для ответов с курсором.
+
+    :return:
+        Конкретная таблица из запроса в виде столбцов.
+    """
+    iss = client.ISSClient(session, url, query)
+    columns_dict = await iss.get_all_columns(max_in_flight)
+    return get_table(columns_dict, table_name)
+
+
+async def get_long_rows[R](
+    session: aiohttp.ClientSession,
+    url: str,
+    table_name: str,
+    to_rows: Callable[[client.CompactTable], list[R]],
+    query: client.WebQuery | None = None,
+    max_in_flight: int = 1,
+) -> list[R]:
+    """Получить данные в виде типизированных строк для запроса, в котором информация выдается несколькими блоками.
+
+    :param session:
+        Сессия http соединения.
+    :param url:
+        URL запроса.
+    :param table_name:
+        Таблица, которую нужно выбрать.
+    :param to_rows:
+        Функция преобразования таблицы в компактном формате в список строк - применяется к каждому блоку данных.
+    :param query:
+        Дополнительные параметры запроса - None, если нет параметров.
+    :param max_in_flight:
+        Максимальное количество одновременно загружаемых блоков для ответов с курсором.
+
+    :return:
+        Конкретная таблица из запроса в виде списка строк.
+    """
+    all_rows: list[R] = []
+    async for block in client.ISSClient(session, url, query).iter_compact(max_in_flight):
+        all_rows.extend(to_rows(get_table(block, table_name)))
+    return all_rows
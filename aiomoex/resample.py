@@ -0,0 +1,93 @@
+"""Построение свечек произвольного размера из ранее загруженных минутных свечек.
+
+Вместо загрузки свечек каждого размера с MOEX ISS достаточно один раз загрузить минутные свечи и построить из них
+остальные. Агрегация выполняется векторно с помощью NumPy и требует установки дополнительной зависимости
+aiomoex[numpy].
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Final
+
+from aiomoex import client
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MINUTES_IN_DAY: Final = 24 * 60
+# Время начала утренней, основной и вечерней сессий на фондовом рынке MOEX
+DEFAULT_SESSIONS: Final = ("06:50", "10:00", "19:00")
+
+
+def resample_candles(
+    data: client.Table,
+    minutes: int,
+    sessions: Sequence[str] = DEFAULT_SESSIONS,
+) -> client.Table:
+    """Строит свечи указанного размера из минутных свечек, упорядоченных по времени начала.
+
+    Свечи внутри дня выравниваются по началу торговых сессий и не объединяют данные разных сессий и дней: например,
+    часовые свечи основной сессии начинаются в 10:00, 11:00 и т.д., а последняя свеча сессии может быть короче
+    остальных. Дневные свечи объединяют все сессии одного дня. Время начала свечи соответствует началу ее
+    интервала, а время окончания - окончанию последней вошедшей в нее минутной свечи.
+
+    :param data:
+        Минутные свечи в формате HLOCV - результат get_board_candles() или get_market_candles() с interval=1.
+    :param minutes:
+        Размер свечки в минутах - от 1 до 1440 (1 день).
+    :param sessions:
+        Время начала торговых сессий вида ЧЧ:ММ в порядке возрастания - по умолчанию сессии фондового рынка.
+
+    :return:
+        Список словарей со свечами указанного размера, которые напрямую конвертируется в pandas.DataFrame.
+    """
+    import numpy as np  # noqa: PLC0415
+
+    if not 0 < minutes <= MINUTES_IN_DAY:
+        raise ValueError(f"Размер свечки должен быть от 1 до {MINUTES_IN_DAY} минут: {minutes}")
+    if not data:
+        return []
+
+    begin = np.array([row["begin"] for row in data], dtype="datetime64[m]")
+    bar_begin = _bar_begin(begin, minutes, sessions)
+    starts = np.flatnonzero(np.concatenate(([True], bar_begin[1:] != bar_begin[:-1])))
+    ends = np.append(starts[1:], len(data)) - 1
+
+    values = {column: _column(data, column) for column in ("open", "close", "high", "low", "value", "volume")}
+    bars: dict[str, list[Any]] = {
+        "open": values["open"][starts].tolist(),
+        "close": values["close"][ends].tolist(),
+        "high": np.maximum.reduceat(values["high"], starts).tolist(),
+        "low": np.minimum.reduceat(values["low"], starts).tolist(),
+        "value": np.add.reduceat(values["value"], starts).tolist(),
+        "volume": np.add.reduceat(values["volume"], starts).tolist(),
+        "begin": np.char.replace(np.datetime_as_string(bar_begin[starts], unit="s"), "T", " ").tolist(),
+        "end": [data[end]["end"] for end in ends.tolist()],
+    }
+    return [dict(zip(bars, row, strict=True)) for row in zip(*bars.values(), strict=True)]
+
+
+def _bar_begin(begin: "np.ndarray[Any, Any]", minutes: int, sessions: Sequence[str]) -> "np.ndarray[Any, Any]":
+    """Время начала свечки указанного размера, в которую попадает каждая минутная свеча."""
+    import numpy as np  # noqa: PLC0415
+
+    day = begin.astype("datetime64[D]")
+    if minutes == MINUTES_IN_DAY:
+        return day.astype("datetime64[m]")
+
+    minute = (begin - day).astype(np.int64)
+    anchors = np.array([0, *(_minute_of_day(session) for session in sessions)], dtype=np.int64)
+    anchor = anchors[np.searchsorted(anchors, minute, side="right") - 1]
+    bar_minute = anchor + (minute - anchor) // minutes * minutes
+
+    return day.astype("datetime64[m]") + bar_minute.astype("timedelta64[m]")
+
+
+def _minute_of_day(time: str) -> int:
+    hours, minutes = time.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _column(data: client.Table, column: str) -> "np.ndarray[Any, Any]":
+    import numpy as np  # noqa: PLC0415
+
+    return np.array([row[column] for row in data], dtype=np.float64)
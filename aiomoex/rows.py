@@ -0,0 +1,71 @@
+"""Типизированные строки свечей и истории торгов.
+
+Строки создаются напрямую из компактного формата ответов MOEX ISS при загрузке каждого блока данных. Даты
+преобразуются в date и datetime один раз, а строки занимают в несколько раз меньше памяти, чем словари.
+"""
+
+import dataclasses
+from datetime import date, datetime
+from typing import Any, Final, cast
+
+from aiomoex import client
+
+# Столбцы MOEX ISS в порядке полей типизированных строк
+CANDLE_COLUMNS: Final = ("open", "close", "high", "low", "value", "volume", "begin", "end")
+HISTORY_COLUMNS: Final = ("BOARDID", "TRADEDATE", "CLOSE", "VOLUME", "VALUE")
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class Candle:
+    """Свеча в формате HLOCV - время начала и окончания указывается по Москве без часового пояса."""
+
+    open: float
+    close: float
+    high: float
+    low: float
+    value: float
+    volume: float
+    begin: datetime
+    end: datetime
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class HistoryRow:
+    """Итоги торгов бумагой в режиме торгов за день.
+
+    Цена закрытия отсутствует, если сделок по бумаге не было.
+    """
+
+    board: str
+    trade_date: date
+    close: float | None
+    volume: float
+    value: float
+
+
+def to_candles(table: client.CompactTable) -> list[Candle]:
+    """Преобразует таблицу свечей в компактном формате в список типизированных строк."""
+    return [
+        Candle(open_, close, high, low, value, volume, datetime.fromisoformat(begin), datetime.fromisoformat(end))
+        for open_, close, high, low, value, volume, begin, end in _select(table, CANDLE_COLUMNS)
+    ]
+
+
+def to_history(table: client.CompactTable) -> list[HistoryRow]:
+    """Преобразует таблицу истории торгов в компактном формате в список типизированных строк."""
+    return [
+        HistoryRow(board, date.fromisoformat(trade_date), close, volume, value)
+        for board, trade_date, close, volume, value in _select(table, HISTORY_COLUMNS)
+    ]
+
+
+def _select(table: client.CompactTable, columns: tuple[str, ...]) -> list[tuple[Any, ...]]:
+    """Значения указанных столбцов для каждой строки таблицы."""
+    try:
+        positions = [table["columns"].index(column) for column in columns]
+    except ValueError as err:
+        raise client.ISSMoexError(f"Отсутствуют необходимые столбцы {columns} в данных") from err
+
+    if positions == list(range(len(table["columns"]))):
+        return cast("list[tuple[Any, ...]]", table["data"])
+    return [tuple(row[position] for position in positions) for row in table["data"]]
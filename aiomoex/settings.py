@@ -0,0 +1,162 @@
+"""Настройки клиента, общие для всех запросов в рамках одной сессии http соединения."""
+
+import dataclasses
+import weakref
+from typing import Final
+
+import aiohttp
+
+from aiomoex import decoders, instrumentation
+from aiomoex.disk_cache import DiskCache
+from aiomoex.memory_cache import MemoryCache
+from aiomoex.rate_limit import RateLimiter
+from aiomoex.single_flight import SingleFlight
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class SessionSettings:
+    """Настройки клиента для сессии http соединения."""
+
+    limiter: RateLimiter | None = None
+    disk_cache: DiskCache | None = None
+    single_flight: SingleFlight | None = None
+    memory_cache: MemoryCache | None = None
+    observer: instrumentation.Observer | None = None
+    decoder: decoders.Decoder | None = None
+
+
+# Параметры соединений с MOEX ISS по умолчанию
+DEFAULT_LIMIT: Final = 100
+DEFAULT_LIMIT_PER_HOST: Final = 20
+DEFAULT_DNS_TTL: Final = 300
+DEFAULT_KEEPALIVE: Final = 30
+DEFAULT_TIMEOUT: Final = 60
+DEFAULT_CONNECT_TIMEOUT: Final = 10
+
+_DEFAULT_SETTINGS = SessionSettings()
+_SETTINGS: weakref.WeakKeyDictionary[aiohttp.ClientSession, SessionSettings] = weakref.WeakKeyDictionary()
+
+
+def configure_session(
+    session: aiohttp.ClientSession,
+    *,
+    limiter: RateLimiter | None = None,
+    disk_cache: DiskCache | None = None,
+    single_flight: SingleFlight | None = None,
+    memory_cache: MemoryCache | None = None,
+    observer: instrumentation.Observer | None = None,
+    decoder: decoders.Decoder | None = None,
+) -> None:
+    """Устанавливает настройки, которые будут использоваться всеми запросами в рамках сессии.
+
+    Повторный вызов полностью заменяет ранее установленные для сессии настройки.
+
+    :param session:
+        Сессия http соединения.
+    :param limiter:
+        Ограничение частоты запросов и повторные попытки при временных ошибках - None, если запросы нужно
+        выполнять без ограничений.
+    :param disk_cache:
+        Постоянный кэш блоков данных на диске - None, если данные всегда нужно загружать с MOEX ISS.
+    :param single_flight:
+        Объединение одинаковых одновременных запросов - None, если каждый запрос нужно отправлять на сервер.
+    :param memory_cache:
+        Кэш в памяти для справочных данных - None, если данные всегда нужно загружать с MOEX ISS.
+    :param observer:
+        Наблюдатель, получающий статистику загрузки блоков данных, - None, если статистика не нужна.
+    :param decoder:
+        Функция декодирования json ответов из байтов, например, aiomoex.decoders.msgspec_decoder(), - None,
+        если нужно использовать самый быстрый из установленных декодеров.
+    """
+    _SETTINGS[session] = SessionSettings(
+        limiter=limiter,
+        disk_cache=disk_cache,
+        single_flight=single_flight,
+        memory_cache=memory_cache,
+        observer=observer,
+        decoder=decoder,
+    )
+
+
+def get_settings(session: aiohttp.ClientSession) -> SessionSettings:
+    """Настройки сессии http соединения - настройки по умолчанию, если они не устанавливались."""
+    return _SETTINGS.get(session, _DEFAULT_SETTINGS)
+
+
+def create_session(
+    *,
+    limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+    limit: int = DEFAULT_LIMIT,
+    dns_ttl: int = DEFAULT_DNS_TTL,
+    keepalive: float = DEFAULT_KEEPALIVE,
+    timeout: float = DEFAULT_TIMEOUT,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    limiter: RateLimiter | None = None,
+    disk_cache: DiskCache | None = None,
+    single_flight: SingleFlight | None = None,
+    memory_cache: MemoryCache | None = None,
+    observer: instrumentation.Observer | None = None,
+    decoder: decoders.Decoder | None = None,
+) -> aiohttp.ClientSession:
+    """Создает сессию http соединения с настройками, подходящими для работы с MOEX ISS.
+
+    Сессия переиспользует соединения, кэширует результаты DNS запросов и ограничивает количество одновременно
+    открытых соединений. Сжатие ответов gzip и deflate поддерживается всегда, а brotli - при установке
+    дополнительной зависимости aiomoex[speedups]. Для наблюдателя дополнительно измеряется время установки
+    соединений. Сессия должна создаваться внутри работающего цикла событий и может использоваться как
+    асинхронный контекстный менеджер::
+
+        async with aiomoex.create_session() as session:
+            data = await aiomoex.get_board_history(session, 'SNGSP')
+
+    :param limit_per_host:
+        Максимальное количество одновременных соединений с одним сервером.
+    :param limit:
+        Максимальное общее количество одновременных соединений.
+    :param dns_ttl:
+        Время хранения результатов DNS запросов в секундах.
+    :param keepalive:
+        Время хранения неиспользуемых соединений в секундах.
+    :param timeout:
+        Максимальное время выполнения одного запроса в секундах.
+    :param connect_timeout:
+        Максимальное время установки соединения в секундах.
+    :param limiter:
+        Ограничение частоты запросов и повторные попытки при временных ошибках - None, если запросы нужно
+        выполнять без ограничений.
+    :param disk_cache:
+        Постоянный кэш блоков данных на диске - None, если данные всегда нужно загружать с MOEX ISS.
+    :param single_flight:
+        Объединение одинаковых одновременных запросов - None, если каждый запрос нужно отправлять на сервер.
+    :param memory_cache:
+        Кэш в памяти для справочных данных - None, если данные всегда нужно загружать с MOEX ISS.
+    :param observer:
+        Наблюдатель, получающий статистику загрузки блоков данных, - None, если статистика не нужна.
+    :param decoder:
+        Функция декодирования json ответов из байтов, например, aiomoex.decoders.msgspec_decoder(), - None,
+        если нужно использовать самый быстрый из установленных декодеров.
+
+    :return:
+        Сессия http соединения с установленными настройками клиента.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=dns_ttl,
+        keepalive_timeout=keepalive,
+    )
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout),
+        trace_configs=[instrumentation.trace_config()],
+    )
+    configure_session(
+        session,
+        limiter=limiter,
+        disk_cache=disk_cache,
+        single_flight=single_flight,
+        memory_cache=memory_cache,
+        observer=observer,
+        decoder=decoder,
+    )
+    return session
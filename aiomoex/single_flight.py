@@ -0,0 +1,45 @@
+"""Объединение одинаковых одновременных запросов к MOEX ISS."""
+
+import asyncio
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """Объединение одинаковых одновременных запросов.
+
+    Пока запрос выполняется, все одинаковые запросы не отправляются на сервер, а дожидаются и получают
+    результат первого. Отмена ожидания одним из запросов не прерывает загрузку для остальных.
+    """
+
+    def __init__(self) -> None:
+        """Объединение запросов без запросов в процессе выполнения."""
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    def __repr__(self) -> str:
+        """Наименование класса и количество выполняющихся запросов."""
+        class_name = self.__class__.__name__
+        return f"{class_name}(in_flight={len(self._in_flight)})"
+
+    async def call[T](self, key: Hashable, request: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Выполняет запрос или дожидается результата уже выполняющегося запроса с тем же ключом.
+
+        :param key:
+            Ключ, одинаковый для одинаковых запросов.
+        :param request:
+            Функция без аргументов, возвращающая корутину запроса.
+
+        :return:
+            Результат запроса, общий для всех одновременных запросов с тем же ключом.
+        """
+        task: asyncio.Task[T] | None = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(request())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
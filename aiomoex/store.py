@@ -0,0 +1,284 @@
+"""Локальное хранилище ранее загруженных свечек и истории торгов с запросами по интервалам дат."""
+
+import asyncio
+import sqlite3
+import threading
+from collections.abc import Callable, Coroutine, Sequence
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Final
+
+import aiohttp
+
+from aiomoex import candles, client, dates, history
+from aiomoex.dates import DateRange
+from aiomoex.request_helpers import DEFAULT_BOARD, DEFAULT_ENGINE, DEFAULT_MARKET
+from aiomoex.rows import CANDLE_COLUMNS, HISTORY_COLUMNS
+
+# Столбцы значений объявлены без типа, чтобы целые и дробные числа хранились без преобразования
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS candles (
+    security TEXT NOT NULL,
+    board TEXT NOT NULL,
+    interval INTEGER NOT NULL,
+    "begin" TEXT NOT NULL,
+    open,
+    close,
+    high,
+    low,
+    value,
+    volume,
+    "end" TEXT,
+    PRIMARY KEY (security, board, interval, "begin")
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    security TEXT NOT NULL,
+    board TEXT NOT NULL,
+    tradedate TEXT NOT NULL,
+    close,
+    volume,
+    value,
+    PRIMARY KEY (security, board, tradedate)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    dataset TEXT NOT NULL,
+    start TEXT NOT NULL,
+    "end" TEXT NOT NULL,
+    PRIMARY KEY (dataset, start)
+) WITHOUT ROWID;
+"""
+_INSERT_CANDLES: Final = """
+INSERT OR REPLACE INTO candles (security, board, interval, open, close, high, low, value, volume, "begin", "end")
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_HISTORY: Final = """
+INSERT OR REPLACE INTO history (security, board, tradedate, close, volume, value) VALUES (?, ?, ?, ?, ?, ?)
+"""
+_Loader = Callable[[str | None, str], Coroutine[Any, Any, None]]
+
+
+class LocalStore:
+    """Хранилище свечек и истории торгов в базе SQLite, индексированное по бумаге, режиму торгов и времени.
+
+    Запросы выполняются с той же семантикой интервала дат, что и get_board_candles() и get_board_history().
+    С MOEX ISS загружаются только отсутствующие в хранилище части интервала, а запросы по ранее загруженным
+    интервалам выполняются без обращения к серверу. Данные за текущую дату могут быть неполными, поэтому они
+    загружаются повторно при каждом запросе.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Хранилище в указанном файле - файл создается при отсутствии.
+
+        :param path:
+            Путь к файлу базы SQLite.
+        """
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+        self._conn.executescript(_SCHEMA)
+
+    def __repr__(self) -> str:
+        """Наименование класса и путь к файлу хранилища."""
+        class_name = self.__class__.__name__
+        return f"{class_name}(path={self._path})"
+
+    async def get_board_candles(
+        self,
+        session: aiohttp.ClientSession,
+        security: str,
+        interval: int = 24,
+        start: str | None = None,
+        end: str | None = None,
+        board: str = DEFAULT_BOARD,
+        market: str = DEFAULT_MARKET,
+        engine: str = DEFAULT_ENGINE,
+    ) -> client.Table:
+        """Получить свечи в формате HLOCV указанного инструмента в указанном режиме торгов за интервал дат.
+
+        Аналог candles.get_board_candles(), загружающий с MOEX ISS только отсутствующие в хранилище данные.
+
+        :param session:
+            Сессия http соединения.
+        :param security:
+            Тикер ценной бумаги.
+        :param interval:
+            Размер свечки - целое число 1 (1 минута), 10 (10 минут), 60 (1 час), 24 (1 день), 7 (1 неделя),
+            31 (1 месяц) или 4 (1 квартал). По умолчанию дневные данные.
+        :param start:
+            Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+        :param end:
+            Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+        :param board:
+            Режим торгов - по умолчанию основной режим торгов T+2.
+        :param market:
+            Рынок - по умолчанию акции.
+        :param engine:
+            Движок - по умолчанию акции.
+
+        :return:
+            Список словарей, которые напрямую конвертируется в pandas.DataFrame.
+        """
+        dataset = f"candles/{security}/{board}/{interval}"
+        requested = _requested_range(start, end)
+
+        async def load(gap_start: str | None, gap_end: str) -> None:
+            data = await candles.get_board_candles(
+                session,
+                security,
+                interval,
+                gap_start,
+                gap_end,
+                board,
+                market,
+                engine,
+            )
+            rows = [(security, board, interval, *(row[column] for column in CANDLE_COLUMNS)) for row in data]
+            await asyncio.to_thread(self._insert, _INSERT_CANDLES, rows)
+
+        await self._fill_gaps(dataset, requested, load)
+        rows = await asyncio.to_thread(
+            self._select,
+            """
+            SELECT open, close, high, low, value, volume, "begin", "end" FROM candles
+            WHERE security = ? AND board = ? AND interval = ? AND "begin" >= ? AND "begin" < ?
+            ORDER BY "begin"
+            """,
+            (security, board, interval, requested[0].isoformat(), (requested[1] + timedelta(days=1)).isoformat()),
+        )
+        return [dict(zip(CANDLE_COLUMNS, row, strict=True)) for row in rows]
+
+    async def get_board_history(
+        self,
+        session: aiohttp.ClientSession,
+        security: str,
+        start: str | None = None,
+        end: str | None = None,
+        board: str = DEFAULT_BOARD,
+        market: str = DEFAULT_MARKET,
+        engine: str = DEFAULT_ENGINE,
+    ) -> client.Table:
+        """Получить историю торгов для указанной бумаги в указанном режиме торгов за указанный интервал дат.
+
+        Аналог history.get_board_history() со столбцами по умолчанию, загружающий с MOEX ISS только отсутствующие
+        в хранилище данные.
+
+        :param session:
+            Сессия http соединения.
+        :param security:
+            Тикер ценной бумаги.
+        :param start:
+            Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены с начала истории.
+        :param end:
+            Дата вида ГГГГ-ММ-ДД. При отсутствии данные будут загружены до конца истории.
+        :param board:
+            Режим торгов - по умолчанию основной режим торгов T+2.
+        :param market:
+            Рынок - по умолчанию акции.
+        :param engine:
+            Движок - по умолчанию акции.
+
+        :return:
+            Список словарей, которые напрямую конвертируется в pandas.DataFrame.
+        """
+        dataset = f"history/{security}/{board}"
+        requested = _requested_range(start, end)
+
+        async def load(gap_start: str | None, gap_end: str) -> None:
+            data = await history.get_board_history(
+                session,
+                security,
+                gap_start,
+                gap_end,
+                HISTORY_COLUMNS,
+                board,
+                market,
+                engine,
+            )
+            rows = [(security, board, row["TRADEDATE"], row["CLOSE"], row["VOLUME"], row["VALUE"]) for row in data]
+            await asyncio.to_thread(self._insert, _INSERT_HISTORY, rows)
+
+        await self._fill_gaps(dataset, requested, load)
+        rows = await asyncio.to_thread(
+            self._select,
+            """
+            SELECT board, tradedate, close, volume, value FROM history
+            WHERE security = ? AND board = ? AND tradedate >= ? AND tradedate <= ?
+            ORDER BY tradedate
+            """,
+            (security, board, requested[0].isoformat(), requested[1].isoformat()),
+        )
+        return [dict(zip(HISTORY_COLUMNS, row, strict=True)) for row in rows]
+
+    def close(self) -> None:
+        """Закрывает файл хранилища."""
+        with self._lock:
+            self._conn.close()
+
+    async def _fill_gaps(self, dataset: str, requested: DateRange, load: _Loader) -> None:
+        """Загружает отсутствующие части интервала и отмечает их как загруженные, кроме текущей даты.
+
+        Загруженные интервалы объединяются с отмеченными на момент записи, поэтому параллельные запросы к одному
+        набору данных не затирают отметки друг друга.
+        """
+        covered = await asyncio.to_thread(self._coverage, dataset)
+        gaps = _missing_ranges(requested, covered)
+        if not gaps:
+            return
+
+        async with client.task_group() as group:
+            for gap_start, gap_end in gaps:
+                group.create_task(load(None if gap_start == date.min else gap_start.isoformat(), gap_end.isoformat()))
+
+        last_complete = dates.today() - timedelta(days=1)
+        new = [(gap_start, min(gap_end, last_complete)) for gap_start, gap_end in gaps if gap_start <= last_complete]
+        await asyncio.to_thread(self._add_coverage, dataset, new)
+
+    def _insert(self, sql: str, rows: Sequence[Sequence[object]]) -> None:
+        with self._lock:
+            self._conn.executemany(sql, rows)
+
+    def _select(self, sql: str, params: Sequence[object]) -> list[tuple[client.Values, ...]]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _coverage(self, dataset: str) -> list[DateRange]:
+        with self._lock:
+            return self._read_coverage(dataset)
+
+    def _add_coverage(self, dataset: str, ranges: list[DateRange]) -> None:
+        with self._lock:
+            merged = dates.merge_ranges([*self._read_coverage(dataset), *ranges])
+            self._conn.execute("DELETE FROM coverage WHERE dataset = ?", (dataset,))
+            self._conn.executemany(
+                "INSERT INTO coverage VALUES (?, ?, ?)",
+                [(dataset, start.isoformat(), end.isoformat()) for start, end in merged],
+            )
+
+    def _read_coverage(self, dataset: str) -> list[DateRange]:
+        rows = self._conn.execute(
+            'SELECT start, "end" FROM coverage WHERE dataset = ? ORDER BY start',
+            (dataset,),
+        ).fetchall()
+        return [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in rows]
+
+
+def _requested_range(start: str | None, end: str | None) -> DateRange:
+    """Интервал дат запроса - без указания конца не позже текущей даты."""
+    first = date.fromisoformat(start) if start else date.min
+    last = min(date.fromisoformat(end), dates.today()) if end else dates.today()
+    return first, last
+
+
+def _missing_ranges(requested: DateRange, covered: list[DateRange]) -> list[DateRange]:
+    """Части запрошенного интервала дат, не покрытые загруженными интервалами."""
+    first, last = requested
+    missing: list[DateRange] = []
+    for start, end in dates.merge_ranges(covered):
+        if end < first or start > last:
+            continue
+        if start > first:
+            missing.append((first, start - timedelta(days=1)))
+        first = max(first, end + timedelta(days=1))
+    if first <= last:
+        missing.append((first, last))
+    return missing
@@ -0,0 +1,142 @@
+"""Функции для дополнения ранее загруженных данных новыми значениями.
+
+Загружаются только данные, начиная с последней даты уже имеющихся данных. Данные за последнюю дату
+загружаются повторно, так как на момент предыдущей загрузки торги в этот день могли быть не завершены.
+"""
+
+from collections.abc import Iterable, Sequence
+
+import aiohttp
+
+from aiomoex import candles, client, history
+from aiomoex.candles import BEGIN
+from aiomoex.history import TRADEDATE
+from aiomoex.request_helpers import DEFAULT_BOARD, DEFAULT_ENGINE, DEFAULT_MARKET
+
+
+async def update_board_history(
+    session: aiohttp.ClientSession,
+    security: str,
+    data: client.Table,
+    columns: Iterable[str] | None = ("BOARDID", "TRADEDATE", "CLOSE", "VOLUME", "VALUE"),
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+) -> client.Table:
+    """Дополнить историю торгов для указанной бумаги в указанном режиме торгов новыми данными.
+
+    Интервал доступных дат проверяется с помощью get_board_dates(), и при отсутствии новых данных история
+    по бумаге не запрашивается.
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param data:
+        Ранее загруженная история, упорядоченная по дате торгов, - пустой список, если загрузка производится
+        впервые.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить - должен совпадать с использованным при загрузке ранее
+        загруженной истории и содержать дату торгов. Если пустой или None, то загружаются все столбцы.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+
+    :return:
+        Новый список словарей с ранее загруженными и новыми данными без повторов.
+    """
+    if not data:
+        return await history.get_board_history(session, security, None, None, columns, board, market, engine)
+
+    last = _last_value(data, TRADEDATE)
+    dates = await history.get_board_dates(session, board, market, engine)
+    if not dates or last >= str(dates[0]["till"]):
+        return list(data)
+
+    new_data = await history.get_board_history(session, security, last, None, columns, board, market, engine)
+    return merge_tables(data, new_data, (TRADEDATE,))
+
+
+async def update_board_candles(
+    session: aiohttp.ClientSession,
+    security: str,
+    data: client.Table,
+    interval: int = 24,
+    board: str = DEFAULT_BOARD,
+    market: str = DEFAULT_MARKET,
+    engine: str = DEFAULT_ENGINE,
+    columns: Iterable[str] | None = None,
+) -> client.Table:
+    """Дополнить свечи указанного инструмента в указанном режиме торгов новыми данными.
+
+    Интервал доступных дат проверяется с помощью get_board_candle_borders(), и при отсутствии новых данных
+    свечи не запрашиваются.
+
+    :param session:
+        Сессия http соединения.
+    :param security:
+        Тикер ценной бумаги.
+    :param data:
+        Ранее загруженные свечи, упорядоченные по времени начала, - пустой список, если загрузка производится
+        впервые.
+    :param interval:
+        Размер свечки - целое число 1 (1 минута), 10 (10 минут), 60 (1 час), 24 (1 день), 7 (1 неделя),
+        31 (1 месяц) или 4 (1 квартал). По умолчанию дневные данные.
+    :param board:
+        Режим торгов - по умолчанию основной режим торгов T+2.
+    :param market:
+        Рынок - по умолчанию акции.
+    :param engine:
+        Движок - по умолчанию акции.
+    :param columns:
+        Кортеж столбцов, которые нужно загрузить - должен совпадать с использованным при загрузке ранее
+        загруженных свечей и содержать время начала свечи. Если пустой или None, то загружаются все столбцы.
+
+    :return:
+        Новый список словарей с ранее загруженными и новыми данными без повторов.
+    :raises ISSMoexError:
+        Для инструмента в режиме торгов нет свечей указанного размера.
+    """
+    if not data:
+        return await candles.get_board_candles(session, security, interval, None, None, board, market, engine, columns)
+
+    last = _last_value(data, BEGIN)
+    borders = await candles.get_board_candle_borders(session, security, board, market, engine, ("end", "interval"))
+    end = next((str(row["end"]) for row in borders if row["interval"] == interval), None)
+    if end is None:
+        raise client.ISSMoexError(f"Нет свечей размера {interval} для {security} в режиме торгов {board}")
+    if last >= end:
+        return list(data)
+
+    start = last[:10]
+    new_data = await candles.get_board_candles(session, security, interval, start, None, board, market, engine, columns)
+    return merge_tables(data, new_data, (BEGIN,))
+
+
+def merge_tables(data: client.Table, new_data: client.Table, key: Sequence[str]) -> client.Table:
+    """Объединяет ранее загруженные данные с новыми, которые заменяют старые строки с совпадающим ключом.
+
+    :param data:
+        Ранее загруженные данные.
+    :param new_data:
+        Новые данные, все строки которых расположены не раньше строк ранее загруженных данных.
+    :param key:
+        Столбцы, однозначно определяющие строку.
+
+    :return:
+        Новый список словарей с ранее загруженными и новыми данными без повторов.
+    """
+    new_keys = {tuple(row[column] for column in key) for row in new_data}
+    merged = [row for row in data if tuple(row[column] for column in key) not in new_keys]
+    merged.extend(new_data)
+    return merged
+
+
+def _last_value(data: client.Table, column: str) -> str:
+    try:
+        return str(data[-1][column])
+    except KeyError as err:
+        raise client.ISSMoexError(f"Отсутствует столбец {column} в данных") from err
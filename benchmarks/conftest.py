@@ -0,0 +1,50 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import aiohttp
+import pytest
+
+import aiomoex
+from aiomoex import request_helpers
+from benchmarks import fake_iss
+
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup("fake_iss", "Локальный заменитель MOEX ISS")
+    group.addoption("--iss-latency", type=float, default=0.005, help="Задержка ответа в секундах")
+    group.addoption("--iss-page-size", type=int, default=100, help="Количество строк в блоке данных")
+    group.addoption("--iss-rows", type=int, default=2500, help="Количество торговых дней для каждой бумаги")
+
+
+@pytest.fixture(name="fake_server", scope="session")
+def start_fake_server(request):
+    server = fake_iss.FakeISS(
+        latency=request.config.getoption("--iss-latency"),
+        page_size=request.config.getoption("--iss-page-size"),
+        rows=request.config.getoption("--iss-rows"),
+    )
+    with server, pytest.MonkeyPatch.context() as patch:
+        patch.setattr(request_helpers, "ISS_URL", server.url)
+        yield server
+
+
+type Scenario = Callable[[aiohttp.ClientSession], Coroutine[Any, Any, object]]
+
+
+@pytest.fixture(name="run_scenario")
+def create_runner(fake_server, benchmark):
+    """Замеряет асинхронный сценарий, выполняемый с одной сессией http соединения во всех повторах."""
+    _ = fake_server
+    with asyncio.Runner() as runner:
+        session = runner.run(_make_session())
+
+        def run(scenario: Scenario) -> object:
+            return benchmark(lambda: runner.run(scenario(session)))
+
+        yield run
+        runner.run(session.close())
+
+
+async def _make_session() -> aiohttp.ClientSession:
+    return aiomoex.create_session()
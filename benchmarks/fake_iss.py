@@ -0,0 +1,196 @@
+"""Локальный заменитель MOEX ISS для воспроизводимых замеров производительности.
+
+Сервер выдает синтетические данные в компактном формате json с постраничной выдачей, аналогичной MOEX ISS:
+история торгов содержит курсор history.cursor, свечи выдаются без курсора до пустого блока, а перечень бумаг
+режима торгов - одним блоком. Задержка ответа и размер блока настраиваются.
+"""
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from datetime import date, timedelta
+from typing import Any, Final, Self
+
+from aiohttp import web
+
+_FIRST_DATE: Final = date(2010, 1, 4)
+# Режимы торгов, в которых торгуется каждая бумага
+SECURITY_BOARDS: Final = ("TQBR", "SMAL", "SPEQ")
+
+_HISTORY_COLUMNS: Final = ("BOARDID", "TRADEDATE", "SECID", "OPEN", "LOW", "HIGH", "CLOSE", "VOLUME", "VALUE")
+CANDLES_COLUMNS: Final = ("open", "close", "high", "low", "value", "volume", "begin", "end")
+_BORDERS_COLUMNS: Final = ("begin", "end", "interval", "board_group_id")
+_BOARDS_COLUMNS: Final = ("secid", "boardid", "market", "engine", "is_traded", "history_from", "history_till")
+_SECURITIES_COLUMNS: Final = ("SECID", "BOARDID", "SHORTNAME", "LOTSIZE")
+_TICKERS_COLUMNS: Final = ("ticker", "from", "till", "tradingsession")
+
+
+class FakeISS:
+    """Сервер с синтетическими данными MOEX ISS, работающий в отдельном потоке с собственным циклом событий."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0,
+        page_size: int = 100,
+        rows: int = 2500,
+        securities: int = 50,
+    ) -> None:
+        """Сервер не запущен до входа в контекстный менеджер.
+
+        :param latency:
+            Задержка каждого ответа в секундах.
+        :param page_size:
+            Количество строк в одном блоке данных.
+        :param rows:
+            Количество торговых дней в истории и свечах каждой бумаги.
+        :param securities:
+            Количество бумаг в режиме торгов.
+        """
+        self.latency = latency
+        self.page_size = page_size
+        self.requests = 0
+        self._dates = [(_FIRST_DATE + timedelta(days=day)).isoformat() for day in range(rows)]
+        self._securities = [f"SEC{number:03}" for number in range(securities)]
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._runner = web.AppRunner(self._make_app())
+        self._port = 0
+
+    def __enter__(self) -> Self:
+        """Запускает сервер на свободном порту локального хоста."""
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Останавливает сервер."""
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    @property
+    def url(self) -> str:
+        """Адрес, заменяющий https://iss.moex.com/iss."""
+        return f"http://127.0.0.1:{self._port}/iss"
+
+    @property
+    def rows(self) -> int:
+        """Количество торговых дней в истории и свечах каждой бумаги."""
+        return len(self._dates)
+
+    @property
+    def securities(self) -> list[str]:
+        """Тикеры бумаг режима торгов."""
+        return list(self._securities)
+
+    async def _start(self) -> None:
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self._port = self._runner.addresses[0][1]
+
+    def _make_app(self) -> web.Application:
+        app = web.Application()
+        history = "/iss/history/engines/{engine}/markets/{market}"
+        candles = "/iss/engines/{engine}/markets/{market}"
+        app.router.add_get(history + "/securities/{security}.json", self._history)
+        app.router.add_get(history + "/boards/{board}/securities/{security}.json", self._history)
+        app.router.add_get(candles + "/securities/{security}/candles.json", self._candles)
+        app.router.add_get(candles + "/boards/{board}/securities/{security}/candles.json", self._candles)
+        app.router.add_get(candles + "/securities/{security}/candleborders.json", self._candle_borders)
+        app.router.add_get(candles + "/boards/{board}/securities/{security}/candleborders.json", self._candle_borders)
+        app.router.add_get(candles + "/boards/{board}/securities.json", self._board_securities)
+        app.router.add_get("/iss/securities/{security}.json", self._security_boards)
+        app.router.add_get("/iss/statistics/engines/stock/markets/index/analytics/{index}/tickers.json", self._tickers)
+        return app
+
+    async def _respond(self, request: web.Request, tables: dict[str, dict[str, Any]]) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        only = request.query.get("iss.only")
+        if only is not None:
+            tables = {name: table for name, table in tables.items() if name in only.split(",")}
+        for name, table in tables.items():
+            if columns := request.query.get(f"{name}.columns"):
+                tables[name] = _project(table, columns.split(","))
+        return web.json_response(tables)
+
+    async def _history(self, request: web.Request) -> web.Response:
+        security = request.match_info["security"]
+        board = request.match_info.get("board", "TQBR")
+        dates = _date_range(self._dates, request.query.get("from"), request.query.get("till"))
+        start = int(request.query.get("start", 0))
+        data = [
+            [board, day, security, *_prices(index), index * 100, index * 1000.5]
+            for index, day in _page(dates, start, self.page_size)
+        ]
+        cursor = {"columns": ["INDEX", "TOTAL", "PAGESIZE"], "data": [[start, len(dates), self.page_size]]}
+        history = {"columns": list(_HISTORY_COLUMNS), "data": data}
+        return await self._respond(request, {"history": history, "history.cursor": cursor})
+
+    async def _candles(self, request: web.Request) -> web.Response:
+        dates = _date_range(self._dates, request.query.get("from"), request.query.get("till"))
+        start = int(request.query.get("start", 0))
+        data = [
+            [*_prices(index), index * 1000.5, index * 100, f"{day} 10:00:00", f"{day} 18:39:59"]
+            for index, day in _page(dates, start, self.page_size)
+        ]
+        return await self._respond(request, {"candles": {"columns": list(CANDLES_COLUMNS), "data": data}})
+
+    async def _candle_borders(self, request: web.Request) -> web.Response:
+        begin = f"{self._dates[0]} 10:00:00"
+        end = f"{self._dates[-1]} 18:39:59"
+        data = [[begin, end, interval, 4] for interval in (1, 10, 60, 24, 7, 31, 4)]
+        return await self._respond(request, {"borders": {"columns": list(_BORDERS_COLUMNS), "data": data}})
+
+    async def _security_boards(self, request: web.Request) -> web.Response:
+        security = request.match_info["security"]
+        data = [[security, board, "shares", "stock", 1, self._dates[0], self._dates[-1]] for board in SECURITY_BOARDS]
+        return await self._respond(request, {"boards": {"columns": list(_BOARDS_COLUMNS), "data": data}})
+
+    async def _tickers(self, request: web.Request) -> web.Response:
+        """Четные бумаги входят в индекс все время, а нечетные - в первой и последней четверти истории."""
+        first, last = self._dates[0], self._dates[-1]
+        quarter = len(self._dates) // 4
+        data: list[list[Any]] = []
+        for number, security in enumerate(self._securities):
+            if number % 2 == 0:
+                data.append([security, first, last, 3])
+            else:
+                data.append([security, first, self._dates[quarter - 1], 3])
+                data.append([security, self._dates[-quarter], last, 3])
+        return await self._respond(request, {"tickers": {"columns": list(_TICKERS_COLUMNS), "data": data}})
+
+    async def _board_securities(self, request: web.Request) -> web.Response:
+        board = request.match_info["board"]
+        data = [[security, board, security.lower(), 10] for security in self._securities]
+        return await self._respond(request, {"securities": {"columns": list(_SECURITIES_COLUMNS), "data": data}})
+
+
+def _date_range(dates: list[str], start: str | None, end: str | None) -> list[str]:
+    start = start or dates[0]
+    end = end or dates[-1]
+    return [day for day in dates if start <= day <= end[:10]]
+
+
+def _page(dates: list[str], start: int, page_size: int) -> Iterator[tuple[int, str]]:
+    """Строки блока данных с номером дня от начала истории, от которого зависят значения в строке."""
+    for day in dates[start : start + page_size]:
+        yield (date.fromisoformat(day) - _FIRST_DATE).days, day
+
+
+def _prices(index: int) -> list[float]:
+    base = 100 + index % 50
+    return [base, base - 1.5, base + 2.5, base + 0.5]
+
+
+def _project(table: dict[str, Any], columns: list[str]) -> dict[str, Any]:
+    positions = [table["columns"].index(column) for column in columns if column in table["columns"]]
+    return {
+        "columns": [table["columns"][position] for position in positions],
+        "data": [[row[position] for position in positions] for row in table["data"]],
+    }
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from aiomoex import decoders
+
+ROWS = 10_000
+
+
+@pytest.fixture(name="candles_page", scope="module")
+def make_candles_page() -> bytes:
+    columns = ["open", "close", "high", "low", "value", "volume", "begin", "end"]
+    data = [
+        [100 + row % 50, 100.5, 102.5, 98.5, row * 1000.5, row * 100, "2020-01-03 10:00:00", "2020-01-03 10:00:59"]
+        for row in range(ROWS)
+    ]
+    return json.dumps({"candles": {"columns": columns, "data": data}}).encode()
+
+
+@pytest.mark.benchmark(group="decoders")
+@pytest.mark.parametrize(
+    "make_decoder",
+    [decoders.stdlib_decoder, decoders.orjson_decoder, decoders.msgspec_decoder],
+    ids=["json", "orjson", "msgspec"],
+)
+def test_decode_candles(benchmark, candles_page, make_decoder) -> None:
+    try:
+        decoder = make_decoder()
+    except ImportError:
+        pytest.skip("Декодер не установлен")
+    block = benchmark(decoder, candles_page)
+    assert len(block["candles"]["data"]) == ROWS
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from aiomoex import resample
+
+DAYS = 100
+SESSION_MINUTES = 530
+
+
+@pytest.fixture(name="minute_candles", scope="module")
+def make_minute_candles() -> list[dict[str, str | float]]:
+    first = datetime.fromisoformat("2024-01-03 10:00:00")
+    candles = []
+    for day in range(DAYS):
+        for minute in range(SESSION_MINUTES):
+            begin = first + timedelta(days=day, minutes=minute)
+            price = 100 + minute % 17
+            candles.append(
+                {
+                    "open": price,
+                    "close": price + 0.5,
+                    "high": price + 1,
+                    "low": price - 1,
+                    "value": price * 10,
+                    "volume": 10,
+                    "begin": str(begin),
+                    "end": str(begin + timedelta(seconds=59)),
+                },
+            )
+    return candles
+
+
+@pytest.mark.benchmark(group="resample")
+@pytest.mark.parametrize("minutes", [5, 60, 1440])
+def test_resample_candles(benchmark, minute_candles, minutes) -> None:
+    bars = benchmark(resample.resample_candles, minute_candles, minutes)
+    assert sum(bar["volume"] for bar in bars) == 10 * len(minute_candles)
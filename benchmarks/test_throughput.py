@@ -0,0 +1,183 @@
+import pytest
+
+import aiomoex
+from aiomoex import client, request_helpers
+from benchmarks import fake_iss
+
+SECURITY = "SEC000"
+BULK_SECURITIES = 10
+
+
+def history_url() -> str:
+    return request_helpers.make_url(
+        prefix=request_helpers.HISTORY,
+        engine=request_helpers.DEFAULT_ENGINE,
+        market=request_helpers.DEFAULT_MARKET,
+        board=request_helpers.DEFAULT_BOARD,
+        security=SECURITY,
+    )
+
+
+@pytest.mark.benchmark(group="get_all")
+@pytest.mark.parametrize("max_in_flight", [1, 8])
+def test_get_all(run_scenario, fake_server, max_in_flight) -> None:
+    async def scenario(session) -> client.TablesDict:
+        return await client.ISSClient(session, history_url()).get_all(max_in_flight)
+
+    data = run_scenario(scenario)
+    assert len(data["history"]) == fake_server.rows
+
+
+@pytest.mark.benchmark(group="get_all")
+@pytest.mark.parametrize("max_in_flight", [1, 8])
+def test_get_all_columns(run_scenario, fake_server, max_in_flight) -> None:
+    async def scenario(session) -> client.ColumnsDict:
+        return await client.ISSClient(session, history_url()).get_all_columns(max_in_flight)
+
+    data = run_scenario(scenario)
+    assert data["history"].rows == fake_server.rows
+
+
+@pytest.mark.benchmark(group="get_long_data")
+def test_get_board_history(run_scenario, fake_server) -> None:
+    async def scenario(session) -> client.Table:
+        return await aiomoex.get_board_history(session, SECURITY)
+
+    data = run_scenario(scenario)
+    assert len(data) == fake_server.rows
+
+
+@pytest.mark.benchmark(group="get_long_data")
+def test_get_board_candles(run_scenario, fake_server) -> None:
+    async def scenario(session) -> client.Table:
+        return await aiomoex.get_board_candles(session, SECURITY, interval=24)
+
+    data = run_scenario(scenario)
+    assert len(data) == fake_server.rows
+
+
+@pytest.mark.benchmark(group="get_long_data")
+def test_get_board_candles_sharded(run_scenario, fake_server) -> None:
+    async def scenario(session) -> client.Table:
+        return await aiomoex.get_board_candles_sharded(session, SECURITY, interval=24, shards=8)
+
+    data = run_scenario(scenario)
+    assert len(data) == fake_server.rows
+
+
+@pytest.mark.benchmark(group="bulk")
+def test_bulk_board_history(run_scenario, fake_server) -> None:
+    securities = fake_server.securities[:BULK_SECURITIES]
+
+    async def scenario(session) -> list[aiomoex.TickerResult]:
+        return [result async for result in aiomoex.bulk_board_history(session, securities, max_in_flight=8)]
+
+    results = run_scenario(scenario)
+    assert len(results) == BULK_SECURITIES
+    assert all(len(result.data) == fake_server.rows for result in results)
+
+
+@pytest.mark.benchmark(group="bulk_candles")
+def test_bulk_board_candles(run_scenario, fake_server) -> None:
+    securities = fake_server.securities[:BULK_SECURITIES]
+
+    async def scenario(session) -> list[aiomoex.TickerResult]:
+        return [result async for result in aiomoex.bulk_board_candles(session, securities, interval=1)]
+
+    results = run_scenario(scenario)
+    assert all(len(result.data) == fake_server.rows for result in results)
+
+
+@pytest.mark.benchmark(group="bulk_candles")
+def test_process_bulk_board_candles(run_scenario, fake_server) -> None:
+    """Сервер работает в одном процессе с замером, поэтому замер показывает накладные расходы, а не ускорение."""
+    securities = fake_server.securities[:BULK_SECURITIES]
+
+    async def scenario(_) -> list[aiomoex.ColumnsResult]:
+        results = aiomoex.process_bulk_board_candles(securities, processes=2, rate=1000, chunk_size=5)
+        return [result async for result in results]
+
+    results = run_scenario(scenario)
+    assert all(result.data.rows == fake_server.rows for result in results)
+
+
+@pytest.mark.benchmark(group="rows")
+def test_get_board_history_rows(run_scenario, fake_server) -> None:
+    async def scenario(session) -> list[aiomoex.HistoryRow]:
+        return await aiomoex.get_board_history_rows(session, SECURITY)
+
+    data = run_scenario(scenario)
+    assert len(data) == fake_server.rows
+
+
+@pytest.mark.benchmark(group="rows")
+def test_get_board_candle_rows(run_scenario, fake_server) -> None:
+    async def scenario(session) -> list[aiomoex.Candle]:
+        return await aiomoex.get_board_candle_rows(session, SECURITY)
+
+    data = run_scenario(scenario)
+    assert len(data) == fake_server.rows
+
+
+@pytest.mark.benchmark(group="export")
+def test_export_board_candles(run_scenario, fake_server, tmp_path) -> None:
+    async def scenario(session) -> int:
+        return await aiomoex.export_board_candles(session, SECURITY, tmp_path)
+
+    rows = run_scenario(scenario)
+    assert rows == fake_server.rows
+
+
+@pytest.mark.benchmark(group="store")
+def test_local_store_covered_range(run_scenario, fake_server, tmp_path) -> None:
+    local_store = aiomoex.LocalStore(tmp_path / "store.db")
+
+    async def scenario(session) -> client.Table:
+        return await local_store.get_board_candles(session, SECURITY, start="2011-01-01", end="2011-12-31")
+
+    data = run_scenario(scenario)
+    local_store.close()
+    assert len(data) == 365
+    assert fake_server.requests > 0
+
+
+@pytest.mark.benchmark(group="boards")
+def test_get_market_history_merged(run_scenario, fake_server) -> None:
+    async def scenario(session) -> client.Table:
+        return await aiomoex.get_market_history_merged(session, SECURITY)
+
+    data = run_scenario(scenario)
+    assert len(data) == fake_server.rows * len(fake_iss.SECURITY_BOARDS)
+    assert [row["BOARDID"] for row in data[:3]] == list(fake_iss.SECURITY_BOARDS)
+
+
+@pytest.mark.benchmark(group="bulk")
+def test_get_index_panel(run_scenario, fake_server) -> None:
+    async def scenario(session) -> aiomoex.IndexPanel:
+        return await aiomoex.get_index_panel(session, "IMOEX")
+
+    panel = run_scenario(scenario)
+    assert panel.values.shape == (fake_server.rows, len(fake_server.securities))
+    assert panel.tickers == tuple(sorted(fake_server.securities))
+
+
+@pytest.mark.benchmark(group="get_long_data")
+def test_open_board_history_tail(run_scenario, fake_server) -> None:
+    async def scenario(session) -> client.Table:
+        data = await aiomoex.open_board_history(session, SECURITY)
+        return await data.get(slice(-20, None))
+
+    data = run_scenario(scenario)
+    assert [row["TRADEDATE"] for row in data] == sorted({row["TRADEDATE"] for row in data})
+    assert len(data) == min(20, fake_server.rows)
+
+
+@pytest.mark.benchmark(group="columns")
+@pytest.mark.parametrize("columns", [None, ("begin", "close")])
+def test_get_board_candles_columns(run_scenario, fake_server, columns) -> None:
+    async def scenario(session) -> client.Table:
+        return await aiomoex.get_board_candles(session, SECURITY, interval=24, columns=columns)
+
+    data = run_scenario(scenario)
+    assert len(data) == fake_server.rows
+    assert len(data[0]) == len(columns or fake_iss.CANDLES_COLUMNS)
@@ -0,0 +1,38 @@
+import aiomoex
+
+
+async def test_bulk_board_history(http_session) -> None:
+    securities = ["GAZP", "LKOH", "SBER"]
+    results = [
+        result
+        async for result in aiomoex.bulk_board_history(
+            http_session,
+            securities,
+            start="2018-01-03",
+            end="2018-01-31",
+            max_in_flight=2,
+        )
+    ]
+    assert {result.security for result in results} == set(securities)
+    for result in results:
+        assert result.error is None
+        assert result.data[0]["TRADEDATE"] == "2018-01-03"
+        assert result.data[-1]["TRADEDATE"] == "2018-01-31"
+
+
+async def test_bulk_board_candles(http_session) -> None:
+    results = [
+        result
+        async for result in aiomoex.bulk_board_candles(
+            http_session,
+            ["MTSS", "AKRN"],
+            interval=31,
+            start="2020-01-01",
+            end="2020-12-31",
+        )
+    ]
+    assert len(results) == 2
+    for result in results:
+        assert result.error is None
+        assert len(result.data) == 12
+        assert result.data[0]["begin"] == "2020-01-01 00:00:00"
@@ -1,3 +1,5 @@
+from datetime import date, datetime
+
 import pytest
 
 from aiomoex import candles
@@ -99,3 +101,120 @@ async def test_get_board_candles_to_end(http_session) -> None:
     assert data[5]["volume"] == pytest.approx(20_180_000)
     assert data[6]["begin"] == "2015-01-01 00:00:00"
     assert data[51]["end"] == "2018-10-31 00:00:00"
+
+
+async def test_iter_market_candles(http_session) -> None:
+    blocks = [block async for block in candles.iter_market_candles(http_session, "RTKM", interval=1, end="2011-12-16")]
+    assert len(blocks) > 1
+    assert all(blocks)
+    assert [row for block in blocks for row in block] == await candles.get_market_candles(
+        http_session,
+        "RTKM",
+        interval=1,
+        end="2011-12-16",
+    )
+
+
+async def test_iter_board_candles(http_session) -> None:
+    blocks = [block async for block in candles.iter_board_candles(http_session, "MTSS", interval=10, end="2011-12-22")]
+    assert len(blocks) > 1
+    assert blocks[0][0]["open"] == pytest.approx(202.7)
+    assert blocks[-1][-1]["end"] == "2011-12-22 18:49:59"
+
+
+async def test_get_board_candles_sharded(http_session) -> None:
+    data = await candles.get_board_candles_sharded(http_session, "MTSS", interval=10, end="2011-12-22", shards=3)
+    assert data == await candles.get_board_candles(http_session, "MTSS", interval=10, end="2011-12-22")
+
+
+async def test_get_board_candles_sharded_weekly(http_session) -> None:
+    data = await candles.get_board_candles_sharded(
+        http_session,
+        "TTLK",
+        interval=7,
+        start="2015-01-01",
+        end="2015-12-31",
+        shards=5,
+    )
+    begins = [row["begin"] for row in data]
+    assert begins == sorted(set(begins))
+    assert len(data) >= 52
+
+
+def test_date_shards() -> None:
+    assert candles._date_shards(date(2020, 1, 1), date(2020, 1, 10), 3) == [
+        ("2020-01-01", "2020-01-03"),
+        ("2020-01-04", "2020-01-06"),
+        ("2020-01-07", "2020-01-10"),
+    ]
+
+
+def test_date_shards_more_than_days() -> None:
+    assert candles._date_shards(date(2020, 1, 1), date(2020, 1, 2), 5) == [
+        ("2020-01-01", "2020-01-01"),
+        ("2020-01-02", "2020-01-02"),
+    ]
+
+
+def test_stitch() -> None:
+    parts = [
+        [{"begin": "2020-01-06 00:00:00"}, {"begin": "2020-01-13 00:00:00"}],
+        [{"begin": "2020-01-13 00:00:00"}, {"begin": "2020-01-20 00:00:00"}],
+        [],
+        [{"begin": "2020-01-27 00:00:00"}],
+    ]
+    assert [row["begin"] for row in candles._stitch(parts)] == [
+        "2020-01-06 00:00:00",
+        "2020-01-13 00:00:00",
+        "2020-01-20 00:00:00",
+        "2020-01-27 00:00:00",
+    ]
+
+
+async def test_get_board_candle_rows(http_session) -> None:
+    data = await candles.get_board_candle_rows(http_session, "MTSS", interval=10, end="2011-12-22")
+    assert len(data) > 500
+    assert data[0].open == pytest.approx(202.7)
+    assert data[1].close == pytest.approx(204.12)
+    assert data[6].begin == datetime.fromisoformat("2011-12-08 11:00:00")
+    assert data[-1].end == datetime.fromisoformat("2011-12-22 18:49:59")
+
+
+async def test_get_board_candles_columns(http_session) -> None:
+    data = await candles.get_board_candles(
+        http_session,
+        "SNGSP",
+        start="2011-12-15",
+        end="2011-12-16",
+        columns=("begin", "close"),
+    )
+    assert data == [
+        {"begin": "2011-12-15 00:00:00", "close": data[0]["close"]},
+        {"begin": "2011-12-16 00:00:00", "close": data[1]["close"]},
+    ]
+
+
+async def test_get_board_candle_borders_columns(http_session) -> None:
+    data = await candles.get_board_candle_borders(http_session, "SNGSP", columns=("interval", "end"))
+    assert len(data) == 7
+    assert all(set(row) == {"interval", "end"} for row in data)
+
+
+async def test_get_board_candles_sharded_requires_begin(http_session) -> None:
+    with pytest.raises(candles.client.ISSMoexError, match="begin"):
+        await candles.get_board_candles_sharded(http_session, "SNGSP", columns=("close",))
+
+
+async def test_get_board_candles_sharded_error(monkeypatch) -> None:
+    async def get_board_candle_borders(*_: object) -> list[dict[str, str | int]]:
+        return [{"begin": "2020-01-01 00:00:00", "end": "2020-12-31 23:59:59", "interval": 24}]
+
+    async def get_board_candles(*args: object) -> list[dict[str, str | int]]:
+        if str(args[3]) > "2020-06-01":
+            raise candles.client.ISSMoexError(f"Ошибка загрузки {args[3]}")
+        return []
+
+    monkeypatch.setattr(candles, "get_board_candle_borders", get_board_candle_borders)
+    monkeypatch.setattr(candles, "get_board_candles", get_board_candles)
+    with pytest.raises(candles.client.ISSMoexError, match="Ошибка загрузки"):
+        await candles.get_board_candles_sharded(None, "SNGSP", interval=24)
@@ -1,3 +1,4 @@
+import asyncio
 import typing
 
 import pytest
@@ -17,7 +18,7 @@ def test_make_query_empty(http_session) -> None:
     query = iss._make_query()
     assert isinstance(query, typing.Mapping)
     assert len(query) == 2
-    assert query["iss.json"] == "extended"
+    assert query["iss.json"] == "compact"
     assert query["iss.meta"] == "off"
 
 
@@ -27,7 +28,7 @@ def test_make_query_not_empty(http_session) -> None:
     query = iss._make_query()
     assert isinstance(query, typing.Mapping)
     assert len(query) == 3
-    assert query["iss.json"] == "extended"
+    assert query["iss.json"] == "compact"
     assert query["iss.meta"] == "off"
     assert query["test_param"] == "test_value"
 
@@ -38,7 +39,7 @@ def test_make_query_not_empty_with_start(http_session) -> None:
     query = iss._make_query(100)
     assert isinstance(query, typing.Mapping)
     assert len(query) == 4
-    assert query["iss.json"] == "extended"
+    assert query["iss.json"] == "compact"
     assert query["iss.meta"] == "off"
     assert query["test_param"] == "test_value"
     assert query["start"] == 100
@@ -127,3 +128,104 @@ def test_cursor_block_size_raise_bad_structure() -> None:
     with pytest.raises(client.ISSMoexError) as error:
         client._cursor_block_size(5, [{}, {}])
     assert "Некорректные данные history.cursor" in str(error.value)
+
+
+async def test_get_all_concurrently_with_cursor(http_session) -> None:
+    url = "https://iss.moex.com/iss/history/engines/stock/markets/shares/securities/SNGSP.json"
+    query = {"from": "2018-01-01", "till": "2018-03-01"}
+    iss = client.ISSClient(http_session, url, query)
+    raw = await iss.get_all(max_in_flight=4)
+    assert raw == await iss.get_all()
+
+
+async def test_get_all_concurrently_without_cursor(http_session) -> None:
+    url = "https://iss.moex.com/iss/engines/stock/markets/shares/securities/SNGSP/candles.json"
+    query = {"from": "2018-01-03", "till": "2018-06-01", "interval": 24}
+    iss = client.ISSClient(http_session, url, query)
+    raw = await iss.get_all(max_in_flight=4)
+    data = raw["candles"]
+    assert len(data) > 100
+    assert data[0]["begin"] == "2018-01-03 00:00:00"
+    assert data[-1]["begin"] == "2018-06-01 00:00:00"
+
+
+def test_cursor_starts() -> None:
+    assert client._cursor_starts([{"INDEX": 0, "PAGESIZE": 100, "TOTAL": 350}]) == range(100, 350, 100)
+
+
+def test_cursor_starts_single_block() -> None:
+    assert client._cursor_starts([{"INDEX": 0, "PAGESIZE": 100, "TOTAL": 100}]) == range(0)
+
+
+def test_to_tables() -> None:
+    block = {
+        "history": {"columns": ["TRADEDATE", "CLOSE"], "data": [["2018-01-03", 1.5], ["2018-01-04", 2]]},
+        "empty": {"columns": ["SECID"], "data": []},
+    }
+    assert client._to_tables(block) == {
+        "history": [{"TRADEDATE": "2018-01-03", "CLOSE": 1.5}, {"TRADEDATE": "2018-01-04", "CLOSE": 2}],
+        "empty": [],
+    }
+
+
+def test_block_size_with_cursor() -> None:
+    block = {
+        "history": {"columns": ["CLOSE"], "data": [[1], [2]]},
+        "history.cursor": {"columns": ["INDEX", "TOTAL", "PAGESIZE"], "data": [[0, 3, 2]]},
+    }
+    assert client._block_size(0, block) == 2
+    assert list(block) == ["history"]
+
+
+def test_block_size_without_cursor() -> None:
+    assert client._block_size(0, {"candles": {"columns": ["open"], "data": [[1], [2], [3]]}}) == 3
+    assert client._block_size(0, {"candles": {"columns": ["open"], "data": []}}) == 0
+
+
+def test_projections() -> None:
+    query = {"iss.only": "history,history.cursor", "history.columns": "TRADEDATE,CLOSE", "from": "2018-01-03"}
+    assert client._projections(query) == {"history": frozenset({"TRADEDATE", "CLOSE"})}
+
+
+def test_check_columns() -> None:
+    block = {"candles": {"columns": ["begin", "close"], "data": []}}
+    client._check_columns(block, {"candles": frozenset({"close"}), "missing": frozenset({"close"})})
+    with pytest.raises(client.ISSMoexError, match="Отсутствуют столбцы \\['clsoe'\\] в таблице candles"):
+        client._check_columns(block, {"candles": frozenset({"begin", "clsoe"})})
+
+
+async def test_get_unknown_column(http_session) -> None:
+    url = "https://iss.moex.com/iss/history/engines/stock/markets/shares/securities/SNGSP.json"
+    query = {"iss.only": "history,history.cursor", "history.columns": "TRADEDATE,CLSOE"}
+    with pytest.raises(client.ISSMoexError, match="CLSOE"):
+        await client.ISSClient(http_session, url, query).get()
+
+
+async def test_get_all_concurrently_page_error(http_session, monkeypatch) -> None:
+    async def get_compact(_, start=None) -> client.CompactTablesDict:
+        if start:
+            raise client.ISSMoexError(f"Ошибка загрузки блока {start}")
+        return {
+            "history": {"columns": ["CLOSE"], "data": [[1], [2]]},
+            "history.cursor": {"columns": ["INDEX", "TOTAL", "PAGESIZE"], "data": [[0, 6, 2]]},
+        }
+
+    monkeypatch.setattr(client.ISSClient, "get_compact", get_compact)
+    iss = client.ISSClient(http_session, "https://iss.moex.com/iss/history.json")
+    for max_in_flight in (1, 4):
+        with pytest.raises(client.ISSMoexError, match="Ошибка загрузки блока"):
+            await iss.get_all(max_in_flight)
+
+
+async def test_task_group_unwraps_nested_errors() -> None:
+    async def fail() -> None:
+        raise client.ISSMoexError("inner")
+
+    async def nested() -> None:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(fail())
+
+    with pytest.raises(client.ISSMoexError, match="inner") as error:
+        async with client.task_group() as group:
+            group.create_task(nested())
+    assert isinstance(error.value.__cause__, ExceptionGroup)
@@ -0,0 +1,97 @@
+import array
+import math
+
+import pandas as pd
+
+from aiomoex import columnar
+
+
+def test_columns_types() -> None:
+    columns = columnar.Columns()
+    columns.extend(
+        [
+            {"TRADEDATE": "2018-01-03", "CLOSE": 100.5, "VOLUME": 10},
+            {"TRADEDATE": "2018-01-04", "CLOSE": 101, "VOLUME": 20},
+        ],
+    )
+    assert columns.rows == 2
+    assert list(columns) == ["TRADEDATE", "CLOSE", "VOLUME"]
+    assert columns["TRADEDATE"] == ["2018-01-03", "2018-01-04"]
+    assert columns["CLOSE"] == array.array("d", [100.5, 101])
+    assert columns["VOLUME"] == array.array("q", [10, 20])
+
+
+def test_columns_missing_values() -> None:
+    columns = columnar.Columns()
+    columns.extend([{"CLOSE": None, "VOLUME": 10}, {"CLOSE": None, "VOLUME": 20}])
+    columns.extend([{"CLOSE": 100, "VOLUME": None}])
+    close = columns["CLOSE"]
+    volume = columns["VOLUME"]
+    assert isinstance(close, array.array)
+    assert close.typecode == "d"
+    assert math.isnan(close[0])
+    assert close[2] == 100
+    assert isinstance(volume, array.array)
+    assert volume.typecode == "d"
+    assert list(volume)[:2] == [10, 20]
+    assert math.isnan(volume[2])
+
+
+def test_columns_int_then_mixed_batch() -> None:
+    columns = columnar.Columns()
+    columns.extend_compact(["CLOSE", "VOLUME"], [[270, 10], [271, 20]])
+    columns.extend_compact(["CLOSE", "VOLUME"], [[272, 30], [270.5, None]])
+    assert columns.rows == 4
+    assert columns["CLOSE"] == array.array("d", [270, 271, 272, 270.5])
+    volume = columns["VOLUME"]
+    assert len(volume) == 4
+    assert list(volume)[:3] == [10, 20, 30]
+    assert math.isnan(volume[3])
+
+
+def test_columns_float_then_mixed_batch() -> None:
+    columns = columnar.Columns()
+    columns.extend_compact(["VALUE"], [[1.5]])
+    columns.extend_compact(["VALUE"], [[2.5], ["a"]])
+    assert columns["VALUE"] == [1.5, 2.5, "a"]
+
+
+def test_columns_mixed_values() -> None:
+    columns = columnar.Columns()
+    columns.extend([{"VALUE": 1}])
+    columns.extend([{"VALUE": "a"}])
+    assert columns["VALUE"] == [1, "a"]
+
+
+def test_columns_to_numpy() -> None:
+    columns = columnar.Columns()
+    columns.extend([{"SECID": "GAZP", "CLOSE": 150.5}, {"SECID": "SBER", "CLOSE": 250.0}])
+    data = columns.to_numpy()
+    assert data.shape == (2,)
+    assert list(data["SECID"]) == ["GAZP", "SBER"]
+    assert list(data["CLOSE"]) == [150.5, 250.0]
+
+
+def test_columns_to_arrow() -> None:
+    columns = columnar.Columns()
+    columns.extend([{"SECID": "GAZP", "VOLUME": 1}, {"SECID": "SBER", "VOLUME": 2}])
+    table = columns.to_arrow()
+    assert table.column_names == ["SECID", "VOLUME"]
+    assert table.column("VOLUME").to_pylist() == [1, 2]
+
+
+def test_columns_to_dataframe() -> None:
+    columns = columnar.Columns()
+    columns.extend([{"SECID": "GAZP", "VOLUME": 1}, {"SECID": "SBER", "VOLUME": 2}])
+    df = pd.DataFrame(columns.to_dict())
+    assert df.shape == (2, 2)
+    assert df.loc[1, "SECID"] == "SBER"
+
+
+def test_columns_extend_compact() -> None:
+    columns = columnar.Columns()
+    columns.extend_compact(["SECID", "CLOSE"], [])
+    columns.extend_compact(["SECID", "CLOSE"], [["GAZP", 150.5], ["SBER", 250]])
+    assert columns.rows == 2
+    assert columns["SECID"] == ["GAZP", "SBER"]
+    assert columns["CLOSE"] == array.array("d", [150.5, 250])
@@ -0,0 +1,20 @@
+from datetime import date, timedelta
+
+from aiomoex import dates
+
+RANGES = [
+    (date(2018, 3, 1), date(2018, 3, 5)),
+    (date(2018, 1, 1), date(2018, 1, 31)),
+    (date(2018, 2, 1), date(2018, 2, 5)),
+]
+
+
+def test_merge_ranges() -> None:
+    assert dates.merge_ranges(RANGES) == [
+        (date(2018, 1, 1), date(2018, 2, 5)),
+        (date(2018, 3, 1), date(2018, 3, 5)),
+    ]
+
+
+def test_merge_ranges_gap() -> None:
+    assert dates.merge_ranges(RANGES, timedelta(days=31)) == [(date(2018, 1, 1), date(2018, 3, 5))]
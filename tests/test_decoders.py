@@ -0,0 +1,39 @@
+import json
+import sys
+
+import msgspec
+import pytest
+
+from aiomoex import decoders
+
+RAW = json.dumps(
+    {
+        "candles": {
+            "columns": ["open", "close", "value", "begin"],
+            "data": [[100.5, 101, 1e6, "2020-01-03 10:00:00"], [None, 99, 0, "2020-01-03 10:01:00"]],
+        },
+    },
+).encode()
+
+
+@pytest.mark.parametrize(
+    "make_decoder",
+    [decoders.stdlib_decoder, decoders.orjson_decoder, decoders.msgspec_decoder, decoders.default_decoder],
+)
+def test_decoders(make_decoder) -> None:
+    assert make_decoder()(RAW) == json.loads(RAW)
+
+
+def test_msgspec_decoder_validates() -> None:
+    with pytest.raises(msgspec.ValidationError):
+        decoders.msgspec_decoder()(b'{"candles": {"columns": ["open"]}}')
+
+
+def test_default_decoder_fallback(monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    decoders.default_decoder.cache_clear()
+    try:
+        assert decoders.default_decoder() is json.loads
+    finally:
+        decoders.default_decoder.cache_clear()
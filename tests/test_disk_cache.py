@@ -0,0 +1,67 @@
+import asyncio
+
+from aiomoex import disk_cache
+
+URL = "https://iss.moex.com/iss/history/engines/stock/markets/shares/securities/SNGSP.json"
+BLOCK = {"history": {"columns": ["TRADEDATE", "CLOSE"], "data": [["2018-01-03", 1.5]]}}
+
+
+async def test_disk_cache_get_set(tmp_path) -> None:
+    cache = disk_cache.DiskCache(tmp_path / "cache.db")
+    query = {"from": "2018-01-01", "till": "2018-03-01", "start": 100}
+    assert await cache.get(URL, query) is None
+    await cache.set(URL, query, BLOCK)
+    assert await cache.get(URL, dict(reversed(query.items()))) == BLOCK
+    assert await cache.get(URL, {"from": "2018-01-01", "till": "2018-03-01"}) is None
+    cache.close()
+
+
+async def test_disk_cache_persistent(tmp_path) -> None:
+    query = {"till": "2018-03-01"}
+    cache = disk_cache.DiskCache(tmp_path / "cache.db")
+    await cache.set(URL, query, BLOCK)
+    cache.close()
+    cache = disk_cache.DiskCache(tmp_path / "cache.db")
+    assert await cache.get(URL, query) == BLOCK
+    cache.clear()
+    assert await cache.get(URL, query) is None
+
+
+async def test_disk_cache_ttl(tmp_path) -> None:
+    cache = disk_cache.DiskCache(tmp_path / "cache.db", ttl=0.01)
+    await cache.set(URL, {"from": "2018-01-01"}, BLOCK)
+    await cache.set(URL, {"till": "2018-03-01"}, BLOCK)
+    await asyncio.sleep(0.02)
+    assert await cache.get(URL, {"from": "2018-01-01"}) is None
+    assert await cache.get(URL, {"till": "2018-03-01"}) == BLOCK
+
+
+async def test_disk_cache_eviction(tmp_path) -> None:
+    cache = disk_cache.DiskCache(tmp_path / "cache.db", max_bytes=250)
+    for start in range(4):
+        await cache.set(URL, {"start": start}, BLOCK)
+        await asyncio.sleep(0.001)
+    assert await cache.get(URL, {"start": 0}) is None
+    assert await cache.get(URL, {"start": 3}) == BLOCK
+
+
+async def test_disk_cache_evicts_over_limit(tmp_path) -> None:
+    size = len(disk_cache.json.dumps(BLOCK))
+    cache = disk_cache.DiskCache(tmp_path / "cache.db", max_bytes=3 * size)
+    statements: list[str] = []
+    cache._conn.set_trace_callback(statements.append)
+    for start in [0, 1, 2, 0]:
+        await cache.set(URL, {"start": start}, BLOCK)
+    assert not any("OVER" in statement for statement in statements)
+    await cache.set(URL, {"start": 3}, BLOCK)
+    assert any("OVER" in statement for statement in statements)
+    assert cache._total_bytes == 3 * size
+    assert await cache.get(URL, {"start": 3}) == BLOCK
+    cache.close()
+    assert disk_cache.DiskCache(tmp_path / "cache.db")._total_bytes == 3 * size
+
+
+def test_is_immutable() -> None:
+    assert disk_cache._is_immutable({"till": "2018-03-01"})
+    assert not disk_cache._is_immutable({"till": "2999-03-01"})
+    assert not disk_cache._is_immutable({"from": "2018-03-01"})
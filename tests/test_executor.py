@@ -0,0 +1,43 @@
+import pickle
+
+import aiomoex
+from aiomoex import columnar, executor
+
+
+async def test_process_bulk_board_candles() -> None:
+    securities = ["MTSS", "AKRN", "GAZP"]
+    results = [
+        result
+        async for result in aiomoex.process_bulk_board_candles(
+            securities,
+            interval=31,
+            start="2020-01-01",
+            end="2020-06-30",
+            columns=("begin", "close"),
+            processes=2,
+            chunk_size=2,
+        )
+    ]
+    assert {result.security for result in results} == set(securities)
+    for result in results:
+        assert result.error is None
+        assert result.data.rows == 6
+        assert list(result.data) == ["begin", "close"]
+
+
+async def test_load_securities_error(http_session) -> None:
+    chunk = executor._Chunk((("GAZP", "http://127.0.0.1:1/iss/candles.json"),), {}, 10, 1)
+    (result,) = await executor._load_securities(http_session, chunk)
+    assert result.security == "GAZP"
+    assert result.data.rows == 0
+    assert isinstance(result.error, aiomoex.client.ISSMoexError)
+    assert str(result.error).startswith("GAZP: ClientConnectorError")
+
+
+def test_columns_result_pickle() -> None:
+    data = columnar.Columns()
+    data.extend_compact(["begin", "close"], [["2020-01-01 00:00:00", 1.5], ["2020-02-01 00:00:00", 2]])
+    result = pickle.loads(pickle.dumps(executor.ColumnsResult("GAZP", data)))  # noqa: S301
+    assert result.security == "GAZP"
+    assert result.data.to_dict() == data.to_dict()
+    assert result.data.rows == 2
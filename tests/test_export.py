@@ -0,0 +1,132 @@
+from collections.abc import AsyncIterator
+from typing import ClassVar
+
+import pyarrow.dataset as ds
+import pytest
+
+from aiomoex import client, export
+
+COLUMNS = ["TRADEDATE", "CLOSE", "VOLUME"]
+PAGES = [
+    [["2018-12-27", 100, 10], ["2018-12-28", 101, 20]],
+    [["2019-01-03", 102.5, 30], ["2019-01-04", None, 0]],
+]
+
+
+async def blocks(pages):
+    for data in pages:
+        yield {"history": {"columns": COLUMNS, "data": data}}
+
+
+async def failing_blocks():
+    yield {"history": {"columns": COLUMNS, "data": PAGES[1]}}
+    raise client.ISSMoexError("Ошибка загрузки")
+
+
+async def null_blocks(pages=([["2019-01-03", None]], [["2019-01-04", "SUR"]])):
+    for data in pages:
+        yield {"history": {"columns": ["TRADEDATE", "FACEUNIT"], "data": data}}
+
+
+async def export_pages(pages, root, file_format="parquet", last=None, *, append=False) -> int:
+    return await export._export(pages, "history", "TRADEDATE", root, file_format=file_format, last=last, append=append)
+
+
+class _FakeISSClient:
+    queries: ClassVar[list[client.WebQuery]] = []
+
+    def __init__(self, _, __, query) -> None:
+        self.queries.append(query)
+
+    def iter_compact(self) -> AsyncIterator[client.CompactTablesDict]:
+        return blocks(PAGES[1:])
+
+
+def read(root, file_format):
+    return ds.dataset(root, format="ipc" if file_format == "arrow" else file_format, partitioning="hive").to_table()
+
+
+async def test_export_board_history(http_session, tmp_path) -> None:
+    rows = await export.export_board_history(http_session, "LSRG", tmp_path, start="2018-12-20", end="2019-01-15")
+    assert rows > 10
+    root = tmp_path / "security=LSRG" / "board=TQBR"
+    assert sorted(path.name for path in root.iterdir()) == ["year=2018", "year=2019"]
+    assert read(root, "parquet").num_rows == rows
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+async def test_export_partitions(tmp_path, file_format) -> None:
+    rows = await export_pages(blocks(PAGES), tmp_path, file_format)
+    assert rows == 4
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["year=2018", "year=2019"]
+    table = read(tmp_path, file_format).sort_by("TRADEDATE")
+    assert table.column("TRADEDATE").to_pylist() == ["2018-12-27", "2018-12-28", "2019-01-03", "2019-01-04"]
+    assert table.column("CLOSE").to_pylist()[:3] == [100, 101, 102.5]
+    assert table.column("year").to_pylist() == [2018, 2018, 2019, 2019]
+
+
+async def test_export_append(tmp_path) -> None:
+    await export_pages(blocks(PAGES[:1]), tmp_path)
+    rows = await export_pages(blocks(PAGES), tmp_path, last="2018-12-28", append=True)
+    assert rows == 2
+    assert read(tmp_path, "parquet").num_rows == 4
+
+
+async def test_export_board_history_append_query(http_session, tmp_path, monkeypatch) -> None:
+    await export_pages(blocks(PAGES[:1]), tmp_path / "security=LSRG" / "board=TQBR")
+    monkeypatch.setattr(export.client, "ISSClient", _FakeISSClient)
+    rows = await export.export_board_history(http_session, "LSRG", tmp_path, start="2018-01-01", append=True)
+    assert rows == 2
+    assert _FakeISSClient.queries[-1]["from"] == "2018-12-28"
+
+
+def test_resume_start() -> None:
+    assert export._resume_start("2018-01-01", None) == "2018-01-01"
+    assert export._resume_start(None, "2018-12-28") == "2018-12-28"
+    assert export._resume_start("2018-01-01", "2018-12-28 18:40:00") == "2018-12-28"
+    assert export._resume_start("2019-01-01", "2018-12-28") == "2019-01-01"
+
+
+async def test_export_overwrite(tmp_path) -> None:
+    await export_pages(blocks(PAGES), tmp_path)
+    rows = await export_pages(blocks(PAGES[1:]), tmp_path)
+    assert rows == 2
+    assert read(tmp_path, "parquet").num_rows == 2
+
+
+async def test_export_overwrite_error(tmp_path) -> None:
+    await export_pages(blocks(PAGES), tmp_path)
+    parts = export._parts(tmp_path)
+    with pytest.raises(client.ISSMoexError, match="Ошибка загрузки"):
+        await export_pages(failing_blocks(), tmp_path)
+    assert export._parts(tmp_path) == parts
+    assert read(tmp_path, "parquet").num_rows == 4
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+async def test_export_null_first_page(tmp_path, file_format) -> None:
+    rows = await export_pages(null_blocks(), tmp_path, file_format)
+    assert rows == 2
+    table = read(tmp_path, file_format).sort_by("TRADEDATE")
+    assert table.column("FACEUNIT").to_pylist() == [None, "SUR"]
+
+
+async def test_export_null_column_limit(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(export, "_MAX_PENDING_ROWS", 1)
+    pages = [[["2019-01-03", None]], [["2019-01-04", 1.5]], [["2019-01-05", None]]]
+    rows = await export_pages(null_blocks(pages), tmp_path)
+    assert rows == 3
+    table = read(tmp_path, "parquet").sort_by("TRADEDATE")
+    assert table.schema.field("FACEUNIT").type == "string"
+    assert table.column("FACEUNIT").to_pylist() == [None, "1.5", None]
+
+
+def test_split_years() -> None:
+    table: client.CompactTable = {"columns": COLUMNS, "data": PAGES[0] + PAGES[1]}
+    assert [(year, len(rows)) for year, rows in export._split_years(table, "TRADEDATE", None)] == [
+        ("2018", 2),
+        ("2019", 2),
+    ]
+    assert [year for year, _ in export._split_years(table, "TRADEDATE", "2018-12-28")] == ["2019"]
+    with pytest.raises(client.ISSMoexError, match="Отсутствует столбец begin"):
+        list(export._split_years(table, "begin", None))
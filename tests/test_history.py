@@ -1,3 +1,5 @@
+from datetime import date
+
 import pandas as pd
 import pytest
 
@@ -25,6 +27,33 @@ async def test_get_board_securities(http_session) -> None:
     assert df.loc["MRSB", "LOTSIZE"] == 10000
 
 
+async def test_get_board_securities_marketdata(http_session) -> None:
+    data = await history.get_board_securities(http_session, table="marketdata")
+    assert len(data) > 200
+    assert {"SECID", "BOARDID", "LAST"} <= set(data[0])
+
+
+async def test_get_board_securities_marketdata_all_columns(monkeypatch) -> None:
+    queries = []
+
+    async def get_short_data(_, __, table_name, query) -> list[dict[str, str]]:
+        queries.append((table_name, query))
+        return []
+
+    monkeypatch.setattr(history.request_helpers, "get_short_data", get_short_data)
+    await history.get_board_securities(None, table="marketdata")
+    await history.get_board_securities(None)
+    await history.get_board_securities(None, table="marketdata", columns=("SECID", "LAST"))
+    assert queries == [
+        ("marketdata", {"iss.only": "marketdata,history.cursor"}),
+        (
+            "securities",
+            {"iss.only": "securities,history.cursor", "securities.columns": "SECID,REGNUMBER,LOTSIZE,SHORTNAME"},
+        ),
+        ("marketdata", {"iss.only": "marketdata,history.cursor", "marketdata.columns": "SECID,LAST"}),
+    ]
+
+
 async def test_get_market_history_from_beginning(http_session) -> None:
     data = await history.get_market_history(http_session, "AKRN", end="2006-12-01")
     assert isinstance(data, list)
@@ -66,3 +95,63 @@ async def test_get_board_history_to_end(http_session) -> None:
     assert df.loc["2018-08-10", "VALUE"] == pytest.approx(8_626_464.5)
     assert df.loc["2018-09-06", "CLOSE"] == pytest.approx(660)
     assert df.loc["2018-08-28", "VOLUME"] == 47428
+
+
+async def test_iter_market_history(http_session) -> None:
+    blocks = [block async for block in history.iter_market_history(http_session, "MOEX", start="2017-10-02")]
+    assert len(blocks) > 1
+    assert blocks[0][0]["TRADEDATE"] == "2017-10-02"
+
+
+async def test_iter_board_history(http_session) -> None:
+    blocks = [block async for block in history.iter_board_history(http_session, "LSNGP", end="2014-08-01")]
+    data = [row for block in blocks for row in block]
+    assert data == await history.get_board_history(http_session, "LSNGP", end="2014-08-01")
+
+
+async def test_get_board_history_rows(http_session) -> None:
+    data = await history.get_board_history_rows(http_session, "LSRG", start="2018-08-07", end="2018-08-10")
+    assert [row.trade_date for row in data] == [date(2018, 8, day) for day in range(7, 11)]
+    assert data[0].close == 777
+    assert data[-1].volume == 11313
+    assert data[-1].board == "TQBR"
+    assert data[-1].value == pytest.approx(8_626_464.5)
+
+
+async def test_get_security_boards(http_session) -> None:
+    data = await history.get_security_boards(http_session, "SBER")
+    boards = {row["boardid"] for row in data}
+    assert "TQBR" in boards
+    assert all(row["market"] == "shares" for row in data)
+
+
+async def test_get_market_history_by_board(http_session) -> None:
+    data = await history.get_market_history_by_board(http_session, "SBER", "2018-08-07", "2018-08-10")
+    assert "TQBR" in data
+    assert all(row["BOARDID"] == board for board, table in data.items() for row in table)
+    assert len(data["TQBR"]) == 4
+
+
+async def test_get_market_history_merged(http_session) -> None:
+    data = await history.get_market_history_merged(
+        http_session, "SBER", "2018-08-07", "2018-08-10", boards=["SMAL", "TQBR"]
+    )
+    dates = [row["TRADEDATE"] for row in data]
+    assert dates == sorted(dates)
+    assert len(data) == 8
+
+
+async def test_get_market_history_merged_requires_tradedate(http_session) -> None:
+    with pytest.raises(history.client.ISSMoexError, match="TRADEDATE"):
+        await history.get_market_history_merged(http_session, "SBER", columns=("CLOSE",))
+
+
+def test_active_boards() -> None:
+    boards = [
+        {"boardid": "EQBR", "history_from": "2011-11-21", "history_till": "2013-08-30"},
+        {"boardid": "TQBR", "history_from": "2013-03-25", "history_till": "2024-01-03"},
+        {"boardid": "SPEQ", "history_from": None, "history_till": None},
+    ]
+    assert history._active_boards(boards, None, None) == ["EQBR", "TQBR", "SPEQ"]
+    assert history._active_boards(boards, "2014-01-01", None) == ["TQBR", "SPEQ"]
+    assert history._active_boards(boards, None, "2012-01-01") == ["EQBR", "SPEQ"]
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import prometheus_client
+
+import aiomoex
+from aiomoex import client, instrumentation
+
+URL = "https://iss.moex.com/iss/history/engines/stock/markets/shares/securities/SNGSP.json"
+
+
+async def test_observer_requests(http_session) -> None:
+    collector = aiomoex.StatsCollector()
+    aiomoex.configure_session(http_session, observer=collector)
+    iss = client.ISSClient(http_session, URL, {"from": "2018-01-01", "till": "2018-03-01"})
+    data = await iss.get_all()
+    assert collector.requests == 2
+    assert collector.rows == len(data["history"])
+    assert collector.size > 0
+    assert collector.cached == 0
+    assert (collector.pages_requests, collector.pages) == (1, 2)
+
+
+async def test_observer_disk_cache(http_session, tmp_path) -> None:
+    cache = aiomoex.DiskCache(tmp_path / "cache.sqlite")
+    iss = client.ISSClient(http_session, URL, {"from": "2018-01-01", "till": "2018-01-31"})
+    block = {"history": {"columns": ["TRADEDATE"], "data": [["2018-01-03"], ["2018-01-04"]]}}
+    await cache.set(URL, iss._make_query(), block)
+
+    collector = aiomoex.StatsCollector()
+    aiomoex.configure_session(http_session, disk_cache=cache, observer=collector)
+    assert await iss.get() == {"history": [{"TRADEDATE": "2018-01-03"}, {"TRADEDATE": "2018-01-04"}]}
+    assert (collector.requests, collector.cached, collector.rows, collector.size) == (1, 1, 2, 0)
+    cache.close()
+
+
+def test_rows_count() -> None:
+    block: client.CompactTablesDict = {
+        "history": {"columns": ["TRADEDATE"], "data": [["2018-01-03"], ["2018-01-04"]]},
+        "history.cursor": {"columns": ["INDEX", "TOTAL", "PAGESIZE"], "data": [[0, 2, 100]]},
+    }
+    assert client._rows_count(block) == 2
+
+
+def test_stats_collector() -> None:
+    collector = instrumentation.StatsCollector()
+    collector.on_request(instrumentation.RequestStats(URL, {}, ttfb=0.5, size=100, rows=10, retries=1))
+    collector.on_request(instrumentation.RequestStats(URL, {}, rows=5, cached=True))
+    collector.on_pages(instrumentation.PagesStats(URL, {}, 2, 15, 1))
+    assert (collector.requests, collector.cached, collector.retries) == (2, 1, 1)
+    assert (collector.size, collector.rows, collector.ttfb) == (100, 15, 0.5)
+    assert (collector.pages_requests, collector.pages) == (1, 2)
+    assert repr(collector) == "StatsCollector(requests=2, cached=1, size=100, rows=15)"
+
+
+def test_prometheus_observer() -> None:
+    registry = prometheus_client.CollectorRegistry()
+    observer = instrumentation.PrometheusObserver(registry)
+    observer.on_request(instrumentation.RequestStats(URL, {}, ttfb=0.5, size=100, rows=10, retries=2))
+    observer.on_request(instrumentation.RequestStats(URL, {}, rows=5, cached=True))
+    observer.on_pages(instrumentation.PagesStats(URL, {}, 2, 15, 1))
+    assert registry.get_sample_value("aiomoex_requests_total", {"cached": "False"}) == 1
+    assert registry.get_sample_value("aiomoex_requests_total", {"cached": "True"}) == 1
+    assert registry.get_sample_value("aiomoex_retries_total") == 2
+    assert registry.get_sample_value("aiomoex_response_bytes_total") == 100
+    assert registry.get_sample_value("aiomoex_request_phase_seconds_sum", {"phase": "ttfb"}) == 0.5
+    assert registry.get_sample_value("aiomoex_pages_per_request_sum") == 2
+
+
+async def test_trace_config_connect_timer() -> None:
+    config = instrumentation.trace_config()
+    timer = instrumentation.ConnectTimer()
+    ctx = SimpleNamespace(trace_request_ctx=timer.request_ctx())
+    for callback in config.on_connection_create_start:
+        await callback(None, ctx, None)
+    for callback in config.on_connection_create_end:
+        await callback(None, ctx, None)
+    assert timer.connect > 0
@@ -0,0 +1,75 @@
+import pytest
+
+from aiomoex import client, history, lazy
+
+PAGE_SIZE = 3
+TOTAL = 8
+
+
+class _FakeISSClient:
+    def __init__(self) -> None:
+        self.starts = []
+
+    async def get_compact(self, start=None) -> client.CompactTablesDict:
+        start = start or 0
+        self.starts.append(start)
+        data = [[day, float(day)] for day in range(start, min(start + PAGE_SIZE, TOTAL))]
+        return {
+            "history": {"columns": ["DAY", "CLOSE"], "data": data},
+            "history.cursor": {"columns": ["INDEX", "TOTAL", "PAGESIZE"], "data": [[start, TOTAL, PAGE_SIZE]]},
+        }
+
+
+async def make_table(cache_pages=16):
+    iss = _FakeISSClient()
+    table = lazy.LazyTable(iss, "history", await iss.get_compact(), cache_pages)
+    return table, iss
+
+
+async def test_lazy_table_len_and_index() -> None:
+    table, iss = await make_table()
+    assert len(table) == TOTAL
+    assert await table.get(1) == {"DAY": 1, "CLOSE": 1.0}
+    assert await table.get(-1) == {"DAY": 7, "CLOSE": 7.0}
+    assert iss.starts == [0, 6]
+
+
+async def test_lazy_table_slice() -> None:
+    table, iss = await make_table()
+    assert [row["DAY"] for row in await table.get(slice(-4, None))] == [4, 5, 6, 7]
+    assert [row["DAY"] for row in await table.get(slice(None, None, 3))] == [0, 3, 6]
+    assert await table.get(slice(10, 20)) == []
+    assert iss.starts == [0, 3, 6]
+
+
+async def test_lazy_table_cache_eviction() -> None:
+    table, iss = await make_table(cache_pages=1)
+    await table.get(-1)
+    await table.get(0)
+    assert iss.starts == [0, 6, 0]
+
+
+@pytest.mark.parametrize("key", [8, -9])
+async def test_lazy_table_index_error(key) -> None:
+    table, _ = await make_table()
+    with pytest.raises(IndexError):
+        await table.get(key)
+
+
+async def test_lazy_table_without_cursor() -> None:
+    block = {"candles": {"columns": ["open"], "data": [[1]]}}
+    with pytest.raises(client.ISSMoexError, match=r"history\.cursor"):
+        lazy.LazyTable(_FakeISSClient(), "candles", block)
+
+
+async def test_open_board_history(http_session) -> None:
+    data = await history.open_board_history(http_session, "LSRG", end="2018-08-10")
+    assert len(data) > 100
+    last = await data.get(-1)
+    assert last["TRADEDATE"] == "2018-08-10"
+    assert [row["TRADEDATE"] for row in await data.get(slice(-4, None))] == [
+        "2018-08-07",
+        "2018-08-08",
+        "2018-08-09",
+        "2018-08-10",
+    ]
@@ -0,0 +1,50 @@
+import pytest
+
+from aiomoex import client, lineage
+
+
+def rows(security, *dates: str):
+    return [{"TRADEDATE": date, "SECID": security, "CLOSE": 1} for date in dates]
+
+
+def test_stitch() -> None:
+    old = rows("OGK4", "2011-01-03", "2011-01-04", "2011-01-05")
+    middle = rows("EONR", "2011-01-05", "2011-01-06", "2011-01-07")
+    new = rows("UPRO", "2011-01-07", "2011-01-10")
+
+    out = lineage._stitch([new, [], old, middle])
+
+    assert [(row["TRADEDATE"], row["SECID"]) for row in out] == [
+        ("2011-01-03", "OGK4"),
+        ("2011-01-04", "OGK4"),
+        ("2011-01-05", "EONR"),
+        ("2011-01-06", "EONR"),
+        ("2011-01-07", "UPRO"),
+        ("2011-01-10", "UPRO"),
+    ]
+
+
+def test_stitch_empty() -> None:
+    assert lineage._stitch([[], []]) == []
+
+
+async def test_get_security_lineage(http_session) -> None:
+    assert await lineage.get_security_lineage(http_session, "UPRO") == ["EONR", "OGK4", "UPRO"]
+
+
+async def test_get_security_lineage_not_found(http_session) -> None:
+    with pytest.raises(client.ISSMoexError, match="Не найден инструмент"):
+        await lineage.get_security_lineage(http_session, "NOTEXISTING")
+
+
+async def test_get_lineage_history(http_session) -> None:
+    data = await lineage.get_lineage_history(http_session, "UPRO", end="2016-12-31")
+    dates = [row["TRADEDATE"] for row in data]
+    assert dates == sorted(dates)
+    assert {row["SECID"] for row in data} == {"EONR", "OGK4", "UPRO"}
+    assert len({(row["TRADEDATE"], row["SECID"]) for row in data}) == len(set(dates))
+
+
+async def test_get_lineage_history_requires_tradedate(http_session) -> None:
+    with pytest.raises(client.ISSMoexError, match="TRADEDATE"):
+        await lineage.get_lineage_history(http_session, "UPRO", columns=("CLOSE",))
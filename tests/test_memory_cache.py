@@ -0,0 +1,65 @@
+import asyncio
+
+from aiomoex import memory_cache
+
+URL = "https://iss.moex.com/iss/engines/stock/markets/shares/boards/TQBR/securities.json"
+TABLE = [{"SECID": "GAZP", "LOTSIZE": 10}, {"SECID": "SBER", "LOTSIZE": 1}]
+
+
+def test_memory_cache_get_set() -> None:
+    cache = memory_cache.MemoryCache()
+    query = {"iss.only": "securities,history.cursor", "securities.columns": "SECID,LOTSIZE"}
+    assert cache.get(URL, query, "securities") is None
+    cache.set(URL, query, "securities", TABLE)
+    data = cache.get(URL, dict(reversed(query.items())), "securities")
+    assert data == TABLE
+    assert cache.get(URL, {}, "securities") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_memory_cache_returns_copy() -> None:
+    cache = memory_cache.MemoryCache()
+    cache.set(URL, {}, "securities", TABLE)
+    data = cache.get(URL, {}, "securities")
+    assert data is not None
+    data[0]["SECID"] = "LKOH"
+    assert cache.get(URL, {}, "securities") == TABLE
+
+
+async def test_memory_cache_ttls() -> None:
+    cache = memory_cache.MemoryCache(ttl=0.01, ttls={"dates": 100})
+    cache.set(URL, {}, "securities", TABLE)
+    cache.set(URL, {}, "dates", [{"from": "1997-03-24", "till": "2023-11-24"}])
+    await asyncio.sleep(0.02)
+    assert cache.get(URL, {}, "securities") is None
+    assert cache.get(URL, {}, "dates") is not None
+    assert len(cache) == 1
+
+
+def test_memory_cache_max_entries() -> None:
+    cache = memory_cache.MemoryCache(max_entries=2)
+    for name in ["a", "b", "c"]:
+        cache.set(URL, {}, name, TABLE)
+        cache.get(URL, {}, "a")
+    assert cache.get(URL, {}, "a") is not None
+    assert cache.get(URL, {}, "b") is None
+    assert cache.get(URL, {}, "c") is not None
+
+
+def test_memory_cache_max_bytes() -> None:
+    size = memory_cache._table_size(TABLE)
+    cache = memory_cache.MemoryCache(max_bytes=size * 2)
+    for name in ["a", "b", "c"]:
+        cache.set(URL, {}, name, TABLE)
+    assert len(cache) == 2
+    assert cache.get(URL, {}, "a") is None
+
+
+def test_memory_cache_invalidate() -> None:
+    cache = memory_cache.MemoryCache()
+    cache.set(URL, {}, "securities", TABLE)
+    cache.set(URL, {}, "dates", TABLE)
+    cache.invalidate("dates")
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
@@ -0,0 +1,78 @@
+import math
+from datetime import date
+
+import numpy as np
+
+from aiomoex import panel
+
+TICKERS = [
+    {"ticker": "GAZP", "from": "2020-01-01", "till": "2020-03-31", "tradingsession": 3},
+    {"ticker": "GAZP", "from": "2020-04-01", "till": "2020-06-30", "tradingsession": 3},
+    {"ticker": "AFLT", "from": "2020-01-01", "till": "2020-01-10", "tradingsession": 3},
+    {"ticker": "AFLT", "from": "2020-01-20", "till": "2020-02-10", "tradingsession": 3},
+    {"ticker": "AFLT", "from": "2020-05-01", "till": "2020-06-30", "tradingsession": 3},
+    {"ticker": "MTLR", "from": "2019-01-01", "till": "2019-12-31", "tradingsession": 3},
+]
+
+
+def test_memberships() -> None:
+    memberships = panel._memberships(TICKERS, "2020-01-05", "2020-05-31")
+    assert list(memberships) == ["AFLT", "GAZP"]
+    assert memberships["GAZP"] == [(date(2020, 1, 5), date(2020, 5, 31))]
+    assert memberships["AFLT"] == [
+        (date(2020, 1, 5), date(2020, 1, 10)),
+        (date(2020, 1, 20), date(2020, 2, 10)),
+        (date(2020, 5, 1), date(2020, 5, 31)),
+    ]
+
+
+def test_plan_fetches() -> None:
+    memberships = panel._memberships(TICKERS, None, None)
+    assert panel._plan_fetches(memberships["AFLT"]) == [
+        (date(2020, 1, 1), date(2020, 2, 10)),
+        (date(2020, 5, 1), date(2020, 6, 30)),
+    ]
+    assert panel._plan_fetches(memberships["MTLR"]) == [(date(2019, 1, 1), date(2019, 12, 31))]
+
+
+def test_build_panel() -> None:
+    memberships = {
+        "AFLT": [(date(2020, 1, 3), date(2020, 1, 3)), (date(2020, 1, 9), date(2020, 1, 10))],
+        "GAZP": [(date(2020, 1, 3), date(2020, 1, 9))],
+    }
+    data = {
+        "AFLT": [
+            {"TRADEDATE": "2020-01-03", "CLOSE": 1},
+            {"TRADEDATE": "2020-01-06", "CLOSE": 2},
+            {"TRADEDATE": "2020-01-09", "CLOSE": 3},
+            {"TRADEDATE": "2020-01-10", "CLOSE": None},
+        ],
+        "GAZP": [
+            {"TRADEDATE": "2020-01-06", "CLOSE": 10.5},
+            {"TRADEDATE": "2020-01-09", "CLOSE": 11.5},
+            {"TRADEDATE": "2020-01-10", "CLOSE": 12.5},
+        ],
+    }
+    out = panel._build_panel(data, memberships, "CLOSE")
+
+    assert out.tickers == ("AFLT", "GAZP")
+    assert out.dates.tolist() == [date(2020, 1, 3), date(2020, 1, 6), date(2020, 1, 9), date(2020, 1, 10)]
+    assert np.array_equal(
+        out.values,
+        [[1, math.nan], [math.nan, 10.5], [3, 11.5], [math.nan, math.nan]],
+        equal_nan=True,
+    )
+
+
+def test_build_panel_empty() -> None:
+    out = panel._build_panel({}, {}, "CLOSE")
+    assert out.tickers == ()
+    assert out.values.shape == (0, 0)
+
+
+async def test_get_index_panel(http_session) -> None:
+    out = await panel.get_index_panel(http_session, "IMOEX", "2023-01-03", "2023-01-31")
+    assert "SBER" in out.tickers
+    assert out.values.shape == (len(out.dates), len(out.tickers))
+    assert str(out.dates[0]) == "2023-01-03"
+    assert not np.isnan(out.values[:, out.tickers.index("SBER")]).any()
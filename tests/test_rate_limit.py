@@ -0,0 +1,122 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import aiohttp
+import pytest
+
+from aiomoex import client, rate_limit
+
+
+def make_error(status: int, headers: dict[str, str] | None = None) -> client.ISSMoexError:
+    cause = aiohttp.ClientResponseError(None, (), status=status, headers=headers)
+    error = client.ISSMoexError("error")
+    error.__cause__ = cause
+    return error
+
+
+async def test_call_retries_transient_errors() -> None:
+    limiter = rate_limit.RateLimiter(rate=1000, retries=3, backoff=0.001)
+    errors = [make_error(503), make_error(429)]
+
+    async def request() -> str:
+        if errors:
+            raise errors.pop()
+        return "done"
+
+    assert await limiter.call(request) == "done"
+    assert not errors
+
+
+async def test_call_raises_after_retries() -> None:
+    limiter = rate_limit.RateLimiter(rate=1000, retries=2, backoff=0.001)
+    calls = 0
+
+    async def request() -> str:
+        nonlocal calls
+        calls += 1
+        raise make_error(500)
+
+    with pytest.raises(client.ISSMoexError):
+        await limiter.call(request)
+    assert calls == 3
+
+
+async def test_call_not_retries_bad_url() -> None:
+    limiter = rate_limit.RateLimiter(rate=1000, retries=2, backoff=0.001)
+    calls = 0
+
+    async def request() -> str:
+        nonlocal calls
+        calls += 1
+        raise make_error(404)
+
+    with pytest.raises(client.ISSMoexError):
+        await limiter.call(request)
+    assert calls == 1
+
+
+async def test_call_waits_retry_after(monkeypatch) -> None:
+    limiter = rate_limit.RateLimiter(rate=1000, retries=2, backoff=0.001, max_backoff=1)
+    errors = [make_error(429, {"Retry-After": "120"})]
+    delays = []
+
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+
+    async def request() -> str:
+        if errors:
+            raise errors.pop()
+        return "done"
+
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", sleep)
+    assert await limiter.call(request) == "done"
+    assert delays == [120]
+
+
+async def test_call_raises_on_long_retry_after() -> None:
+    limiter = rate_limit.RateLimiter(rate=1000, retries=2, backoff=0.001, max_retry_after=60)
+    calls = 0
+
+    async def request() -> str:
+        nonlocal calls
+        calls += 1
+        raise make_error(429, {"Retry-After": "120"})
+
+    with pytest.raises(client.ISSMoexError):
+        await limiter.call(request)
+    assert calls == 1
+
+
+async def test_throttle_slows_down_rate() -> None:
+    limiter = rate_limit.RateLimiter(rate=1000, min_rate=100, retries=5, backoff=0.001)
+    errors = [make_error(429) for _ in range(5)]
+
+    async def request() -> None:
+        if errors:
+            raise errors.pop()
+
+    await limiter.call(request)
+    assert limiter.current_rate == pytest.approx(100 + 1000 / 20)
+
+
+async def test_acquire_limits_rate() -> None:
+    limiter = rate_limit.RateLimiter(rate=100, burst=1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(6):
+        await limiter.acquire()
+    assert loop.time() - start >= 0.045
+
+
+def test_parse_retry_after_seconds() -> None:
+    assert rate_limit._parse_retry_after("3") == 3
+    assert rate_limit._parse_retry_after(None) == 0
+    assert rate_limit._parse_retry_after("bad") == 0
+
+
+def test_parse_retry_after_date() -> None:
+    retry_at = datetime.now(UTC) + timedelta(seconds=30)
+    assert 25 < rate_limit._parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    assert 25 < rate_limit._parse_retry_after(format_datetime(retry_at.replace(tzinfo=None))) <= 30
+    assert rate_limit._parse_retry_after("Wed, 21 Oct 2015 07:28:00 -0000") == 0
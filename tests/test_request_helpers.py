@@ -65,3 +65,12 @@ def test_get_table_notable() -> None:
     with pytest.raises(client.ISSMoexError) as error:
         request_helpers.get_table({"a": "b"}, "b")
     assert "Отсутствует таблица b в данных" in str(error.value)
+
+
+async def test_get_long_columns(http_session) -> None:
+    url = "https://iss.moex.com/iss/history/engines/stock/markets/shares/securities/SNGSP.json"
+    query = request_helpers.make_query(start="2018-01-01", end="2018-03-01", table="history")
+    columns = await request_helpers.get_long_columns(http_session, url, "history", query, max_in_flight=2)
+    data = await request_helpers.get_long_data(http_session, url, "history", query)
+    assert columns.rows == len(data)
+    assert columns["TRADEDATE"] == [row["TRADEDATE"] for row in data]
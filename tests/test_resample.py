@@ -0,0 +1,86 @@
+import pytest
+
+from aiomoex import resample
+
+
+def candle(time, price, volume=1):
+    return {
+        "open": price,
+        "close": price + 0.5,
+        "high": price + 1,
+        "low": price - 1,
+        "value": price * volume,
+        "volume": volume,
+        "begin": f"2024-01-03 {time}:00",
+        "end": f"2024-01-03 {time}:59",
+    }
+
+
+DATA = [
+    candle("09:58", 1),
+    candle("09:59", 2),
+    candle("10:00", 3),
+    candle("10:04", 4, 2),
+    candle("10:05", 5),
+    candle("18:49", 6),
+    candle("19:05", 7),
+    candle("19:30", 8),
+]
+
+
+def test_resample_candles_sessions() -> None:
+    bars = resample.resample_candles(DATA, 60)
+    assert [bar["begin"] for bar in bars] == [
+        "2024-01-03 09:50:00",
+        "2024-01-03 10:00:00",
+        "2024-01-03 18:00:00",
+        "2024-01-03 19:00:00",
+    ]
+    assert bars[1] == {
+        "open": 3,
+        "close": 5.5,
+        "high": 6,
+        "low": 2,
+        "value": 16,
+        "volume": 4,
+        "begin": "2024-01-03 10:00:00",
+        "end": "2024-01-03 10:05:59",
+    }
+    assert bars[-1]["end"] == "2024-01-03 19:30:59"
+
+
+def test_resample_candles_minutes() -> None:
+    bars = resample.resample_candles(DATA, 5)
+    assert [bar["begin"][-8:] for bar in bars] == [
+        "09:55:00",
+        "10:00:00",
+        "10:05:00",
+        "18:45:00",
+        "19:05:00",
+        "19:30:00",
+    ]
+    assert [bar["volume"] for bar in bars] == [2, 3, 1, 1, 1, 1]
+
+
+def test_resample_candles_day() -> None:
+    next_day = [
+        {**row, "begin": row["begin"].replace("03", "04"), "end": row["end"].replace("03", "04")} for row in DATA
+    ]
+    bars = resample.resample_candles(DATA + next_day, 1440)
+    assert [bar["begin"] for bar in bars] == ["2024-01-03 00:00:00", "2024-01-04 00:00:00"]
+    assert bars[0]["open"] == 1
+    assert bars[0]["close"] == 8.5
+    assert bars[0]["high"] == 9
+    assert bars[0]["low"] == 0
+    assert bars[0]["volume"] == 9
+
+
+def test_resample_candles_custom_sessions() -> None:
+    bars = resample.resample_candles(DATA, 60, sessions=())
+    assert [bar["begin"][-8:] for bar in bars] == ["09:00:00", "10:00:00", "18:00:00", "19:00:00"]
+
+
+def test_resample_candles_errors() -> None:
+    assert resample.resample_candles([], 5) == []
+    with pytest.raises(ValueError, match="Размер свечки"):
+        resample.resample_candles(DATA, 0)
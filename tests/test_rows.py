@@ -0,0 +1,48 @@
+import sys
+from datetime import date, datetime
+
+import pytest
+
+from aiomoex import client, rows
+
+CANDLES: client.CompactTable = {
+    "columns": ["open", "close", "high", "low", "value", "volume", "begin", "end"],
+    "data": [[202.7, 203, 204, 201.5, 1e6, 5000, "2011-12-08 10:00:00", "2011-12-08 10:09:59"]],
+}
+HISTORY: client.CompactTable = {
+    "columns": ["TRADEDATE", "BOARDID", "CLOSE", "VALUE", "VOLUME"],
+    "data": [["2018-08-07", "TQBR", 777, 1.5e6, 2000], ["2018-08-08", "TQBR", None, 0, 0]],
+}
+
+
+def test_to_candles() -> None:
+    assert rows.to_candles(CANDLES) == [
+        rows.Candle(
+            202.7,
+            203,
+            204,
+            201.5,
+            1e6,
+            5000,
+            datetime.fromisoformat("2011-12-08 10:00:00"),
+            datetime.fromisoformat("2011-12-08 10:09:59"),
+        ),
+    ]
+
+
+def test_to_history_reorders_columns() -> None:
+    assert rows.to_history(HISTORY) == [
+        rows.HistoryRow("TQBR", date(2018, 8, 7), 777, 2000, 1.5e6),
+        rows.HistoryRow("TQBR", date(2018, 8, 8), None, 0, 0),
+    ]
+
+
+def test_to_history_missing_columns() -> None:
+    with pytest.raises(client.ISSMoexError, match="Отсутствуют необходимые столбцы"):
+        rows.to_history({"columns": ["TRADEDATE"], "data": [["2018-08-07"]]})
+
+
+def test_row_size() -> None:
+    row = rows.to_candles(CANDLES)[0]
+    row_dict = client._to_rows(CANDLES)[0]
+    assert sys.getsizeof(row) < sys.getsizeof(row_dict) / 2
@@ -0,0 +1,21 @@
+import aiomoex
+from aiomoex import settings
+
+
+async def test_configure_session(http_session) -> None:
+    assert settings.get_settings(http_session) == settings.SessionSettings()
+    limiter = aiomoex.RateLimiter()
+    aiomoex.configure_session(http_session, limiter=limiter)
+    assert settings.get_settings(http_session).limiter is limiter
+    aiomoex.configure_session(http_session)
+    assert settings.get_settings(http_session).limiter is None
+
+
+async def test_create_session() -> None:
+    limiter = aiomoex.RateLimiter()
+    async with aiomoex.create_session(limit_per_host=5, timeout=30, limiter=limiter) as session:
+        assert session.connector is not None
+        assert session.connector.limit_per_host == 5
+        assert session.timeout.total == 30
+        assert settings.get_settings(session).limiter is limiter
+    assert session.closed
@@ -0,0 +1,53 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+
+import pytest
+
+from aiomoex import single_flight
+
+
+async def test_single_flight_shares_result() -> None:
+    flight = single_flight.SingleFlight()
+    calls: list[str] = []
+
+    def request(key: str) -> Callable[[], Coroutine[None, None, str]]:
+        async def load() -> str:
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        return load
+
+    results = await asyncio.gather(*(flight.call(key, request(key)) for key in ["a"] * 5 + ["b"]))
+    assert results == ["a"] * 5 + ["b"]
+    assert calls == ["a", "b"]
+    assert await flight.call("a", request("a")) == "a"
+    assert calls == ["a", "b", "a"]
+
+
+async def test_single_flight_shares_error() -> None:
+    flight = single_flight.SingleFlight()
+
+    async def request() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError
+
+    results = await asyncio.gather(*(flight.call("key", request) for _ in range(2)), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert str(flight) == "SingleFlight(in_flight=0)"
+
+
+async def test_single_flight_cancel_one_waiter() -> None:
+    flight = single_flight.SingleFlight()
+
+    async def request() -> str:
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.create_task(flight.call("key", request))
+    second = asyncio.create_task(flight.call("key", request))
+    await asyncio.sleep(0.005)
+    first.cancel()
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from aiomoex import dates, store
+
+CANDLE = ("SNGSP", "TQBR", 24, 25.5, 26, 26.5, 25, 1e6, 40000, "2018-01-03 00:00:00", "2018-01-03 23:59:59")
+
+
+async def test_local_store_board_history(http_session, tmp_path) -> None:
+    local_store = store.LocalStore(tmp_path / "store.db")
+    data = await local_store.get_board_history(http_session, "LSRG", start="2018-08-07", end="2018-08-10")
+    assert [row["TRADEDATE"] for row in data] == ["2018-08-07", "2018-08-08", "2018-08-09", "2018-08-10"]
+    assert data[0]["CLOSE"] == 777
+    assert await local_store.get_board_history(http_session, "LSRG", start="2018-08-08", end="2018-08-09") == data[1:3]
+    local_store.close()
+
+
+async def test_local_store_covered_range_without_network(tmp_path) -> None:
+    local_store = store.LocalStore(tmp_path / "store.db")
+    local_store._insert(store._INSERT_CANDLES, [CANDLE])
+    local_store._add_coverage("candles/SNGSP/TQBR/24", [(date(2018, 1, 1), date(2018, 1, 31))])
+    data = await local_store.get_board_candles(None, "SNGSP", start="2018-01-03", end="2018-01-03")
+    assert data == [
+        {
+            "open": 25.5,
+            "close": 26,
+            "high": 26.5,
+            "low": 25,
+            "value": 1e6,
+            "volume": 40000,
+            "begin": "2018-01-03 00:00:00",
+            "end": "2018-01-03 23:59:59",
+        },
+    ]
+    assert await local_store.get_board_candles(None, "SNGSP", start="2018-01-04", end="2018-01-31") == []
+    local_store.close()
+
+
+async def test_local_store_concurrent_coverage(tmp_path) -> None:
+    local_store = store.LocalStore(tmp_path / "store.db")
+
+    async def load(*_: object) -> None:
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(
+        local_store._fill_gaps("history", (date(2020, 1, 1), date(2020, 12, 31)), load),
+        local_store._fill_gaps("history", (date(2021, 1, 1), date(2021, 6, 30)), load),
+        local_store._fill_gaps("history", (date(2022, 1, 1), date(2022, 6, 30)), load),
+    )
+    assert local_store._coverage("history") == [
+        (date(2020, 1, 1), date(2021, 6, 30)),
+        (date(2022, 1, 1), date(2022, 6, 30)),
+    ]
+    local_store.close()
+
+
+def test_requested_range() -> None:
+    assert store._requested_range("2018-01-01", "2018-02-01") == (date(2018, 1, 1), date(2018, 2, 1))
+    assert store._requested_range(None, "2999-01-01") == (date.min, dates.today())
+
+
+@pytest.mark.parametrize(
+    ("requested", "covered", "missing"),
+    [
+        ((date(2018, 1, 1), date(2018, 1, 31)), [], [(date(2018, 1, 1), date(2018, 1, 31))]),
+        ((date(2018, 1, 5), date(2018, 1, 20)), [(date(2018, 1, 1), date(2018, 1, 31))], []),
+        (
+            (date(2018, 1, 1), date(2018, 1, 31)),
+            [(date(2018, 1, 10), date(2018, 1, 20))],
+            [(date(2018, 1, 1), date(2018, 1, 9)), (date(2018, 1, 21), date(2018, 1, 31))],
+        ),
+        (
+            (date(2018, 1, 1), date(2018, 1, 31)),
+            [(date(2017, 1, 1), date(2018, 1, 15))],
+            [(date(2018, 1, 16), date(2018, 1, 31))],
+        ),
+    ],
+)
+def test_missing_ranges(requested, covered, missing) -> None:
+    assert store._missing_ranges(requested, covered) == missing
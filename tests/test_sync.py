@@ -0,0 +1,63 @@
+import pytest
+
+import aiomoex
+from aiomoex import candles, client, history, sync
+
+
+def test_merge_tables() -> None:
+    data = [{"TRADEDATE": "2018-01-03", "CLOSE": 1}, {"TRADEDATE": "2018-01-04", "CLOSE": 2}]
+    new_data = [{"TRADEDATE": "2018-01-04", "CLOSE": 3}, {"TRADEDATE": "2018-01-05", "CLOSE": 4}]
+    assert sync.merge_tables(data, new_data, ("TRADEDATE",)) == [
+        {"TRADEDATE": "2018-01-03", "CLOSE": 1},
+        {"TRADEDATE": "2018-01-04", "CLOSE": 3},
+        {"TRADEDATE": "2018-01-05", "CLOSE": 4},
+    ]
+
+
+async def test_update_board_history(http_session) -> None:
+    data = await history.get_board_history(http_session, "LSRG", end="2018-08-10")
+    updated = await aiomoex.update_board_history(http_session, "LSRG", data)
+    full = await history.get_board_history(http_session, "LSRG")
+    assert updated == full
+
+
+async def test_update_board_candles(http_session) -> None:
+    data = await aiomoex.get_board_candles(http_session, "TTLK", interval=31, end="2018-10-31")
+    updated = await aiomoex.update_board_candles(http_session, "TTLK", data, interval=31)
+    full = await aiomoex.get_board_candles(http_session, "TTLK", interval=31)
+    assert updated == full
+
+
+async def test_update_board_candles_columns(http_session) -> None:
+    columns = ("begin", "close")
+    data = await aiomoex.get_board_candles(http_session, "TTLK", interval=31, end="2018-10-31", columns=columns)
+    updated = await aiomoex.update_board_candles(http_session, "TTLK", data, interval=31, columns=columns)
+    assert list(updated[-1]) == list(columns)
+    assert updated == await aiomoex.get_board_candles(http_session, "TTLK", interval=31, columns=columns)
+
+
+async def test_update_board_candles_passes_columns(http_session, monkeypatch) -> None:
+    requested = []
+
+    async def fake_candles(*args: object) -> list[dict[str, str]]:
+        requested.append((args[3], args[-1]))
+        return [{"begin": "2018-11-01 00:00:00"}]
+
+    async def fake_borders(*_: object) -> list[dict[str, str | int]]:
+        return [{"end": "2018-12-01 00:00:00", "interval": 31}]
+
+    monkeypatch.setattr(candles, "get_board_candles", fake_candles)
+    monkeypatch.setattr(candles, "get_board_candle_borders", fake_borders)
+    data = await sync.update_board_candles(http_session, "TTLK", [], interval=31, columns=("begin",))
+    await sync.update_board_candles(http_session, "TTLK", data, interval=31, columns=("begin",))
+    assert requested == [(None, ("begin",)), ("2018-11-01", ("begin",))]
+
+
+async def test_update_board_candles_unknown_interval(http_session, monkeypatch) -> None:
+    async def fake_borders(*_: object) -> list[dict[str, str | int]]:
+        return [{"end": "2018-12-01 00:00:00", "interval": 24}]
+
+    monkeypatch.setattr(candles, "get_board_candle_borders", fake_borders)
+    data = [{"begin": "2018-11-01 00:00:00"}]
+    with pytest.raises(client.ISSMoexError, match="Нет свечей размера 31"):
+        await sync.update_board_candles(http_session, "TTLK", data, interval=31)